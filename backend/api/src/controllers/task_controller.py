@@ -8,7 +8,7 @@ including CRUD operations and task filtering.
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from schemas.task_schema import TaskCreate, TaskResponse, TaskUpdate
-from services.task_services import get_task_by_id, get_tasks, create_task, delete_task, updated_task
+from services.task_services import get_task_by_id, get_tasks, get_tasks_page, create_task, delete_task, updated_task
 from utils.database import get_db
 from typing import Optional, List, Dict, Any
 
@@ -55,6 +55,25 @@ def get_tasks_route(
         end_date=end_date
     )
 
+@router.get("/all", response_model=List[TaskResponse])
+def get_tasks_page_route(
+    after_id: int = Query(0, description="Return tasks with an ID greater than this one"),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum number of tasks to return"),
+    db: Session = Depends(get_db)
+) -> List[TaskResponse]:
+    """
+    Retrieve a page of all users' tasks, ordered by ID, for bulk jobs such as reindexing.
+    
+    Args:
+        after_id: Last task ID of the previous page (0 for the first page)
+        limit: Maximum number of tasks to return
+        db: Database session dependency
+        
+    Returns:
+        List of task responses, empty once all tasks were returned
+    """
+    return get_tasks_page(session=db, after_id=after_id, limit=limit)
+
 @router.get("/{task_id}", response_model=TaskResponse)
 def get_task_by_id_route(task_id: int, db: Session = Depends(get_db)) -> TaskResponse:
     """
@@ -101,6 +101,24 @@ def get_tasks(
     
     return query.order_by(Task.id.desc()).all()    
 
+def get_tasks_page(session: Session, after_id: int = 0, limit: int = 500) -> List[Task]:
+    """
+    Retrieve a page of all users' tasks, ordered by ID.
+    
+    Args:
+        session: Database session
+        after_id: Only return tasks with a greater ID (the last ID of the previous page)
+        limit: Maximum number of tasks to return
+        
+    Returns:
+        List of task objects, ordered by ID ascending
+        
+    Note:
+        Paging by ID instead of offset keeps each page an index range scan
+        and stays consistent while tasks are added or deleted.
+    """
+    return session.query(Task).filter(Task.id > after_id).order_by(Task.id).limit(limit).all()
+
 def get_task_by_id(db: Session, task_id: int) -> Optional[Task]:
     """
     Retrieve a specific task by its ID.
@@ -6,19 +6,34 @@ components including HTTP services, AI integration, and vector storage.
 """
 
 import os
-from typing import Optional, Tuple
+import threading
+from typing import Optional, Tuple, Union
+
+from qdrant_client import AsyncQdrantClient
 
 from src.utils.logger import logger  
 from src.http_services.http_client import HttpClient
 from src.http_services.user_http_service import UserHttpService
 from src.http_services.task_http_service import TaskHttpService
-from src.vector_store.qdrant_client import get_qdrant_client
+from src.vector_store.qdrant_client import CollectionConfig, get_qdrant_client
 from src.vector_store.text_embedder import TextEmbedder
-from src.vector_store.task_vector_store import TaskVectorStore
+from src.vector_store.async_task_vector_store import AsyncTaskVectorStore
+from src.vector_store.interfaces import AsyncEditableVectorStore, AsyncSearchableVectorStore
+from src.vector_store.numpy_vector_store import NumpyVectorStore
+from src.vector_store.threaded_vector_store import ThreadedVectorStore
+from src.vector_store.write_behind_vector_store import WriteBehindVectorStore
 from src.genai import AICommandInterpreter
+from src.llm.response_cache import ResponseCache
+from src.llm.semantic_cache import SemanticCache
+from src.llm.resilience import ResiliencePolicy
+from src.llm.scheduler import LLMScheduler, scheduling
+from src.llm.providers import LLMProvider, provider_from_env
+from src.llm.context_cache import ContextCache
+from src.llm.router import ModelRouter
+from src.llm.usage import UsageReporter
 from src.communicator import Communicator
 from src.commands.user_request_factory import UserRequestFactory
-from src.utils.menus import MenuChoice
+from src.utils.menus import MenuChoice, menu_options
 from src.commands.user_request import UserRequest
 
 
@@ -38,26 +53,132 @@ class AppService:
         qdrant_client: Vector database client
         embedder: Text embedding service
         vector_store: Task vector storage service
+        usage_reporter: Periodic logger of per-template LLM usage
     """
     
-    def __init__(self, api_base_url: str, qdrant_host: str, genai_key: str) -> None:
+    def __init__(
+        self,
+        api_base_url: str,
+        qdrant_host: str,
+        genai_key: Optional[str],
+        user_service: Optional[UserHttpService] = None,
+        task_service: Optional[TaskHttpService] = None,
+        genai_client: Optional[AICommandInterpreter] = None,
+        vector_store: Optional[Union[AsyncSearchableVectorStore, AsyncEditableVectorStore]] = None
+    ) -> None:
         """
         Initialize the application service with all required components.
+
+        Components that are passed in are used as-is, which lets tests and
+        benchmarks run the service without the API, Qdrant or Gemini.
         
         Args:
             api_base_url: Base URL for the API server
             qdrant_host: Host address for Qdrant vector database
             genai_key: API key for Gemini AI service
+            user_service: Service for user-related operations
+            task_service: Service for task-related operations
+            genai_client: AI command interpreter
+            vector_store: Task vector storage service
         """
         http_client: HttpClient = HttpClient(base_url=api_base_url)
-        self.user_service: UserHttpService = UserHttpService(http_client)
-        self.task_service: TaskHttpService = TaskHttpService(http_client)
+        self.user_service: UserHttpService = user_service or UserHttpService(http_client)
+        self.task_service: TaskHttpService = task_service or TaskHttpService(http_client)
+
+        embedder: Optional[TextEmbedder] = None
+        if genai_client is None or vector_store is None:
+            embedder = TextEmbedder.from_env(cache_dir="embedding_cache")
+            # The model loads in the background so connections are accepted right away
+            embedder.warm_up()
+
+        if genai_client is None:
+            response_cache: ResponseCache = ResponseCache(path=os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3"))
+            semantic_cache: SemanticCache = SemanticCache(embedder=embedder)
+            provider: LLMProvider = provider_from_env(genai_key)
+            # Off unless LLM_CONTEXT_CACHE=on: today's template prefixes are below the providers'
+            # minimum cacheable size, so every call would take the full-prompt path anyway
+            context_cache: Optional[ContextCache] = ContextCache(
+                provider,
+                ttl=float(os.getenv("LLM_CONTEXT_CACHE_TTL", 3600)),
+                min_tokens=int(os.getenv("LLM_CONTEXT_CACHE_MIN_TOKENS", 1024))
+            ) if os.getenv("LLM_CONTEXT_CACHE", "off").lower() == "on" else None
+            genai_client = AICommandInterpreter(
+                response_cache=response_cache,
+                semantic_cache=semantic_cache,
+                resilience=ResiliencePolicy.from_env(scheduler=LLMScheduler.from_env()),
+                provider=provider,
+                context_cache=context_cache,
+                batch_window=float(os.getenv("LLM_BATCH_WINDOW_MS", 5)) / 1000,
+                batch_size=int(os.getenv("LLM_BATCH_SIZE", 16)),
+                router=ModelRouter.from_env(provider)
+            )
+        self.genai_client: AICommandInterpreter = genai_client
+        self.genai_client.message_pool.start()
+
+        report_interval: float = float(os.getenv("LLM_USAGE_REPORT_INTERVAL", 300))
+        self.usage_reporter: UsageReporter = UsageReporter(interval=report_interval, metrics=self.genai_client.metrics)
+        if report_interval > 0:
+            self.usage_reporter.start()
+
+        if vector_store is None:
+            # Commands only queue their writes; the store is updated in batches behind them
+            vector_store = WriteBehindVectorStore(
+                self._vector_store(qdrant_host, embedder),
+                path=os.getenv("VECTOR_WRITE_JOURNAL_PATH", "vector_write_journal.sqlite3"),
+                batch_size=int(os.getenv("VECTOR_WRITE_BATCH_SIZE", 256)),
+                max_delay=float(os.getenv("VECTOR_WRITE_MAX_DELAY_MS", 500)) / 1000,
+                max_attempts=int(os.getenv("VECTOR_WRITE_MAX_ATTEMPTS", 30))
+            )
+        self.vector_store: Union[AsyncSearchableVectorStore, AsyncEditableVectorStore] = vector_store
+
+    def _vector_store(
+        self,
+        qdrant_host: str,
+        embedder: TextEmbedder
+    ) -> Union[AsyncSearchableVectorStore, AsyncEditableVectorStore]:
+        """
+        Build the vector store selected by VECTOR_STORE, Qdrant unless it is "numpy".
+
+        Args:
+            qdrant_host: Host address for Qdrant vector database
+            embedder: Text embedding service
+
+        Returns:
+            Task vector storage service
+        """
+        if os.getenv("VECTOR_STORE", "qdrant") == "numpy":
+            # Single-node deployments can keep the vectors in process and skip Qdrant entirely
+            return ThreadedVectorStore(
+                NumpyVectorStore(embedder, path=os.getenv("NUMPY_VECTOR_STORE_DIR", "vector_store_data"))
+            )
+
+        # Requests go through a non-blocking client per session loop; the collection is checked in the background
+        collection_config: CollectionConfig = CollectionConfig.from_env()
+        threading.Thread(
+            target=self._prepare_collection,
+            args=(qdrant_host, collection_config),
+            name="qdrant-setup",
+            daemon=True
+        ).start()
+        return AsyncTaskVectorStore(
+            client_factory=lambda: AsyncQdrantClient(host=qdrant_host, port=6333),
+            embedder=embedder,
+            config=collection_config
+        )
 
-        self.genai_client: AICommandInterpreter = AICommandInterpreter(api_key=genai_key)
+    @staticmethod
+    def _prepare_collection(qdrant_host: str, config: CollectionConfig) -> None:
+        """
+        Create the task collection if it does not exist yet, or bring its indexes in line with config.
 
-        qdrant_client = get_qdrant_client(host=qdrant_host)
-        embedder: TextEmbedder = TextEmbedder()
-        self.vector_store: TaskVectorStore = TaskVectorStore(client=qdrant_client, embedder=embedder)
+        Args:
+            qdrant_host: Host address for Qdrant vector database
+            config: Index and storage settings of the collection
+        """
+        try:
+            get_qdrant_client(host=qdrant_host, config=config).close()
+        except Exception as e:
+            logger.error(f"Failed to prepare the Qdrant collection: {e}")
 
     async def handle(self, communicator: Communicator = None) -> None:
         """
@@ -84,51 +205,59 @@ class AppService:
 
         first_time = True
         while True:
-            try:
-                menu_prompt: str = self.genai_client.generate_conversational_menu(
-                    username=username,
-                    first_time=first_time
-                )
-                first_time = False
-
-                options: str = """
-                1. View Tasks
-                2. Add Task
-                3. Mark Task as Done
-                4. Delete Task
-                5. Edit Task
-                """
-                user_input: str = (await communicator.input(menu_prompt)).strip()
-
-                choice: MenuChoice = self.genai_client.interpret_command(user_input, options)
-
-                if choice == MenuChoice.NONE:
-                    await communicator.output("Hmm, I didn't quite get that. Want to try saying it differently?")
-                    continue
-
-                response: str = self.genai_client.generate_conversational_response(user_input, intent=choice)
-                await communicator.output(response)
-
-                request: Optional[UserRequest] = await factory.create_request(choice, user_input, communicator)
-
-                if not request:
-                    await communicator.output("Sorry, I couldn't figure that out. Maybe try a different phrase?")
-                    continue
-
-                success = await request.handle(self.task_service, self.vector_store, communicator)
-
-                if success:
-                    followup = self.genai_client.generate_conversational_menu(username=username, first_time=False)
-                    await communicator.output(followup)
-                else:
-                    await communicator.output("⚠️ Something went wrong with your request. Try again!")
+            # LLM calls of one menu round share a latency budget; user think time is not charged.
+            # They are queued under the user's session so one busy user cannot starve the others.
+            with self.genai_client.resilience.turn(), scheduling(session=username):
+                try:
+                    await communicator.output_stream(self.genai_client.stream_conversational_menu(
+                        username=username,
+                        first_time=first_time
+                    ))
+                    first_time = False
+
+                    user_input: str = (await communicator.input("")).strip()
+
+                    choice: MenuChoice = await self.genai_client.interpret_command_speculative(user_input, menu_options)
+
+                    if choice == MenuChoice.NONE:
+                        await communicator.output("Hmm, I didn't quite get that. Want to try saying it differently?")
+                        continue
+
+                    await communicator.output_stream(
+                        self.genai_client.stream_conversational_response(user_input, intent=choice)
+                    )
+
+                    request: Optional[UserRequest] = await factory.create_request(choice, user_input, communicator)
+
+                    if not request:
+                        await communicator.output("Sorry, I couldn't figure that out. Maybe try a different phrase?")
+                        continue
+
+                    success = await request.handle(self.task_service, self.vector_store, communicator)
+
+                    if success:
+                        await communicator.output_stream(
+                            self.genai_client.stream_conversational_menu(username=username, first_time=False)
+                        )
+                    else:
+                        await communicator.output("⚠️ Something went wrong with your request. Try again!")
+                        first_time = True
+
+
+                except Exception as e:
+                    logger.error(f"Unexpected error occurred: {e}")
+                    await communicator.output("⚠️ Something went wrong. Please try again.")
                     first_time = True
 
+    async def close_session(self) -> None:
+        """
+        Release what the calling session's event loop holds, such as its Qdrant client.
 
-            except Exception as e:
-                logger.error(f"Unexpected error occurred: {e}")
-                await communicator.output("⚠️ Something went wrong. Please try again.")
-                first_time = True
+        Run on the session's loop once handle() has ended, before the loop is closed.
+        """
+        close_session = getattr(self.vector_store, "close_session", None)
+        if close_session is not None:
+            await close_session()
 
     async def _login_or_signup(self, communicator: Communicator) -> Tuple[int, str]:
         """
@@ -5,7 +5,6 @@ This module contains the AddTaskUserRequest class which handles the
 creation of new tasks with AI-powered data extraction.
 """
 
-from datetime import datetime
 from typing import Optional, Dict, Any
 
 import httpx
@@ -13,8 +12,10 @@ import httpx
 from src.communicator import Communicator
 from src.genai import AICommandInterpreter
 from src.http_services.task_http_service import TaskHttpService
+from src.utils.date_parser import normalize_date
 from src.utils.logger import logger
-from src.vector_store.interfaces import EditableVectorStore
+from src.utils.metrics import metrics
+from src.vector_store.interfaces import AsyncEditableVectorStore
 from .user_request import UserRequest
 
 class AddTaskUserRequest(UserRequest):
@@ -53,37 +54,38 @@ class AddTaskUserRequest(UserRequest):
             AddTaskUserRequest instance if successful, None if cancelled
         """
         logger.info(f"Extract task data with user_input: {user_input}")
-        extraction: Dict[str, Any] = genai_client.extract_task_data(user_input)
+        extraction: Dict[str, Any] = await genai_client.extract_task_data(user_input)
         title: Optional[str] = extraction.get("name")
         due_date: Optional[str] = extraction.get("date")
 
         logger.debug(f"AI extracted: title={title}, date={due_date}")
 
         while not title or title.lower() == "none":
+            metrics.increment("llm_reprompts", request="add_task", field="title")
             user_input = (await communicator.input("Great! enter your task title and due date : ")).strip()
-            extraction = genai_client.extract_task_data(user_input)
+            extraction = await genai_client.extract_task_data(user_input)
             title = extraction.get("name")
             due_date = extraction.get("date")
             logger.debug(f"Re-extracted: title={title}, date={due_date}")
 
         while not due_date or due_date.lower() == "none":
+            metrics.increment("llm_reprompts", request="add_task", field="due_date")
             user_input = (await communicator.input("Enter due date or include it in a full sentence (e.g., 'Walk dog next week'): ")).strip()
-            extraction = genai_client.extract_task_data(user_input)
+            extraction = await genai_client.extract_task_data(user_input)
             if not title and extraction.get("name"):
                 title = extraction.get("name")
             due_date = extraction.get("date")
             logger.debug(f"Re-extracted: title={title}, date={due_date}")
 
-        try:
-            parsed_date: datetime = datetime.strptime(due_date, "%Y-%m-%d")
-            due_date = parsed_date.strftime("%Y-%m-%d")
-        except ValueError:
+        normalized_date: Optional[str] = normalize_date(due_date)
+        if not normalized_date:
             logger.info("Invalid date format. Please use YYYY-MM-DD. Task not added.")
             return None
+        due_date = normalized_date
 
         return AddTaskUserRequest(user_id, title, due_date)
 
-    async def handle(self, task_service: TaskHttpService, vector_editor: EditableVectorStore, communicator: Communicator) -> bool:
+    async def handle(self, task_service: TaskHttpService, vector_editor: AsyncEditableVectorStore, communicator: Communicator) -> bool:
         """
         Execute the add task request.
         
@@ -106,7 +108,7 @@ class AddTaskUserRequest(UserRequest):
                 "user_id": self.user_id
             })
 
-            vector_editor.add(
+            await vector_editor.add(
                 task_id=task["id"],
                 title=self.title,
                 user_id=self.user_id
@@ -10,8 +10,9 @@ from src.commands.user_request import UserRequest
 from src.communicator import Communicator
 from src.genai import AICommandInterpreter
 from src.http_services.task_http_service import TaskHttpService
-from src.vector_store.interfaces import SearchableVectorStore, EditableVectorStore
+from src.vector_store.interfaces import AsyncSearchableVectorStore, AsyncEditableVectorStore
 from src.utils.logger import logger
+from src.utils.metrics import metrics
 
 class DeleteTaskUserRequest(UserRequest):
     """
@@ -31,7 +32,7 @@ class DeleteTaskUserRequest(UserRequest):
         self.task_title: Optional[str] = task_title
 
     @classmethod
-    async def create(cls, user_id: int, genai_client: AICommandInterpreter, user_input: str, vector_searcher: SearchableVectorStore, communicator: Communicator) -> Optional['DeleteTaskUserRequest']:
+    async def create(cls, user_id: int, genai_client: AICommandInterpreter, user_input: str, vector_searcher: AsyncSearchableVectorStore, communicator: Communicator) -> Optional['DeleteTaskUserRequest']:
         """
         Create a DeleteTaskUserRequest instance from user input.
         
@@ -49,17 +50,18 @@ class DeleteTaskUserRequest(UserRequest):
             DeleteTaskUserRequest instance if successful, None if cancelled
         """
     
-        data: Dict[str, Any] = genai_client.extract_task_id_or_title(user_input)
+        data: Dict[str, Any] = await genai_client.extract_task_id_or_title(user_input)
         task_id: Optional[int] = data.get("task_id")
         task_title: Optional[str] = data.get("task_title")
 
         logger.debug(f"DeleteTask create → task_id={task_id}, task_title={task_title}")
         
         if not task_id and not task_title:
+            metrics.increment("llm_reprompts", request="delete_task", field="task")
             task_title = (await communicator.input("What task would you like to delete?\n")).strip()
 
         if not task_id and task_title:
-            results: List[Dict[str, Any]] = vector_searcher.search(query=task_title, user_id=user_id, top_k=3)
+            results: List[Dict[str, Any]] = await vector_searcher.search(query=task_title, user_id=user_id, top_k=3)
             if results:
                 await communicator.output("\nDid you mean one of these tasks?")
                 for i, res in enumerate(results, start=1):
@@ -77,7 +79,7 @@ class DeleteTaskUserRequest(UserRequest):
 
         return DeleteTaskUserRequest(user_id, task_id, task_title)
 
-    async def handle(self, task_service: TaskHttpService, vector_editor: EditableVectorStore, communicator: Communicator) -> bool:
+    async def handle(self, task_service: TaskHttpService, vector_editor: AsyncEditableVectorStore, communicator: Communicator) -> bool:
         """
         Execute the delete task request.
         
@@ -113,7 +115,7 @@ class DeleteTaskUserRequest(UserRequest):
             await task_service.delete_task(task["id"])
             await communicator.output(f"Task '{task['title']}' deleted!")
 
-            vector_editor.remove(task_id=task["id"], user_id=self.user_id)
+            await vector_editor.remove(task_id=task["id"], user_id=self.user_id)
             logger.debug(f"Removed task {task['id']} from vector store.")
             return True
         else:
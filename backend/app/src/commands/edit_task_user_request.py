@@ -13,8 +13,9 @@ from src.commands.user_request import UserRequest
 from src.communicator import Communicator
 from src.genai import AICommandInterpreter
 from src.http_services.task_http_service import TaskHttpService
-from src.vector_store.interfaces import SearchableVectorStore, EditableVectorStore
+from src.vector_store.interfaces import AsyncSearchableVectorStore, AsyncEditableVectorStore
 from src.utils.logger import logger
+from src.utils.metrics import metrics
 
 class EditTaskUserRequest(UserRequest):
     """
@@ -40,7 +41,7 @@ class EditTaskUserRequest(UserRequest):
         task_service: TaskHttpService, 
         genai_client: AICommandInterpreter, 
         user_input: str, 
-        vector_searcher: SearchableVectorStore, 
+        vector_searcher: AsyncSearchableVectorStore, 
         communicator: Communicator
     ) -> Optional['EditTaskUserRequest']:
         """
@@ -60,17 +61,18 @@ class EditTaskUserRequest(UserRequest):
         Returns:
             EditTaskUserRequest instance if successful, None if cancelled
         """
-        data: Dict[str, Any] = genai_client.extract_task_id_or_title_to_edit(user_input)
+        data: Dict[str, Any] = await genai_client.extract_task_id_or_title_to_edit(user_input)
         task_id: Optional[int] = data.get("task_id")
         task_title: Optional[str] = data.get("task_title")
         
         logger.debug(f"AI extracted task_id={task_id}, task_title={task_title}")
 
         if not task_title and not task_id:
+            metrics.increment("llm_reprompts", request="edit_task", field="task")
             task_title = (await communicator.input(" ")).strip()
 
         if not task_id and task_title:
-            results = vector_searcher.search(query=task_title, user_id=user_id, top_k=3)
+            results = await vector_searcher.search(query=task_title, user_id=user_id, top_k=3)
             if results:
                 await communicator.output("\nDid you mean one of these?")
                 for i, res in enumerate(results, start=1):
@@ -96,13 +98,14 @@ class EditTaskUserRequest(UserRequest):
         user_input = (await communicator.input(f"What would you like to change about '{task['title']}'?\n")).strip()
 
         try:
-            extracted = genai_client.extract_edit_task_data(user_input)
+            extracted = await genai_client.extract_edit_task_data(user_input)
             logger.debug(f"Extracted update data: {extracted}")
         except Exception as e:
             logger.error(f"Failed to extract edit task data: {e}")
             extracted = {"title": None, "due_date": None} 
 
         if not extracted.get("title") and not extracted.get("due_date"):
+            metrics.increment("llm_reprompts", request="edit_task", field="changes")
             await communicator.output("I didn't quite catch that. Let's try again manually:")
             title = (await communicator.input("New title? (or leave blank): ")).strip()
             due_date = (await communicator.input("New due date? (YYYY-MM-DD or leave blank): ")).strip()
@@ -114,7 +117,7 @@ class EditTaskUserRequest(UserRequest):
         return EditTaskUserRequest(user_id, task_id, extracted)
 
 
-    async def handle(self, task_service: TaskHttpService, vector_editor: EditableVectorStore, communicator: Communicator) -> bool:
+    async def handle(self, task_service: TaskHttpService, vector_editor: AsyncEditableVectorStore, communicator: Communicator) -> bool:
         """
         Execute the edit task request.
         
@@ -156,7 +159,7 @@ class EditTaskUserRequest(UserRequest):
             return False
 
         await task_service.update_task(int(self.task_id), data)
-        vector_editor.add(
+        await vector_editor.add(
             task_id=int(self.task_id),
             title=payload_update.get("title") or title,
             user_id=self.user_id,
@@ -10,8 +10,9 @@ from src.commands.user_request import UserRequest
 from src.communicator import Communicator
 from src.genai import AICommandInterpreter
 from src.http_services.task_http_service import TaskHttpService
-from src.vector_store.interfaces import SearchableVectorStore, EditableVectorStore
+from src.vector_store.interfaces import AsyncSearchableVectorStore, AsyncEditableVectorStore
 from src.utils.logger import logger
+from src.utils.metrics import metrics
 
 class MarkDoneUserRequest(UserRequest):
     """
@@ -30,7 +31,7 @@ class MarkDoneUserRequest(UserRequest):
         self.task_id: Optional[int] = task_id 
 
     @classmethod
-    async def create(cls, user_id: int, genai_client: AICommandInterpreter, user_input: str, vector_searcher: SearchableVectorStore, communicator: Communicator) -> Optional['MarkDoneUserRequest']:
+    async def create(cls, user_id: int, genai_client: AICommandInterpreter, user_input: str, vector_searcher: AsyncSearchableVectorStore, communicator: Communicator) -> Optional['MarkDoneUserRequest']:
         """
         Create a MarkDoneUserRequest instance from user input.
         
@@ -47,17 +48,18 @@ class MarkDoneUserRequest(UserRequest):
         Returns:
             MarkDoneUserRequest instance if successful, None if cancelled
         """
-        data: Dict[str, Any] = genai_client.extract_task_id_or_title(user_input)
+        data: Dict[str, Any] = await genai_client.extract_task_id_or_title(user_input)
 
         task_id: Optional[int] = data.get("task_id")
         task_title: Optional[str] = data.get("task_title")
         logger.debug(f"MarkDone create → task_id={task_id}, task_title={task_title}")
 
         if not task_title and not task_id:
+            metrics.increment("llm_reprompts", request="mark_done", field="task")
             task_title = (await communicator.input("What task would you like to mark as done? ")).strip()
 
         if not task_id and task_title:
-            results: List[Dict[str, Any]] = vector_searcher.search(query=task_title, user_id=user_id, top_k=3)
+            results: List[Dict[str, Any]] = await vector_searcher.search(query=task_title, user_id=user_id, top_k=3)
             if results:
                 await communicator.output("\nDid you mean one of these tasks?")
                 for i, res in enumerate(results, start=1):
@@ -73,7 +75,7 @@ class MarkDoneUserRequest(UserRequest):
 
         return MarkDoneUserRequest(user_id, task_id)
     
-    async def handle(self, task_service: TaskHttpService, vector_editor: EditableVectorStore, communicator: Communicator) -> bool:
+    async def handle(self, task_service: TaskHttpService, vector_editor: AsyncEditableVectorStore, communicator: Communicator) -> bool:
         """
         Execute the mark done request.
         
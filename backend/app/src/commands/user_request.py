@@ -6,7 +6,7 @@ user request types inherit from.
 """
 
 from src.http_services.task_http_service import TaskHttpService
-from src.vector_store.interfaces import EditableVectorStore
+from src.vector_store.interfaces import AsyncEditableVectorStore
 from src.communicator import Communicator
 from abc import ABC, abstractmethod
 
@@ -26,5 +26,5 @@ class UserRequest(ABC):
 
     
     @abstractmethod
-    async def handle(self, task_service: TaskHttpService, vector_editor: EditableVectorStore, communicator: Communicator) -> None:
+    async def handle(self, task_service: TaskHttpService, vector_editor: AsyncEditableVectorStore, communicator: Communicator) -> None:
         pass
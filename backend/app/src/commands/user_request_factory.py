@@ -14,7 +14,7 @@ from src.commands.view_tasks_user_request import ViewTasksUserRequest
 from src.genai import AICommandInterpreter 
 from src.http_services.task_http_service import TaskHttpService
 from src.http_services.user_http_service import UserHttpService
-from src.vector_store.interfaces import SearchableVectorStore
+from src.vector_store.interfaces import AsyncSearchableVectorStore
 from src.utils.menus import MenuChoice
 from src.utils.logger import logger  
 from src.communicator import Communicator
@@ -41,7 +41,7 @@ class UserRequestFactory:
         user_service: UserHttpService, 
         genai_client: AICommandInterpreter, 
         user_id: int, 
-        vector_store: SearchableVectorStore,
+        vector_store: AsyncSearchableVectorStore,
     ) -> None:
         """
         Initialize the user request factory.
@@ -57,7 +57,7 @@ class UserRequestFactory:
         self.user_service: UserHttpService = user_service
         self.genai_client: AICommandInterpreter = genai_client
         self.user_id: int = user_id
-        self.vector_store: SearchableVectorStore = vector_store
+        self.vector_store: AsyncSearchableVectorStore = vector_store
 
     async def create_request(self, choice: MenuChoice, user_input: str, communicator: Communicator) -> Optional[UserRequest]:
         """
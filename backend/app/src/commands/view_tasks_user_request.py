@@ -11,7 +11,8 @@ from src.communicator import Communicator
 from src.genai import AICommandInterpreter
 from src.http_services.task_http_service import TaskHttpService
 from src.utils.logger import logger
-from src.vector_store.interfaces import SearchableVectorStore, EditableVectorStore
+from src.utils.metrics import metrics
+from src.vector_store.interfaces import AsyncSearchableVectorStore, AsyncEditableVectorStore
 from src.utils.menus import view_options
 
 class ViewTasksUserRequest(UserRequest):
@@ -38,7 +39,7 @@ class ViewTasksUserRequest(UserRequest):
         self.date_filter = date_filter
     
     @classmethod
-    async def create(cls, user_id: int, genai_client: AICommandInterpreter, user_input: str, vector_searcher: SearchableVectorStore, communicator: Communicator) -> Optional['ViewTasksUserRequest']:
+    async def create(cls, user_id: int, genai_client: AICommandInterpreter, user_input: str, vector_searcher: AsyncSearchableVectorStore, communicator: Communicator) -> Optional['ViewTasksUserRequest']:
         """
         Create a ViewTasksUserRequest instance from user input.
         
@@ -55,30 +56,32 @@ class ViewTasksUserRequest(UserRequest):
         Returns:
             ViewTasksUserRequest instance if successful, None if cancelled
         """
-        result: Dict[str, Any] = genai_client.interpret_view_task_command(user_input, view_options)
+        result: Dict[str, Any] = await genai_client.interpret_view_task_command(user_input, view_options)
         if result["status"] == "error":
             return None
         
         if result["status"] == "specific" and result["choice"] == "6":
-            date_filter = genai_client.extract_task_date_filter(user_input)
+            date_filter = await genai_client.extract_task_date_filter(user_input)
 
             if not date_filter:
+                metrics.increment("llm_reprompts", request="view_tasks", field="date_filter")
                 date_input = await communicator.input("What date or range are you interested in?")
-                date_filter = genai_client.extract_task_date_filter(date_input)
+                date_filter = await genai_client.extract_task_date_filter(date_input)
             return cls(user_id, "6", communicator, date_filter)
     
         if result["status"] == "specific" and result["choice"] in {"1", "2", "3", "4", "5", "6"}:
             return ViewTasksUserRequest(user_id, result["choice"], communicator)
         
+        metrics.increment("llm_reprompts", request="view_tasks", field="choice")
         follow_up_input: str = await communicator.input("")
-        follow_up_result: Dict[str, Any] = genai_client.interpret_view_task_command(follow_up_input, view_options)
+        follow_up_result: Dict[str, Any] = await genai_client.interpret_view_task_command(follow_up_input, view_options)
 
         if follow_up_result["status"] == "specific" and follow_up_result["choice"] in {"1", "2", "3", "4", "5"}:
             return ViewTasksUserRequest(user_id, follow_up_result["choice"], communicator)
 
         return ViewTasksUserRequest(user_id, follow_up_result["choice"], date_filter)
 
-    async def handle(self, task_service: TaskHttpService, vector_editor: EditableVectorStore, communicator: Communicator) -> bool:
+    async def handle(self, task_service: TaskHttpService, vector_editor: AsyncEditableVectorStore, communicator: Communicator) -> bool:
         """
         Execute the view tasks request.
         
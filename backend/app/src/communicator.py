@@ -7,7 +7,8 @@ including CLI and Socket.IO implementations.
 
 from abc import ABC, abstractmethod
 import asyncio
-from typing import Optional
+import uuid
+from typing import AsyncIterator, List, Optional
 from src.utils.logger import logger
 
 class Communicator(ABC):
@@ -47,6 +48,23 @@ class Communicator(ABC):
         """
         pass
 
+    async def output_stream(self, chunks: AsyncIterator[str]) -> str:
+        """
+        Send text to the user as it is being generated.
+
+        The default implementation waits for the whole text and sends it
+        with output; implementations that can render partial text override it.
+
+        Args:
+            chunks: Asynchronous iterator of text chunks
+
+        Returns:
+            The complete text that was sent
+        """
+        text: str = "".join([chunk async for chunk in chunks])
+        await self.output(text)
+        return text
+
 class SocketIoCommunicator(Communicator):
     """
     Socket.IO implementation of the communicator interface.
@@ -77,8 +95,9 @@ class SocketIoCommunicator(Communicator):
         Returns:
             Client's response string
         """
-        logger.debug("input() sending prompt to client")
-        await self.sio.emit("chat_message", text, to=self.sid)
+        if text:
+            logger.debug("input() sending prompt to client")
+            await self.sio.emit("chat_message", text, to=self.sid)
         logger.debug("input() waiting for response from queue...")
         response: str = await self.queue.get()
         logger.debug(f"input() received: {response}")
@@ -94,6 +113,28 @@ class SocketIoCommunicator(Communicator):
         logger.debug(f"output() sending: {text}")
         await self.sio.emit("chat_message", text, to=self.sid)
 
+    async def output_stream(self, chunks: AsyncIterator[str]) -> str:
+        """
+        Send text to the client chunk by chunk.
+
+        Each chunk is emitted as a chat_message_chunk event carrying the
+        message id; a final event with done=True marks the end of the message.
+
+        Args:
+            chunks: Asynchronous iterator of text chunks
+
+        Returns:
+            The complete text that was sent
+        """
+        message_id: str = uuid.uuid4().hex
+        parts: List[str] = []
+        async for chunk in chunks:
+            parts.append(chunk)
+            await self.sio.emit("chat_message_chunk", {"id": message_id, "text": chunk, "done": False}, to=self.sid)
+        await self.sio.emit("chat_message_chunk", {"id": message_id, "text": "", "done": True}, to=self.sid)
+        logger.debug(f"output_stream() sent {len(parts)} chunks")
+        return "".join(parts)
+
     def add_message_to_queue(self, text: str) -> None:
         """
         Add a message to the response queue.
@@ -136,4 +177,21 @@ class CLICommunicator(Communicator):
         Args:
             text: Text to display
         """
-        print(text) 
\ No newline at end of file
+        print(text)
+
+    async def output_stream(self, chunks: AsyncIterator[str]) -> str:
+        """
+        Print text to the console as chunks arrive.
+
+        Args:
+            chunks: Asynchronous iterator of text chunks
+
+        Returns:
+            The complete text that was printed
+        """
+        parts: List[str] = []
+        async for chunk in chunks:
+            parts.append(chunk)
+            print(chunk, end="", flush=True)
+        print()
+        return "".join(parts)
@@ -1,130 +1,511 @@
-from google import genai
-from typing import Optional, Dict
-from src.utils.menus import MenuChoice
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Dict, Tuple
+from src.utils.menus import MenuChoice, view_options as VIEW_OPTIONS
+import asyncio
+import hashlib
 import json
-import time
 import re
+import time
+from contextvars import ContextVar
 from datetime import date
+from pydantic import ValidationError
 from src.utils.logger import logger
+from src.utils.date_parser import parse_date_expression, remainder
 from src.utils.prompt_templates import (
     INTERPRET_COMMAND_TEMPLATE,
+    INTERPRET_COMMAND_BATCH_TEMPLATE,
     VIEW_TASK_TEMPLATE,
     EXTRACT_TASK_TEMPLATE,
     EXTRACT_EDIT_TASK_TEMPLATE,
     EXTRACT_ID_OR_TITLE_TEMPLATE,
     EXTRACT_ID_OR_TITLE_TO_EDIT_TEMPLATE,
-    MENU_TEMPLATE,
     CONFIRMATION_TEMPLATE,
     EXTRACT_TASK_DATE_FILTER_TEMPLATE,
-    FOLLOWUP_TEMPLATE
+    PromptTemplate
 )
+from src.llm.response_cache import ResponseCache
+from src.llm.semantic_cache import SemanticCache
+from src.llm.message_pool import MessagePool, MessageKind
+from src.llm.resilience import ResiliencePolicy
+from src.llm.scheduler import Priority, scheduling
+from src.llm.single_flight import SingleFlight
+from src.llm.batcher import MicroBatcher
+from src.llm.providers import LLMProvider, GeminiProvider
+from src.llm.router import ModelRouter
+from src.llm.usage import estimate_tokens
+from src.llm.context_cache import ContextCache
+from src.utils.metrics import MetricsRegistry, metrics as default_metrics
+
+# "this week" and "next week" embed closely, so date filters need a near-exact match
+DATE_FILTER_SEMANTIC_THRESHOLD = 0.97
+
+# First extraction each intent's request runs on the raw user input
+SPECULATIVE_EXTRACTIONS: Dict[MenuChoice, str] = {
+    MenuChoice.VIEW_TASKS: "interpret_view_task_command",
+    MenuChoice.ADD_TASK: "extract_task_data",
+    MenuChoice.MARK_DONE: "extract_task_id_or_title",
+    MenuChoice.DELETE_TASK: "extract_task_id_or_title",
+    MenuChoice.EDIT_TASK: "extract_task_id_or_title_to_edit",
+}
+
+# Cheap lexical hints ranking which intents are worth speculating on; input matching none is not speculated on
+INTENT_HINTS: Dict[MenuChoice, re.Pattern] = {
+    MenuChoice.VIEW_TASKS: re.compile(r"\b(show|view|see|list|what|which|display)\b"),
+    MenuChoice.ADD_TASK: re.compile(r"\b(add|create|new|remind|need to|have to)\b"),
+    MenuChoice.MARK_DONE: re.compile(r"\b(done|finish(ed)?|complete(d)?|mark)\b"),
+    MenuChoice.DELETE_TASK: re.compile(r"\b(delete|remove|cancel|drop)\b"),
+    MenuChoice.EDIT_TASK: re.compile(r"\b(edit|change|rename|update|move|reschedule|postpone)\b"),
+}
+
+# Speculative extraction tasks of the current turn, keyed by (method, user input)
+_speculations: ContextVar[Optional[Dict[Tuple[str, str], asyncio.Task]]] = ContextVar("speculations", default=None)
+
+
+def _strip_code_fences(text: str) -> str:
+    # Structured output answers are bare JSON; recorded and unconstrained ones may be fenced
+    return re.sub(r"^```json\s*|```$", "", text.strip(), flags=re.MULTILINE)
 
 class AICommandInterpreter:
-    def __init__(self, api_key: str, model: str = "gemini-2.0-flash"):
-        self.client = genai.Client(api_key=api_key)
-        self.model = model
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gemini-2.0-flash",
+        response_cache: Optional[ResponseCache] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        resilience: Optional[ResiliencePolicy] = None,
+        provider: Optional[LLMProvider] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        context_cache: Optional[ContextCache] = None,
+        batch_window: float = 0.0,
+        batch_size: int = 16,
+        router: Optional[ModelRouter] = None
+    ):
+        self.provider = provider if provider is not None else GeminiProvider(api_key=api_key, model=model)
+        self.metrics = metrics or default_metrics
+        self.context_cache = context_cache
+        self.router = router
+        self.response_cache = response_cache
+        self.semantic_cache = semantic_cache
+        self.resilience = resilience or ResiliencePolicy()
+        self.single_flight = SingleFlight(metrics=self.metrics)
+        # Classifications arriving within batch_window seconds of each other share one prompt
+        self.intent_batcher = MicroBatcher(
+            single=self._classify_one,
+            batch=self._classify_batch,
+            name="INTERPRET_COMMAND",
+            max_batch=batch_size,
+            max_wait=batch_window,
+            metrics=self.metrics
+        ) if batch_window > 0 else None
+        self.message_pool = MessagePool(generate=self._call_gemini, stream=self._stream_gemini)
+
+    async def _call_gemini(
+        self,
+        prompt: str,
+        template: Optional[PromptTemplate] = None,
+        cache_input: Optional[str] = None,
+        request: Optional[Callable[[], Awaitable[Optional[str]]]] = None
+    ) -> Optional[str]:
+        cache_key = None
+        if self.response_cache and template and template.cacheable and cache_input is not None:
+            today = date.today().isoformat() if template.date_relative else None
+            model = self.router.select(template.name).model if self.router else self.provider.model
+            cache_key = ResponseCache.make_key(
+                template.name, cache_input, today,
+                version=f"{template.fingerprint}:{model}",
+                keep_case=template.copies_input
+            )
+            cached = self.response_cache.get(template.name, cache_key)
+            if cached is not None:
+                logger.debug(f"LLM cache hit for {template.name}")
+                return cached
+
+        name = template.name if template else "UNKNOWN"
+        # Identical prompts sent concurrently by other sessions share one request
+        text = await self.single_flight.do(prompt, request or (lambda: self._request(prompt, template)), template=name)
+        if text is not None and cache_key:
+            self.response_cache.set(template.name, cache_key, text)
+        return text
+
+    async def _request(self, prompt: str, template: Optional[PromptTemplate]) -> Optional[str]:
+        name = template.name if template else "UNKNOWN"
+        provider = self.router.select(name) if self.router else self.provider
+        text = await self._send(prompt, template, provider)
+        if self.router and self.router.can_escalate(provider) and not self._valid_answer(template, text):
+            self.router.record_escalation(name, provider)
+            logger.info(f"Escalating {name} from {provider.model} to {self.router.default.model}")
+            text = await self._send(prompt, template, self.router.default)
+        return text
+
+    async def _send(self, prompt: str, template: Optional[PromptTemplate], provider: LLMProvider) -> Optional[str]:
+        name = template.name if template else "UNKNOWN"
+        logger.debug("prompt: %s", prompt)
+        started = time.monotonic()
+        # Cached prefixes belong to the default model
+        use_context_cache = self.context_cache and template and provider is self.provider
+        handle = await self.context_cache.handle(template) if use_context_cache else None
+        schema = template.schema if template else None
+
+        async def attempt() -> str:
+            nonlocal handle
+            if handle:
+                try:
+                    return await provider.generate_cached(handle, template.tail(prompt), schema)
+                except Exception as e:
+                    logger.warning(f"Cached prefix call failed for {name}, sending the full prompt: {e}")
+                    self.context_cache.invalidate(template)
+                    handle = None
+            return await provider.generate(prompt, schema)
+
+        text = await self.resilience.execute(attempt, template=name)
+        latency = time.monotonic() - started
+        if handle:
+            self.metrics.increment("llm_cached_prompt_tokens", estimate_tokens(template.prefix), template=name)
+        self._record_usage(name, template.tail(prompt) if handle else prompt, text, latency)
+        if self.router:
+            self.router.record(name, provider, latency)
+        logger.debug("response: %s", text)
+        return text
+
+    def _valid_answer(self, template: Optional[PromptTemplate], text: Optional[str]) -> bool:
+        if not text:
+            return False
+        if template is None:
+            return True
+        if template.schema:
+            try:
+                template.schema.model_validate_json(_strip_code_fences(text))
+                return True
+            except ValidationError:
+                return False
+        if template is INTERPRET_COMMAND_TEMPLATE:
+            return text.strip() in {choice.value for choice in MenuChoice}
+        if template is INTERPRET_COMMAND_BATCH_TEMPLATE:
+            try:
+                return isinstance(json.loads(_strip_code_fences(text)), list)
+            except json.JSONDecodeError:
+                return False
+        return True
+
+    async def _stream_gemini(self, prompt: str, template: Optional[PromptTemplate] = None) -> AsyncIterator[str]:
+        name = template.name if template else "UNKNOWN"
+        leader, shared = self.single_flight.claim(prompt)
+        if not leader:
+            # Another session is streaming the same prompt; its full text arrives as one chunk
+            self.metrics.increment("llm_deduplicated", template=name)
+            try:
+                text = await self.single_flight.wait(shared)
+            except asyncio.CancelledError:
+                if not shared.cancelled():
+                    raise
+                text = None
+            if text:
+                yield text
+            return
 
-    def _call_gemini(self, prompt: str, retries: int = 3) -> Optional[str]:
-        logger.info(f"prompt: {prompt}")
-        for attempt in range(retries):
+        logger.debug("prompt: %s", prompt)
+        started = time.monotonic()
+        result = None
+        provider = self.router.select(name) if self.router else self.provider
+
+        async def open_stream() -> Tuple[AsyncIterator[str], str]:
+            # Retries and deadlines only cover the wait for the first chunk
+            chunks = provider.stream(prompt).__aiter__()
             try:
-                response = self.client.models.generate_content(model=self.model, contents=[prompt])
-                logger.info(f"response: {response}")
-                return response.text.strip()
-            except Exception as e:
-                logger.error(f"Gemini API call failed (attempt {attempt + 1}): {e}")
-                time.sleep(2 ** attempt)
-        logger.warning("Max retries reached.")
-        return None
-
-    def _safe_json_parse(self, text: str, fallback: dict) -> dict:
+                return chunks, await chunks.__anext__()
+            except StopAsyncIteration:
+                return chunks, ""
+
+        try:
+            opened = await self.resilience.execute(open_stream, template=name)
+            if self.router:
+                self.router.record(name, provider, time.monotonic() - started)
+                # Streamed text cannot be taken back, so only a failed start escalates
+                if opened is None and self.router.can_escalate(provider):
+                    self.router.record_escalation(name, provider)
+                    provider = self.router.default
+                    opened = await self.resilience.execute(open_stream, template=name)
+            if opened is None:
+                self._record_usage(name, prompt, None, time.monotonic() - started)
+                return
+
+            self.metrics.observe("llm_first_chunk_seconds", time.monotonic() - started, template=name)
+            chunks, text = opened
+            parts: List[str] = []
+            while True:
+                if text:
+                    parts.append(text)
+                    yield text
+                try:
+                    text = await chunks.__anext__()
+                except StopAsyncIteration:
+                    break
+                except Exception as e:
+                    logger.error(f"Gemini stream interrupted: {e}")
+                    break
+            result = "".join(parts)
+            self._record_usage(name, prompt, result, time.monotonic() - started)
+        finally:
+            self.single_flight.resolve(prompt, shared, result)
+
+    def _record_usage(self, template: str, prompt: str, response: Optional[str], latency: float) -> None:
+        self.metrics.increment("llm_calls", template=template)
+        self.metrics.increment("llm_prompt_chars", len(prompt), template=template)
+        self.metrics.increment("llm_prompt_tokens", estimate_tokens(prompt), template=template)
+        self.metrics.observe("llm_latency_seconds", latency, template=template)
+        if response is None:
+            self.metrics.increment("llm_failed_calls", template=template)
+            return
+        self.metrics.increment("llm_response_chars", len(response), template=template)
+        self.metrics.increment("llm_response_tokens", estimate_tokens(response), template=template)
+
+    def _parse_result(self, text: Optional[str], template: PromptTemplate, fallback: dict, **dump_options: Any) -> dict:
+        """
+        Validate an answer against the template's result schema.
+
+        Returns:
+            The validated result as a dict, or the fallback if the answer is missing or invalid
+        """
+        if not text:
+            return fallback
         try:
-            clean = re.sub(r"^```json\s*|```$", "", text.strip(), flags=re.MULTILINE)
-            parsed = json.loads(clean)
-            if isinstance(parsed, dict):
-                logger.info(f"Parsed json returned: {parsed}")
-                return parsed
-            elif isinstance(parsed, str):
-                logger.warning(f"Parsed string instead of dict: {parsed}")
-                return fallback
-            else:
-                logger.error(f"Unexpected type: {type(parsed)} | content: {parsed}")
-                return fallback
-        except json.JSONDecodeError as e:
-            logger.debug(f"JSON decode error: {e} | raw response: {text}")
+            result = template.schema.model_validate_json(_strip_code_fences(text))
+        except ValidationError as e:
+            self.metrics.increment("llm_parse_failures", template=template.name)
+            logger.warning(f"Invalid {template.name} answer: {e.error_count()} errors | raw response: {text}")
             return fallback
+        data = result.model_dump(**dump_options)
+        logger.debug("Parsed result: %s", data)
+        return data
+
+    @staticmethod
+    def _semantic_namespace(template: PromptTemplate, *context: Any) -> str:
+        digest = hashlib.sha1("\x1f".join(str(c) for c in context).encode("utf-8")).hexdigest()[:12]
+        return f"{template.name}:{digest}"
+
+    def _semantic_lookup(self, namespace: str, user_input: str, threshold: Optional[float] = None) -> Tuple[Any, Any]:
+        if not self.semantic_cache:
+            return None, None
+        if not self.semantic_cache.ready:
+            # Skipped while the model warms up rather than delaying the turn on it
+            return None, None
+        try:
+            vector = self.semantic_cache.embed(user_input)
         except Exception as e:
-            logger.error(f"Unexpected error in _safe_json_parse: {e} | raw response: {text}")
-            return fallback
+            logger.error(f"Failed to embed utterance for semantic cache: {e}")
+            return None, None
+        return self.semantic_cache.lookup(namespace, vector, threshold), vector
+
+    def _semantic_store(self, namespace: str, vector: Any, result: Any) -> None:
+        if self.semantic_cache and vector is not None:
+            self.semantic_cache.store(namespace, vector, result)
+
+    # --- SPECULATION ---
+
+    @staticmethod
+    def likely_intents(user_input: str, limit: int = 2) -> List[MenuChoice]:
+        text = user_input.lower()
+        return [choice for choice, pattern in INTENT_HINTS.items() if pattern.search(text)][:limit]
+
+    async def interpret_command_speculative(self, user_input: str, options: Optional[str], limit: int = 2) -> MenuChoice:
+        """
+        Classify the command while the likely intents' extractions already run.
+
+        The extraction of the chosen intent is kept for the matching extract_*
+        call made later in this turn; the others are cancelled.
+        """
+        self.discard_speculations()
+        methods = {SPECULATIVE_EXTRACTIONS[choice] for choice in self.likely_intents(user_input, limit)}
+        tasks = {}
+        # Speculative calls queue behind the classification and other sessions' turns
+        with scheduling(priority=Priority.SPECULATIVE):
+            for method in methods:
+                args = (user_input, VIEW_OPTIONS) if method == "interpret_view_task_command" else (user_input,)
+                tasks[(method, user_input)] = asyncio.create_task(getattr(self, method)(*args))
+                self.metrics.increment("llm_speculations", method=method)
+
+        choice = await self.interpret_command(user_input, options)
+
+        keep = (SPECULATIVE_EXTRACTIONS.get(choice), user_input)
+        for key, task in tasks.items():
+            if key != keep:
+                task.cancel()
+                self.metrics.increment("llm_speculations_wasted", method=key[0])
+        _speculations.set({keep: tasks[keep]} if keep in tasks else {})
+        return choice
+
+    def discard_speculations(self) -> None:
+        store = _speculations.get()
+        if store:
+            for (method, _), task in store.items():
+                task.cancel()
+                self.metrics.increment("llm_speculations_wasted", method=method)
+        # Cleared before new tasks are created so they never see their own store
+        _speculations.set(None)
+
+    def _take_speculation(self, method: str, user_input: str, usable: bool = True) -> Optional[asyncio.Task]:
+        # Callers count a hit when they await the task; one they cannot use is cancelled here
+        store = _speculations.get()
+        task = store.pop((method, user_input), None) if store else None
+        if task and not usable:
+            task.cancel()
+            self.metrics.increment("llm_speculations_wasted", method=method)
+            return None
+        return task
+
+    # --- BATCHING ---
+
+    async def _classify_one(self, options: str, user_input: str) -> Optional[str]:
+        prompt = INTERPRET_COMMAND_TEMPLATE.format(command=user_input, options=options)
+        return await self._request(prompt, INTERPRET_COMMAND_TEMPLATE)
+
+    async def _classify_batch(self, options: str, user_inputs: List[str]) -> Optional[List[str]]:
+        commands = "\n".join(f"{i}. {json.dumps(text, ensure_ascii=False)}" for i, text in enumerate(user_inputs, 1))
+        prompt = INTERPRET_COMMAND_BATCH_TEMPLATE.format(options=options, commands=commands)
+        text = await self._request(prompt, INTERPRET_COMMAND_BATCH_TEMPLATE)
+        try:
+            answers = json.loads(_strip_code_fences(text or ""))
+        except json.JSONDecodeError:
+            answers = None
+        if not isinstance(answers, list) or len(answers) != len(user_inputs):
+            if text:
+                self.metrics.increment("llm_parse_failures", template=INTERPRET_COMMAND_BATCH_TEMPLATE.name)
+            return None
+        return ["None" if answer is None else str(answer).strip() for answer in answers]
 
     # --- INTERPRETERS ---
 
-    def interpret_command(self, user_input: str, options: Optional[str]) -> MenuChoice:
+    async def interpret_command(self, user_input: str, options: Optional[str]) -> MenuChoice:
+        namespace = self._semantic_namespace(INTERPRET_COMMAND_TEMPLATE, options)
+        cached, vector = self._semantic_lookup(namespace, user_input)
+        if cached is not None:
+            return MenuChoice(cached)
+
         prompt = INTERPRET_COMMAND_TEMPLATE.format(command=user_input, options=options)
-        logger.info(f'IC prompt - {prompt}')
-        result = self._call_gemini(prompt)
-        logger.info(f'IC result - {result}')
+        request = (lambda: self.intent_batcher.submit(user_input, group=str(options))) if self.intent_batcher else None
+        result = await self._call_gemini(
+            prompt, template=INTERPRET_COMMAND_TEMPLATE, cache_input=f"{options}\n{user_input}", request=request
+        )
         try:
-            return MenuChoice(result)
+            choice = MenuChoice(result)
         except Exception:
             return MenuChoice.NONE
 
-    def interpret_view_task_command(self, user_input: str, view_options: str) -> dict:
-        prompt = VIEW_TASK_TEMPLATE.format(command=user_input, view_options=view_options)
-        logger.info(f"VC prompt - {prompt}")
-        try:
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=[prompt]
-            )
-            result_raw = response.text.strip()
+        if choice != MenuChoice.NONE:
+            self._semantic_store(namespace, vector, choice.value)
+        return choice
 
-            logger.info(f"interpret_view_task_command raw: {result_raw}")
+    async def interpret_view_task_command(self, user_input: str, view_options: str) -> dict:
+        # The speculation ran with the default options and is only valid for those
+        speculated = self._take_speculation("interpret_view_task_command", user_input, usable=view_options == VIEW_OPTIONS)
+        if speculated:
+            self.metrics.increment("llm_speculation_hits", method="interpret_view_task_command")
+            return await speculated
 
-            return self._safe_json_parse(result_raw, {"status": "error", "choice": None})
-        except Exception as e:
-            logger.error(f"Gemini AI failed to parse view task command: {e}")
+        # Not answered from the semantic cache: opposite filters such as "completed" and
+        # "uncompleted" tasks embed too closely for a nearest neighbour to tell them apart
+        prompt = VIEW_TASK_TEMPLATE.format(command=user_input, view_options=view_options)
+        result_raw = await self._call_gemini(prompt, template=VIEW_TASK_TEMPLATE, cache_input=f"{view_options}\n{user_input}")
+        if result_raw is None:
+            logger.error("Gemini AI failed to parse view task command")
             return {"status": "error", "message": "Something went wrong.", "choice": None}
 
+        return self._parse_result(result_raw, VIEW_TASK_TEMPLATE, {"status": "error", "choice": None})
+
     # --- EXTRACTION ---
 
-    def extract_task_data(self, user_input: str) -> dict:
+    async def extract_task_data(self, user_input: str) -> dict:
+        speculated = self._take_speculation("extract_task_data", user_input)
+        if speculated:
+            self.metrics.increment("llm_speculation_hits", method="extract_task_data")
+            return await speculated
+
+        local_date = parse_date_expression(user_input)
+        if local_date and not remainder(user_input, local_date):
+            return {"name": None, "date": local_date.due_date}
+
         prompt = EXTRACT_TASK_TEMPLATE.format(user_input=user_input, today=date.today())
-        logger.info(f"prompt: {prompt}")
-        result = self._call_gemini(prompt)
-        return self._safe_json_parse(result or '', {"name": None, "date": None})
+        result = await self._call_gemini(prompt, template=EXTRACT_TASK_TEMPLATE, cache_input=user_input)
+        return self._parse_result(result, EXTRACT_TASK_TEMPLATE, {"name": None, "date": None})
+
+    async def extract_edit_task_data(self, user_input: str) -> dict:
+        local_date = parse_date_expression(user_input)
+        if local_date and not remainder(user_input, local_date):
+            return {"title": None, "due_date": local_date.due_date}
 
-    def extract_edit_task_data(self, user_input: str) -> dict:
         prompt = EXTRACT_EDIT_TASK_TEMPLATE.format(user_input=user_input, today=date.today())
-        result = self._call_gemini(prompt)
-        return self._safe_json_parse(result or '', {"title": None, "due_date": None})
+        result = await self._call_gemini(prompt, template=EXTRACT_EDIT_TASK_TEMPLATE, cache_input=user_input)
+        return self._parse_result(result, EXTRACT_EDIT_TASK_TEMPLATE, {"title": None, "due_date": None})
+
+    async def extract_task_id_or_title(self, user_input: str) -> dict:
+        speculated = self._take_speculation("extract_task_id_or_title", user_input)
+        if speculated:
+            self.metrics.increment("llm_speculation_hits", method="extract_task_id_or_title")
+            return await speculated
 
-    def extract_task_id_or_title(self, user_input: str) -> dict:
         prompt = EXTRACT_ID_OR_TITLE_TEMPLATE.format(user_input=user_input)
-        result = self._call_gemini(prompt)
-        return self._safe_json_parse(result or '', {"task_id": None, "task_title": None})
+        result = await self._call_gemini(prompt, template=EXTRACT_ID_OR_TITLE_TEMPLATE, cache_input=user_input)
+        return self._parse_result(result, EXTRACT_ID_OR_TITLE_TEMPLATE, {"task_id": None, "task_title": None})
+
+    async def extract_task_id_or_title_to_edit(self, user_input: str) -> dict:
+        speculated = self._take_speculation("extract_task_id_or_title_to_edit", user_input)
+        if speculated:
+            self.metrics.increment("llm_speculation_hits", method="extract_task_id_or_title_to_edit")
+            return await speculated
 
-    def extract_task_id_or_title_to_edit(self, user_input: str) -> dict:
         prompt = EXTRACT_ID_OR_TITLE_TO_EDIT_TEMPLATE.format(user_input=user_input, today=date.today())
-        result = self._call_gemini(prompt)
-        return self._safe_json_parse(result or '', {"task_id": None, "task_title": None})
+        result = await self._call_gemini(prompt, template=EXTRACT_ID_OR_TITLE_TO_EDIT_TEMPLATE, cache_input=user_input)
+        return self._parse_result(result, EXTRACT_ID_OR_TITLE_TO_EDIT_TEMPLATE, {"task_id": None, "task_title": None})
     
-    def extract_task_date_filter(self, user_input: str) -> Optional[Dict[str, str]]:
+    async def extract_task_date_filter(self, user_input: str) -> Optional[Dict[str, str]]:
+        local_date = parse_date_expression(user_input)
+        if local_date:
+            return local_date.to_filter()
+
+        namespace = self._semantic_namespace(EXTRACT_TASK_DATE_FILTER_TEMPLATE, date.today())
+        cached, vector = self._semantic_lookup(namespace, user_input, threshold=DATE_FILTER_SEMANTIC_THRESHOLD)
+        if cached is not None:
+            return cached
+
         prompt = EXTRACT_TASK_DATE_FILTER_TEMPLATE.format(user_input=user_input, today=date.today())
-        result = self._call_gemini(prompt)
-        return self._safe_json_parse(result or '', {"date": None, "start": None, "end": None})
+        result = await self._call_gemini(prompt, template=EXTRACT_TASK_DATE_FILTER_TEMPLATE, cache_input=user_input)
+        # Unset keys are dropped because the filter is passed on as query parameters
+        date_filter = self._parse_result(result, EXTRACT_TASK_DATE_FILTER_TEMPLATE, {}, exclude_none=True)
+        if date_filter.get("date") or (date_filter.get("start") and date_filter.get("end")):
+            self._semantic_store(namespace, vector, date_filter)
+        return date_filter
 
 
     # --- UI GENERATION ---
 
-    def generate_conversational_menu(self, username: Optional[str] = None, first_time: bool = True) -> str:
-        if first_time:
-            prompt = MENU_TEMPLATE.format(name_intro=f"{username}," if username else "there")
-        else:
-            prompt = FOLLOWUP_TEMPLATE
-        return self._call_gemini(prompt) or "Hi! 😊 What would you like to do?"
+    async def generate_conversational_menu(self, username: Optional[str] = None, first_time: bool = True) -> str:
+        kind = MessageKind.MENU if first_time else MessageKind.FOLLOWUP
+        message = self.message_pool.get(kind, username) or await self.message_pool.generate(kind, username)
+        return message or "Hi! 😊 What would you like to do?"
 
-    def generate_conversational_response(self, user_input: str, intent: MenuChoice) -> str:
+    async def generate_conversational_response(self, user_input: str, intent: MenuChoice) -> str:
         prompt = CONFIRMATION_TEMPLATE.format(user_input=user_input, intent=intent.name)
-        confirmation = self._call_gemini(prompt) or f"Okay! Let’s handle that '{intent.name.lower()}' request ✅"
+        confirmation = await self._call_gemini(prompt, template=CONFIRMATION_TEMPLATE) or f"Okay! Let’s handle that '{intent.name.lower()}' request ✅"
         return confirmation
+
+    async def stream_conversational_menu(self, username: Optional[str] = None, first_time: bool = True) -> AsyncIterator[str]:
+        kind = MessageKind.MENU if first_time else MessageKind.FOLLOWUP
+        message = self.message_pool.get(kind, username)
+        if message:
+            yield message
+            return
+
+        streamed = False
+        async for chunk in self.message_pool.stream(kind, username):
+            streamed = True
+            yield chunk
+        if not streamed:
+            yield "Hi! 😊 What would you like to do?"
+
+    async def stream_conversational_response(self, user_input: str, intent: MenuChoice) -> AsyncIterator[str]:
+        prompt = CONFIRMATION_TEMPLATE.format(user_input=user_input, intent=intent.name)
+        streamed = False
+        async for chunk in self._stream_gemini(prompt, template=CONFIRMATION_TEMPLATE):
+            streamed = True
+            yield chunk
+        if not streamed:
+            yield f"Okay! Let’s handle that '{intent.name.lower()}' request ✅"
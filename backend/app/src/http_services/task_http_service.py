@@ -75,6 +75,24 @@ class TaskHttpService:
         response.raise_for_status()
         return response.json()
 
+    async def get_tasks_page(self, after_id: int = 0, limit: int = 500) -> List[Dict[str, Any]]:
+        """
+        Retrieve a page of all users' tasks, ordered by ID.
+        
+        Args:
+            after_id: Last task ID of the previous page (0 for the first page)
+            limit: Maximum number of tasks to return
+            
+        Returns:
+            List of task dictionaries, empty once all tasks were returned
+            
+        Raises:
+            httpx.HTTPStatusError: If the request fails
+        """
+        response = await self.client.get("/tasks/all", params={"after_id": after_id, "limit": limit})
+        response.raise_for_status()
+        return response.json()
+
     async def get_task_by_id(self, task_id: int) -> Dict[str, Any]:
         """
         Retrieve a specific task by its ID.
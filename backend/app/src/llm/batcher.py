@@ -0,0 +1,162 @@
+"""
+Micro-batching module for small LLM requests.
+
+This module contains the MicroBatcher class which collects requests
+arriving from concurrent chat sessions within a few milliseconds of each
+other and sends them to the LLM as one batch prompt, fanning the answers
+back out to the waiting callers.
+"""
+
+import asyncio
+import concurrent.futures
+import math
+import threading
+from typing import Awaitable, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from src.utils.logger import logger
+from src.utils.metrics import MetricsRegistry, metrics as default_metrics
+
+I = TypeVar("I")
+R = TypeVar("R")
+
+BATCH_SIZE_BUCKETS: Tuple[float, ...] = (1, 2, 4, 8, 16, 32, 64, math.inf)
+
+_Pending = List[Tuple[I, concurrent.futures.Future]]
+
+
+class MicroBatcher(Generic[I, R]):
+    """
+    Time- and size-bounded batcher shared by all sessions of the process.
+
+    The first request of a window waits max_wait seconds for others to
+    join, then sends the whole window; a window reaching max_batch items is
+    sent at once by the request that filled it. Only requests of the same
+    group, e.g. classified against the same options, are batched together.
+    A lone request is sent on its own, and every item of a batch whose
+    answer cannot be used is retried on its own.
+
+    Attributes:
+        name: Label of the batcher in metrics
+        max_batch: Largest number of items sent in one batch
+        max_wait: Seconds a window stays open for more items
+    """
+
+    def __init__(
+        self,
+        single: Callable[[str, I], Awaitable[R]],
+        batch: Callable[[str, List[I]], Awaitable[Optional[List[R]]]],
+        name: str,
+        max_batch: int = 16,
+        max_wait: float = 0.005,
+        metrics: Optional[MetricsRegistry] = None
+    ) -> None:
+        """
+        Initialize an empty batcher.
+
+        Args:
+            single: Coroutine function answering one item of a group
+            batch: Coroutine function answering several items of a group in order, or None on failure
+            name: Label of the batcher in metrics
+            max_batch: Largest number of items sent in one batch
+            max_wait: Seconds a window stays open for more items
+            metrics: Registry the batching metrics are recorded in
+        """
+        self._single: Callable[[str, I], Awaitable[R]] = single
+        self._batch: Callable[[str, List[I]], Awaitable[Optional[List[R]]]] = batch
+        self.name: str = name
+        self.max_batch: int = max_batch
+        self.max_wait: float = max_wait
+        self.metrics: MetricsRegistry = metrics or default_metrics
+        self._lock: threading.Lock = threading.Lock()
+        self._pending: Dict[str, _Pending] = {}
+
+    async def submit(self, item: I, group: str = "") -> R:
+        """
+        Answer an item, batched with the items other callers submit meanwhile.
+
+        Args:
+            item: Item to answer
+            group: Items are only batched with items of the same group
+
+        Returns:
+            The item's answer
+        """
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        with self._lock:
+            pending: _Pending = self._pending.setdefault(group, [])
+            pending.append((item, future))
+            opens_window: bool = len(pending) == 1
+            full: Optional[_Pending] = self._take(group) if len(pending) >= self.max_batch else None
+
+        answer: asyncio.Future = asyncio.wrap_future(future)
+        if full:
+            await self._flush(group, full)
+        elif opens_window:
+            try:
+                # Returns early if the window filled up and was sent by someone else
+                await asyncio.wait({answer}, timeout=self.max_wait)
+            except asyncio.CancelledError:
+                with self._lock:
+                    self._abandon(self._take(group))
+                raise
+            if not answer.done():
+                with self._lock:
+                    window: _Pending = self._take(group)
+                if window:
+                    await self._flush(group, window)
+
+        try:
+            return await asyncio.shield(answer)
+        except asyncio.CancelledError:
+            # The caller flushing our window was cancelled; answer the item alone
+            if not future.cancelled():
+                raise
+            return await self._single(group, item)
+
+    def _take(self, group: str) -> _Pending:
+        return self._pending.pop(group, [])
+
+    async def _flush(self, group: str, pending: _Pending) -> None:
+        try:
+            await self._send(group, pending)
+        except BaseException:
+            self._abandon(pending)
+            raise
+
+    async def _send(self, group: str, pending: _Pending) -> None:
+        self.metrics.observe("llm_batch_size", len(pending), BATCH_SIZE_BUCKETS, batcher=self.name)
+        items: List[I] = [item for item, _ in pending]
+        answers: Optional[List[R]] = None
+        if len(pending) > 1:
+            self.metrics.increment("llm_batches", batcher=self.name)
+            self.metrics.increment("llm_batched_items", len(pending), batcher=self.name)
+            try:
+                answers = await self._batch(group, items)
+            except Exception as e:
+                logger.error(f"Batch of {len(pending)} {self.name} requests failed: {e}")
+
+        if answers is not None and len(answers) == len(pending):
+            for (_, future), answer in zip(pending, answers):
+                self._settle(future, answer)
+            return
+
+        if len(pending) > 1:
+            self.metrics.increment("llm_batch_fallbacks", batcher=self.name)
+            logger.warning(f"Unusable answer to a batch of {len(pending)} {self.name} requests, sending them one by one")
+        results = await asyncio.gather(*(self._single(group, item) for item in items), return_exceptions=True)
+        for (_, future), result in zip(pending, results):
+            self._settle(future, result)
+
+    @staticmethod
+    def _abandon(pending: _Pending) -> None:
+        for _, future in pending:
+            future.cancel()
+
+    @staticmethod
+    def _settle(future: concurrent.futures.Future, result: object) -> None:
+        if future.done():
+            return
+        if isinstance(result, BaseException):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
@@ -0,0 +1,106 @@
+"""
+Context cache module for static prompt prefixes.
+
+This module contains the ContextCache class which registers the static
+instruction prefix of each prompt template once with the LLM provider's
+context cache, and hands out the resulting handle so later calls only
+send the dynamic tail of the prompt. AppService only enables it with
+LLM_CONTEXT_CACHE=on, since no prefix reaches the providers' minimum yet.
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Set, Tuple
+
+from src.llm.providers import LLMProvider
+from src.llm.usage import estimate_tokens
+from src.utils.logger import logger
+from src.utils.metrics import MetricsRegistry, metrics as default_metrics
+from src.utils.prompt_templates import PromptTemplate
+
+
+class ContextCache:
+    """
+    Per-template registry of provider-side cached prefixes.
+
+    Handles are renewed shortly before their TTL runs out. Templates whose
+    prefix is below the provider's minimum cacheable size are never
+    registered, and a failed registration is not retried until the retry
+    delay passes, so those templates keep using the full-prompt path.
+
+    Attributes:
+        provider: Provider holding the cached prefixes
+        ttl: Seconds a cached prefix lives on the provider
+        min_tokens: Smallest prefix worth caching, in estimated tokens
+        retry_after: Seconds to wait before retrying a failed registration
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        ttl: float = 3600.0,
+        min_tokens: int = 1024,
+        retry_after: float = 600.0,
+        metrics: Optional[MetricsRegistry] = None
+    ) -> None:
+        self.provider: LLMProvider = provider
+        self.ttl: float = ttl
+        self.min_tokens: int = min_tokens
+        self.retry_after: float = retry_after
+        self.metrics: MetricsRegistry = metrics or default_metrics
+        self._lock: threading.Lock = threading.Lock()
+        self._handles: Dict[str, Tuple[str, float]] = {}
+        self._failed_until: Dict[str, float] = {}
+        self._too_small: Set[str] = set()
+
+    async def handle(self, template: PromptTemplate) -> Optional[str]:
+        """
+        Get a handle to the template's cached prefix, registering it if needed.
+
+        Args:
+            template: Prompt template whose prefix should be cached
+
+        Returns:
+            Provider handle, or None if the full prompt must be sent
+        """
+        if not template.prefix:
+            return None
+        tokens: int = estimate_tokens(template.prefix)
+        if tokens < self.min_tokens:
+            if template.name not in self._too_small:
+                self._too_small.add(template.name)
+                logger.info(f"Prefix of {template.name} is {tokens} tokens, below the {self.min_tokens} worth caching")
+            return None
+
+        now: float = time.monotonic()
+        with self._lock:
+            cached: Optional[Tuple[str, float]] = self._handles.get(template.name)
+            if cached and cached[1] > now:
+                return cached[0]
+            if self._failed_until.get(template.name, 0.0) > now:
+                return None
+
+        try:
+            handle: Optional[str] = await self.provider.create_cache(template.name, template.prefix, self.ttl)
+        except Exception as e:
+            logger.warning(f"Context caching failed for {template.name}, using full prompts: {e}")
+            handle = None
+
+        with self._lock:
+            if handle is None:
+                self._failed_until[template.name] = now + self.retry_after
+                return None
+            # Renew a little early so a handle never expires mid-call
+            self._handles[template.name] = (handle, now + self.ttl * 0.9)
+        self.metrics.increment("llm_context_cache_created", template=template.name)
+        return handle
+
+    def invalidate(self, template: PromptTemplate) -> None:
+        """
+        Forget the handle of a template, e.g. after the provider rejected it.
+
+        Args:
+            template: Prompt template whose handle is stale
+        """
+        with self._lock:
+            self._handles.pop(template.name, None)
@@ -0,0 +1,225 @@
+"""
+Message pool module for pre-generated conversational messages.
+
+This module contains the MessagePool class which keeps a bounded set of
+LLM-generated menu and follow-up messages, refreshed on a background
+thread, so the main loop can greet users without a Gemini round trip.
+"""
+
+import asyncio
+import random
+import threading
+from collections import deque
+from enum import Enum
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from src.llm.scheduler import Priority, scheduling
+from src.utils.logger import logger
+from src.utils.prompt_templates import PromptTemplate, MENU_TEMPLATE, FOLLOWUP_TEMPLATE
+
+# Placeholder the model is asked to keep verbatim; replaced locally per user
+NAME_TOKEN: str = "[[NAME]]"
+
+
+class MessageKind(str, Enum):
+    """
+    Enumeration of the conversational messages kept in the pool.
+    """
+    MENU = "menu"
+    FOLLOWUP = "followup"
+
+
+class MessagePool:
+    """
+    Bounded pool of pre-generated menu and follow-up messages.
+
+    Messages are generated without any user data; the username is filled
+    in locally when a message is taken from the pool. A background thread
+    fills the pool at startup and then replaces the oldest message of each
+    kind every refresh interval.
+
+    Attributes:
+        size: Maximum number of messages kept per kind
+        refresh_interval: Seconds between background refreshes
+    """
+
+    def __init__(
+        self,
+        generate: Callable[..., Awaitable[Optional[str]]],
+        size: int = 8,
+        refresh_interval: float = 600.0,
+        stream: Optional[Callable[..., AsyncIterator[str]]] = None
+    ) -> None:
+        """
+        Initialize an empty message pool.
+
+        Args:
+            generate: Coroutine function sending a prompt (and its template) to the LLM and returning its text
+            size: Maximum number of messages kept per kind
+            refresh_interval: Seconds between background refreshes
+            stream: Function streaming the LLM answer to a prompt (and its template) as text chunks
+        """
+        self._generate: Callable[..., Awaitable[Optional[str]]] = generate
+        self._stream: Optional[Callable[..., AsyncIterator[str]]] = stream
+        self.size: int = size
+        self.refresh_interval: float = refresh_interval
+        self._messages: Dict[MessageKind, Deque[str]] = {kind: deque(maxlen=size) for kind in MessageKind}
+        self._lock: threading.Lock = threading.Lock()
+        self._stop: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Start the background thread that fills and refreshes the pool.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="message-pool", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background refresh thread.
+        """
+        self._stop.set()
+
+    def get(self, kind: MessageKind, username: Optional[str] = None) -> Optional[str]:
+        """
+        Take a random message of the given kind, personalized for the user.
+
+        Args:
+            kind: Kind of message to take
+            username: Name to greet the user with, if known
+
+        Returns:
+            Rendered message, or None if the pool holds no message of this kind
+        """
+        with self._lock:
+            if not self._messages[kind]:
+                return None
+            message: str = random.choice(self._messages[kind])
+        return self._render(message, username)
+
+    async def generate(self, kind: MessageKind, username: Optional[str] = None) -> Optional[str]:
+        """
+        Generate a fresh message with the LLM, add it to the pool and render it.
+
+        Used when the pool is empty so that the call also seeds the pool.
+
+        Args:
+            kind: Kind of message to generate
+            username: Name to greet the user with, if known
+
+        Returns:
+            Rendered message, or None if generation failed
+        """
+        message: Optional[str] = await self._generate_message(kind)
+        if not message:
+            return None
+        self.add(kind, message)
+        return self._render(message, username)
+
+    async def stream(self, kind: MessageKind, username: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Stream a fresh message from the LLM, rendering it as chunks arrive.
+
+        The complete message is added to the pool once the stream ends.
+        Falls back to generate when no streaming function was given.
+
+        Args:
+            kind: Kind of message to generate
+            username: Name to greet the user with, if known
+
+        Yields:
+            Rendered chunks of the message
+        """
+        if self._stream is None:
+            message: Optional[str] = await self.generate(kind, username)
+            if message:
+                yield message
+            return
+
+        template, prompt = self._prompt(kind)
+        parts: List[str] = []
+        pending: str = ""
+        async for chunk in self._stream(prompt, template=template):
+            parts.append(chunk)
+            ready, pending = self._split_renderable(pending + chunk)
+            if ready:
+                yield self._render(ready, username)
+        if pending:
+            yield self._render(pending, username)
+
+        message = self._accept(kind, "".join(parts).strip())
+        if message:
+            self.add(kind, message)
+
+    def add(self, kind: MessageKind, message: str) -> None:
+        """
+        Add a message to the pool, evicting the oldest one when full.
+
+        Args:
+            kind: Kind of the message
+            message: Message text, still containing the name placeholder for menus
+        """
+        with self._lock:
+            self._messages[kind].append(message)
+
+    async def refresh(self) -> None:
+        """
+        Generate one new message per kind, or fill the kind up if it is short.
+        """
+        for kind in MessageKind:
+            with self._lock:
+                missing: int = max(self.size - len(self._messages[kind]), 1)
+            for _ in range(missing):
+                if self._stop.is_set():
+                    return
+                message: Optional[str] = await self._generate_message(kind)
+                if message:
+                    self.add(kind, message)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(messages) for messages in self._messages.values())
+
+    def _run(self) -> None:
+        logger.debug("Message pool refresher started")
+        while not self._stop.is_set():
+            try:
+                with scheduling(session="message-pool", priority=Priority.BACKGROUND):
+                    asyncio.run(self.refresh())
+            except Exception as e:
+                logger.error(f"Message pool refresh failed: {e}")
+            self._stop.wait(self.refresh_interval)
+
+    async def _generate_message(self, kind: MessageKind) -> Optional[str]:
+        template, prompt = self._prompt(kind)
+        return self._accept(kind, await self._generate(prompt, template=template))
+
+    @staticmethod
+    def _prompt(kind: MessageKind) -> Tuple[PromptTemplate, str]:
+        template: PromptTemplate = MENU_TEMPLATE if kind == MessageKind.MENU else FOLLOWUP_TEMPLATE
+        return template, template.format(name_intro=NAME_TOKEN)
+
+    @staticmethod
+    def _accept(kind: MessageKind, message: Optional[str]) -> Optional[str]:
+        if not message:
+            return None
+        if kind == MessageKind.MENU and NAME_TOKEN not in message:
+            logger.warning(f"Discarding pooled menu without name placeholder: {message}")
+            return None
+        return message
+
+    @staticmethod
+    def _split_renderable(text: str) -> Tuple[str, str]:
+        # Hold back a trailing partial placeholder until the next chunk completes it
+        for size in range(min(len(NAME_TOKEN) - 1, len(text)), 0, -1):
+            if NAME_TOKEN.startswith(text[-size:]):
+                return text[:-size], text[-size:]
+        return text, ""
+
+    @staticmethod
+    def _render(message: str, username: Optional[str]) -> str:
+        return message.replace(NAME_TOKEN, f"{username}," if username else "there")
@@ -0,0 +1,390 @@
+"""
+LLM provider module for the TaskGPT application.
+
+This module defines the LLMProvider interface used by AICommandInterpreter
+and its backends: the live Gemini API, a recorder that logs prompt/response
+pairs to JSONL, and a replay backend that serves recorded responses with
+synthetic latency for offline tests and benchmarks. The replay backend
+also emulates context caching so the cached-prefix path can be tested.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Type
+
+from google import genai
+from google.genai import types
+from pydantic import BaseModel
+
+from src.utils.logger import logger
+
+_ISO_DATE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b")
+
+
+class LLMProvider(ABC):
+    """
+    Abstract base class for text generation backends.
+
+    Attributes:
+        model: Name of the model the provider talks to
+    """
+
+    model: str
+
+    @abstractmethod
+    async def generate(self, prompt: str, schema: Optional[Type[BaseModel]] = None) -> str:
+        """
+        Generate the complete answer to a prompt.
+
+        Args:
+            prompt: Rendered prompt
+            schema: Model the answer must be JSON for, if the backend supports structured output
+
+        Returns:
+            Answer text with surrounding whitespace stripped
+
+        Raises:
+            Exception: If the backend fails; retries are up to the caller
+        """
+        pass
+
+    @abstractmethod
+    def stream(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Generate the answer to a prompt as a stream of text chunks.
+
+        Args:
+            prompt: Rendered prompt
+
+        Returns:
+            Asynchronous iterator of non-empty text chunks
+        """
+        pass
+
+    async def create_cache(self, name: str, content: str, ttl: float) -> Optional[str]:
+        """
+        Register a static prompt prefix with the provider's context cache.
+
+        Args:
+            name: Display name of the cache entry
+            content: Prefix text to cache
+            ttl: Seconds the entry should live
+
+        Returns:
+            Handle to pass to generate_cached, or None if caching is unsupported
+        """
+        return None
+
+    async def generate_cached(self, handle: str, prompt: str, schema: Optional[Type[BaseModel]] = None) -> str:
+        """
+        Generate the answer to a prompt that continues a cached prefix.
+
+        Args:
+            handle: Handle returned by create_cache
+            prompt: Dynamic tail of the prompt
+            schema: Model the answer must be JSON for, if the backend supports structured output
+
+        Returns:
+            Answer text with surrounding whitespace stripped
+
+        Raises:
+            Exception: If the handle is unknown or expired
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support context caching")
+
+    def with_model(self, model: str) -> "LLMProvider":
+        """
+        Get a provider talking to another model of the same backend.
+
+        Args:
+            model: Model name
+
+        Returns:
+            Provider for that model; backends without model choice return themselves
+        """
+        return self
+
+
+class GeminiProvider(LLMProvider):
+    """
+    Provider backed by the Gemini API.
+
+    The SDK is blocking, so calls run in worker threads.
+
+    Attributes:
+        client: Gemini SDK client
+        model: Gemini model name
+    """
+
+    def __init__(self, api_key: str, model: str = "gemini-2.0-flash", client: Optional[genai.Client] = None) -> None:
+        self.client: genai.Client = client or genai.Client(api_key=api_key)
+        self.model: str = model
+
+    def with_model(self, model: str) -> "GeminiProvider":
+        # Shares the client, and with it the connection pool
+        return self if model == self.model else GeminiProvider(api_key=None, model=model, client=self.client)
+
+    async def generate(self, prompt: str, schema: Optional[Type[BaseModel]] = None) -> str:
+        if schema is None:
+            response = await asyncio.to_thread(self.client.models.generate_content, model=self.model, contents=[prompt])
+        else:
+            response = await asyncio.to_thread(
+                self.client.models.generate_content,
+                model=self.model,
+                contents=[prompt],
+                config=types.GenerateContentConfig(response_mime_type="application/json", response_schema=schema)
+            )
+        return response.text.strip()
+
+    async def create_cache(self, name: str, content: str, ttl: float) -> Optional[str]:
+        cache = await asyncio.to_thread(
+            self.client.caches.create,
+            model=self.model,
+            config=types.CreateCachedContentConfig(contents=[content], display_name=name, ttl=f"{int(ttl)}s")
+        )
+        return cache.name
+
+    async def generate_cached(self, handle: str, prompt: str, schema: Optional[Type[BaseModel]] = None) -> str:
+        config = types.GenerateContentConfig(cached_content=handle)
+        if schema is not None:
+            config.response_mime_type = "application/json"
+            config.response_schema = schema
+        response = await asyncio.to_thread(
+            self.client.models.generate_content,
+            model=self.model,
+            contents=[prompt],
+            config=config
+        )
+        return response.text.strip()
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        stream = await asyncio.to_thread(self.client.models.generate_content_stream, model=self.model, contents=[prompt])
+        chunks = iter(stream)
+        while True:
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                return
+            if chunk.text:
+                yield chunk.text
+
+
+class RecordingProvider(LLMProvider):
+    """
+    Provider that forwards to another provider and records every exchange.
+
+    Each successful call appends one JSON line with the prompt, the
+    response and the observed latency to the recording file.
+
+    Attributes:
+        inner: Provider answering the prompts
+        path: JSONL file the exchanges are appended to
+    """
+
+    def __init__(self, inner: LLMProvider, path: str) -> None:
+        self.inner: LLMProvider = inner
+        self.path: str = path
+        self.model: str = inner.model
+        self._lock: threading.Lock = threading.Lock()
+        self._cached_prefixes: Dict[str, str] = {}
+
+    def with_model(self, model: str) -> "RecordingProvider":
+        if model == self.model:
+            return self
+        provider: RecordingProvider = RecordingProvider(self.inner.with_model(model), self.path)
+        provider._lock = self._lock
+        return provider
+
+    async def generate(self, prompt: str, schema: Optional[Type[BaseModel]] = None) -> str:
+        started: float = time.monotonic()
+        response: str = await self.inner.generate(prompt, schema)
+        self._record(prompt, response, time.monotonic() - started)
+        return response
+
+    async def create_cache(self, name: str, content: str, ttl: float) -> Optional[str]:
+        handle: Optional[str] = await self.inner.create_cache(name, content, ttl)
+        if handle:
+            self._cached_prefixes[handle] = content
+        return handle
+
+    async def generate_cached(self, handle: str, prompt: str, schema: Optional[Type[BaseModel]] = None) -> str:
+        # Recorded with the full prompt so the recording replays on either path
+        started: float = time.monotonic()
+        response: str = await self.inner.generate_cached(handle, prompt, schema)
+        self._record(self._cached_prefixes.get(handle, "") + prompt, response, time.monotonic() - started)
+        return response
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        started: float = time.monotonic()
+        first_chunk_latency: Optional[float] = None
+        parts: List[str] = []
+        async for chunk in self.inner.stream(prompt):
+            if first_chunk_latency is None:
+                first_chunk_latency = time.monotonic() - started
+            parts.append(chunk)
+            yield chunk
+        self._record(prompt, "".join(parts).strip(), first_chunk_latency or time.monotonic() - started)
+
+    def _record(self, prompt: str, response: str, latency: float) -> None:
+        line: str = json.dumps({"prompt": prompt, "response": response, "latency": round(latency, 4)}, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class ReplayProvider(LLMProvider):
+    """
+    Provider serving responses from a recording, without network access.
+
+    Prompts are matched after collapsing whitespace and masking ISO dates,
+    so recordings of date-relative prompts keep matching on later days.
+    When a prompt was recorded several times its responses are served in
+    turn. Latency is either the recorded one or latency plus uniform jitter.
+
+    Attributes:
+        latency: Synthetic seconds to wait before answering
+        jitter: Upper bound of extra random latency in seconds
+        use_recorded_latency: Whether to replay the recorded latency instead
+        chunk_interval: Seconds between streamed chunks
+        default: Response for unknown prompts; None raises KeyError instead
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        use_recorded_latency: bool = False,
+        chunk_interval: float = 0.0,
+        default: Optional[str] = None
+    ) -> None:
+        self.model: str = "replay"
+        self.latency: float = latency
+        self.jitter: float = jitter
+        self.use_recorded_latency: bool = use_recorded_latency
+        self.chunk_interval: float = chunk_interval
+        self.default: Optional[str] = default
+        self._entries: Dict[str, List[Dict[str, object]]] = defaultdict(list)
+        self._positions: Dict[str, int] = defaultdict(int)
+        self._lock: threading.Lock = threading.Lock()
+        self._caches: Dict[str, Tuple[str, float]] = {}
+        if path:
+            self.load(path)
+
+    @staticmethod
+    def key(prompt: str) -> str:
+        """
+        Normalize a prompt for matching against the recording.
+
+        Args:
+            prompt: Rendered prompt
+
+        Returns:
+            Prompt with collapsed whitespace and ISO dates masked
+        """
+        return _ISO_DATE.sub("<date>", " ".join(prompt.split()))
+
+    def load(self, path: str) -> None:
+        """
+        Load prompt/response pairs from a JSONL recording.
+
+        Args:
+            path: File written by RecordingProvider
+        """
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry: Dict[str, object] = json.loads(line)
+                    self.add(str(entry["prompt"]), str(entry["response"]), float(entry.get("latency", 0.0)))
+        logger.info(f"Loaded {len(self)} recorded prompts from {path}")
+
+    def add(self, prompt: str, response: str, latency: float = 0.0) -> None:
+        """
+        Add a prompt/response pair.
+
+        Args:
+            prompt: Rendered prompt
+            response: Response to serve for it
+            latency: Recorded latency in seconds
+        """
+        with self._lock:
+            self._entries[self.key(prompt)].append({"response": response, "latency": latency})
+
+    async def generate(self, prompt: str, schema: Optional[Type[BaseModel]] = None) -> str:
+        response, latency = self._next(prompt)
+        await asyncio.sleep(latency)
+        return response
+
+    async def create_cache(self, name: str, content: str, ttl: float) -> Optional[str]:
+        handle: str = f"cachedContents/{hashlib.sha1(content.encode('utf-8')).hexdigest()[:16]}"
+        with self._lock:
+            self._caches[handle] = (content, time.monotonic() + ttl)
+        return handle
+
+    async def generate_cached(self, handle: str, prompt: str, schema: Optional[Type[BaseModel]] = None) -> str:
+        with self._lock:
+            content, expires_at = self._caches.get(handle, ("", 0.0))
+        if time.monotonic() >= expires_at:
+            raise KeyError(f"Unknown or expired cached content: {handle}")
+        return await self.generate(content + prompt, schema)
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        response, latency = self._next(prompt)
+        await asyncio.sleep(latency)
+        for i, word in enumerate(re.findall(r"\S+\s*", response)):
+            if i and self.chunk_interval:
+                await asyncio.sleep(self.chunk_interval)
+            yield word
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _next(self, prompt: str) -> Tuple[str, float]:
+        key: str = self.key(prompt)
+        with self._lock:
+            entries: List[Dict[str, object]] = self._entries.get(key, [])
+            if entries:
+                entry: Dict[str, object] = entries[self._positions[key] % len(entries)]
+                self._positions[key] += 1
+                response, recorded = str(entry["response"]), float(entry["latency"])
+            elif self.default is not None:
+                response, recorded = self.default, 0.0
+            else:
+                raise KeyError(f"No recorded response for prompt: {prompt[:80]}")
+
+        if self.use_recorded_latency:
+            return response, recorded
+        return response, self.latency + random.uniform(0, self.jitter)
+
+
+def provider_from_env(api_key: Optional[str]) -> LLMProvider:
+    """
+    Build the provider selected by the LLM_PROVIDER environment variable.
+
+    gemini (default) calls the live API, record additionally appends every
+    exchange to LLM_RECORDING_PATH, and replay serves that file with
+    LLM_REPLAY_LATENCY seconds of synthetic latency.
+
+    Args:
+        api_key: Gemini API key, unused for replay
+
+    Returns:
+        Configured provider
+    """
+    kind: str = os.getenv("LLM_PROVIDER", "gemini").lower()
+    path: str = os.getenv("LLM_RECORDING_PATH", "llm_recording.jsonl")
+    if kind == "replay":
+        return ReplayProvider(path, latency=float(os.getenv("LLM_REPLAY_LATENCY", 0.0)))
+
+    provider: LLMProvider = GeminiProvider(api_key=api_key, model=os.getenv("GEMINI_MODEL", "gemini-2.0-flash"))
+    if kind == "record":
+        return RecordingProvider(provider, path)
+    return provider
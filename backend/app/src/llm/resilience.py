@@ -0,0 +1,348 @@
+"""
+Resilience policy module for LLM calls.
+
+This module contains the ResiliencePolicy class which wraps every Gemini
+call with per-attempt timeouts, jittered async backoff, a per-turn latency
+budget, a circuit breaker, optional hedged requests and optional admission
+through the process-wide LLM scheduler. Failures resolve
+to None so callers fall back to their local defaults.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Deque, Iterator, Optional, TypeVar
+
+from src.llm.scheduler import LLMScheduler
+from src.utils.logger import logger
+from src.utils.metrics import MetricsRegistry, metrics as default_metrics
+
+T = TypeVar("T")
+
+
+class TurnBudget:
+    """
+    Latency budget shared by all LLM calls made while handling one user turn.
+
+    Only time spent waiting on the LLM (including backoff) is charged, so
+    time the user spends answering follow-up questions does not count.
+
+    Attributes:
+        budget: Seconds of LLM time allowed for the turn
+        spent: Seconds already used
+    """
+
+    def __init__(self, budget: float) -> None:
+        self.budget: float = budget
+        self.spent: float = 0.0
+
+    def remaining(self) -> float:
+        return self.budget - self.spent
+
+
+_current_turn: ContextVar[Optional[TurnBudget]] = ContextVar("llm_turn_budget", default=None)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After failure_threshold consecutive failures the breaker opens and
+    rejects calls for reset_timeout seconds. It then lets a single trial
+    call through (half-open); success closes it, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold: int = failure_threshold
+        self.reset_timeout: float = reset_timeout
+        self._lock: threading.Lock = threading.Lock()
+        self._failures: int = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight: bool = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may be attempted.
+
+        Returns:
+            True if the breaker is closed or this call is the half-open trial
+        """
+        return self.admit() is not None
+
+    def admit(self) -> Optional[bool]:
+        """
+        Admit a call, taking the half-open trial if it is due.
+
+        Returns:
+            None if the call is rejected, True if it is the half-open trial, False otherwise
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return None
+            self._trial_in_flight = True
+            return True
+
+    def release_trial(self) -> None:
+        """
+        Give up the half-open trial without an outcome, e.g. when it was cancelled.
+
+        The breaker stays half-open and lets the next call through as the trial.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> bool:
+        """
+        Record a failed call.
+
+        Returns:
+            True if this failure opened the breaker
+        """
+        with self._lock:
+            self._failures += 1
+            was_trial: bool = self._trial_in_flight
+            self._trial_in_flight = False
+            if was_trial or (self._opened_at is None and self._failures >= self.failure_threshold):
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+
+class ResiliencePolicy:
+    """
+    Retry, deadline, circuit-breaking and hedging policy for LLM calls.
+
+    Attributes:
+        max_attempts: Attempts per call, including the first
+        base_delay: Backoff base in seconds; attempt n sleeps up to base_delay * 2**n
+        max_delay: Upper bound for a single backoff sleep
+        attempt_timeout: Timeout of a single attempt in seconds
+        turn_budget: Seconds of LLM time allowed per user turn
+        breaker: Circuit breaker shared by all calls
+        hedge: Whether to send a duplicate request for slow calls
+        hedge_quantile: Latency quantile after which the duplicate is sent
+        hedge_min_samples: Successful calls needed before hedging starts
+        scheduler: Admission control each attempt queues on, if any
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.25,
+        max_delay: float = 2.0,
+        attempt_timeout: float = 10.0,
+        turn_budget: float = 15.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        hedge: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 20,
+        metrics: Optional[MetricsRegistry] = None,
+        scheduler: Optional[LLMScheduler] = None
+    ) -> None:
+        self.max_attempts: int = max_attempts
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.attempt_timeout: float = attempt_timeout
+        self.turn_budget: float = turn_budget
+        self.breaker: CircuitBreaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.hedge: bool = hedge
+        self.hedge_quantile: float = hedge_quantile
+        self.hedge_min_samples: int = hedge_min_samples
+        self.metrics: MetricsRegistry = metrics or default_metrics
+        self.scheduler: Optional[LLMScheduler] = scheduler
+        self._latencies: Deque[float] = deque(maxlen=500)
+
+    @classmethod
+    def from_env(cls, scheduler: Optional[LLMScheduler] = None) -> "ResiliencePolicy":
+        """
+        Build a policy from LLM_* environment variables, using defaults for unset ones.
+
+        Args:
+            scheduler: Admission control shared with other policies, if any
+        """
+        return cls(
+            max_attempts=int(os.getenv("LLM_MAX_ATTEMPTS", 3)),
+            base_delay=float(os.getenv("LLM_BACKOFF_BASE", 0.25)),
+            max_delay=float(os.getenv("LLM_BACKOFF_MAX", 2.0)),
+            attempt_timeout=float(os.getenv("LLM_ATTEMPT_TIMEOUT", 10.0)),
+            turn_budget=float(os.getenv("LLM_TURN_BUDGET", 15.0)),
+            failure_threshold=int(os.getenv("LLM_BREAKER_THRESHOLD", 5)),
+            reset_timeout=float(os.getenv("LLM_BREAKER_RESET", 30.0)),
+            hedge=os.getenv("LLM_HEDGE", "false").lower() in ("1", "true", "yes"),
+            hedge_quantile=float(os.getenv("LLM_HEDGE_QUANTILE", 0.95)),
+            scheduler=scheduler,
+        )
+
+    @contextmanager
+    def turn(self) -> Iterator[TurnBudget]:
+        """
+        Start a new per-turn latency budget for LLM calls made inside the block.
+        """
+        budget: TurnBudget = TurnBudget(self.turn_budget)
+        token = _current_turn.set(budget)
+        try:
+            yield budget
+        finally:
+            _current_turn.reset(token)
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        Latency after which a hedged duplicate request is sent.
+
+        Returns:
+            Observed latency quantile, or None if hedging is off or not warmed up
+        """
+        if not self.hedge or len(self._latencies) < self.hedge_min_samples:
+            return None
+        samples = sorted(self._latencies)
+        return samples[int(self.hedge_quantile * (len(samples) - 1))]
+
+    async def execute(self, call: Callable[[], Awaitable[T]], template: str = "UNKNOWN") -> Optional[T]:
+        """
+        Run an LLM call under the policy.
+
+        Args:
+            call: Factory returning a new awaitable for each attempt
+            template: Template id, used as the metrics label
+
+        Returns:
+            The call's result, or None when attempts, budget or breaker run out
+        """
+        trial: Optional[bool] = self.breaker.admit()
+        if trial is None:
+            self.metrics.increment("llm_short_circuits", template=template)
+            logger.warning(f"Circuit open, skipping LLM call for {template}")
+            return None
+
+        # A trial that ends without a success or failure (cancelled, out of budget, not admitted)
+        # must be given back, or the breaker would stay half-open and reject every later call
+        settled: bool = False
+        try:
+            budget: Optional[TurnBudget] = _current_turn.get()
+            for attempt in range(self.max_attempts):
+                timeout: float = self.attempt_timeout
+                if budget is not None:
+                    if budget.remaining() <= 0:
+                        self.metrics.increment("llm_deadline_exceeded", template=template)
+                        logger.warning(f"Turn budget exhausted, skipping LLM call for {template}")
+                        return None
+
+                # Queueing is charged to the turn budget but never counts as a provider failure
+                if self.scheduler is not None and not await self._admit(budget, template):
+                    return None
+                if budget is not None:
+                    timeout = min(timeout, budget.remaining())
+
+                self.metrics.increment("llm_attempts", template=template)
+                started: float = time.monotonic()
+                try:
+                    result: T = await asyncio.wait_for(self._attempt(call, template), timeout)
+                    self._latencies.append(time.monotonic() - started)
+                    self.breaker.record_success()
+                    settled = True
+                    return result
+                except asyncio.TimeoutError:
+                    self.metrics.increment("llm_timeouts", template=template)
+                    logger.error(f"Gemini API call timed out after {timeout:.1f}s (attempt {attempt + 1})")
+                except Exception as e:
+                    self.metrics.increment("llm_failures", template=template)
+                    logger.error(f"Gemini API call failed (attempt {attempt + 1}): {e}")
+                finally:
+                    if self.scheduler is not None:
+                        self.scheduler.release()
+                    if budget is not None:
+                        budget.spent += time.monotonic() - started
+
+                settled = True
+                if self.breaker.record_failure():
+                    self.metrics.increment("llm_breaker_trips", template=template)
+                    logger.warning("Circuit breaker opened after repeated LLM failures")
+                    return None
+
+                if attempt + 1 < self.max_attempts:
+                    delay: float = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                    if budget is not None:
+                        delay = max(min(delay, budget.remaining()), 0)
+                        budget.spent += delay
+                    self.metrics.increment("llm_retries", template=template)
+                    await asyncio.sleep(delay)
+
+            logger.warning("Max retries reached.")
+            return None
+        finally:
+            if trial and not settled:
+                self.breaker.release_trial()
+
+    async def _admit(self, budget: Optional[TurnBudget], template: str) -> bool:
+        started: float = time.monotonic()
+        try:
+            await asyncio.wait_for(self.scheduler.acquire(), budget.remaining() if budget is not None else None)
+            return True
+        except asyncio.TimeoutError:
+            self.metrics.increment("llm_deadline_exceeded", template=template)
+            logger.warning(f"Turn budget exhausted while queued, skipping LLM call for {template}")
+            return False
+        finally:
+            if budget is not None:
+                budget.spent += time.monotonic() - started
+
+    async def _attempt(self, call: Callable[[], Awaitable[T]], template: str) -> T:
+        hedge_after: Optional[float] = self.hedge_delay()
+        if hedge_after is None:
+            return await call()
+
+        primary: asyncio.Future = asyncio.ensure_future(call())
+        hedged: Optional[asyncio.Future] = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+            if done:
+                return primary.result()
+
+            # The duplicate is a second request in flight and needs a slot of its own;
+            # when the scheduler has none free, the provider is busy enough without it
+            if self.scheduler is not None:
+                if not self.scheduler.try_acquire():
+                    self.metrics.increment("llm_hedges_skipped", template=template)
+                    return await primary
+            self.metrics.increment("llm_hedges", template=template)
+            hedged = asyncio.ensure_future(call())
+            if self.scheduler is not None:
+                hedged.add_done_callback(lambda _: self.scheduler.release())
+            pending = {primary, hedged}
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedged:
+                            self.metrics.increment("llm_hedge_wins", template=template)
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in (primary, hedged):
+                if task is not None and not task.done():
+                    task.cancel()
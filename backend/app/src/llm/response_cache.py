@@ -0,0 +1,223 @@
+"""
+LLM response cache module for reusing Gemini answers.
+
+This module contains the ResponseCache class, a two-tier cache with an
+in-memory LRU in front of an on-disk SQLite store. Entries expire after a
+TTL and both tiers are bounded in size.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from src.utils.logger import logger
+from src.utils.metrics import MetricsRegistry, metrics as default_metrics
+
+
+class ResponseCache:
+    """
+    Two-tier cache of raw LLM responses.
+
+    Keys are derived from the template id, the wording of the prompt and
+    the model it goes to, the normalized user input and, for date-relative
+    templates, today's date, so that answers like "tomorrow" are never
+    served on the wrong day and a prompt or model change starts afresh.
+
+    Attributes:
+        path: SQLite database file, or None to keep the cache in memory only
+        ttl: Seconds an entry stays valid
+        max_memory_entries: Capacity of the in-memory LRU
+        max_disk_entries: Capacity of the SQLite store
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: float = 24 * 60 * 60,
+        max_memory_entries: int = 1024,
+        max_disk_entries: int = 100_000,
+        metrics: Optional[MetricsRegistry] = None
+    ) -> None:
+        self.path: Optional[str] = path
+        self.ttl: float = ttl
+        self.max_memory_entries: int = max_memory_entries
+        self.max_disk_entries: int = max_disk_entries
+        self.metrics: MetricsRegistry = metrics or default_metrics
+
+        self._lock: threading.Lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._writes_since_prune: int = 0
+        self._db: Optional[sqlite3.Connection] = None
+
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " template TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+            self._db.commit()
+
+    @staticmethod
+    def normalize(text: str, keep_case: bool = False) -> str:
+        """
+        Normalize user input so trivially different phrasings share a key.
+
+        Args:
+            text: Raw user input
+            keep_case: Keep the casing, for answers that quote the input
+
+        Returns:
+            Input with collapsed whitespace and no trailing punctuation, lower-cased unless keep_case
+        """
+        return " ".join((text if keep_case else text.lower()).split()).rstrip(".!?")
+
+    @classmethod
+    def make_key(
+        cls,
+        template: str,
+        user_input: str,
+        today: Optional[str] = None,
+        version: str = "",
+        keep_case: bool = False
+    ) -> str:
+        """
+        Build a cache key.
+
+        Args:
+            template: Template id
+            user_input: User input the prompt was rendered with
+            today: ISO date for date-relative templates
+            version: Fingerprint of the prompt wording and model
+            keep_case: Keep the casing of the input, for answers that quote it
+
+        Returns:
+            Hex digest identifying the request
+        """
+        raw: str = "\x1f".join((template, version, cls.normalize(user_input, keep_case), today or ""))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, template: str, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            template: Template id, used for metrics
+            key: Key from make_key
+
+        Returns:
+            Cached response text, or None on a miss
+        """
+        now: float = time.time()
+        with self._lock:
+            entry: Optional[Tuple[str, float]] = self._memory.get(key)
+            if entry and entry[1] > now:
+                self._memory.move_to_end(key)
+                self.metrics.increment("llm_cache_hits", template=template, tier="memory")
+                return entry[0]
+            if entry:
+                del self._memory[key]
+
+            stored: Optional[Tuple[str, float]] = self._disk_get(key, now)
+            if stored is not None:
+                value, expires_at = stored
+                # The entry keeps the expiry it was stored with
+                self._memory_put(key, value, expires_at)
+                self.metrics.increment("llm_cache_hits", template=template, tier="disk")
+                return value
+
+        self.metrics.increment("llm_cache_misses", template=template)
+        return None
+
+    def set(self, template: str, key: str, value: str) -> None:
+        """
+        Store a response in both tiers.
+
+        Args:
+            template: Template id
+            key: Key from make_key
+            value: Response text
+        """
+        now: float = time.time()
+        expires_at: float = now + self.ttl
+        with self._lock:
+            self._memory_put(key, value, expires_at)
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, template, value, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, template, value, expires_at, now)
+                )
+                self._writes_since_prune += 1
+                if self._writes_since_prune >= 100:
+                    self._prune(now)
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to persist LLM response: {e}")
+
+    def hit_rate(self, template: str) -> float:
+        """
+        Fraction of lookups for a template that were answered from the cache.
+
+        Args:
+            template: Template id
+
+        Returns:
+            Hit rate between 0 and 1
+        """
+        hits: float = (self.metrics.get("llm_cache_hits", template=template, tier="memory")
+                       + self.metrics.get("llm_cache_hits", template=template, tier="disk"))
+        total: float = hits + self.metrics.get("llm_cache_misses", template=template)
+        return hits / total if total else 0.0
+
+    def close(self) -> None:
+        """
+        Close the SQLite connection.
+        """
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _memory_put(self, key: str, value: str, expires_at: float) -> None:
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if not row:
+                return None
+            if row[1] <= now:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            return row[0], row[1]
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read cached LLM response: {e}")
+            return None
+
+    def _prune(self, now: float) -> None:
+        self._writes_since_prune = 0
+        self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        self._db.execute(
+            "DELETE FROM responses WHERE key IN ("
+            " SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,)
+        )
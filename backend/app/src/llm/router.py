@@ -0,0 +1,127 @@
+"""
+Model routing module for the TaskGPT application.
+
+This module contains the ModelRouter class which picks the model each
+prompt template is sent to, so cheap calls such as menu classification
+can use a smaller, faster model while extractions keep the default one,
+and records per-route latency and escalations to the default model.
+"""
+
+import os
+from typing import Dict, Optional, Tuple
+
+from src.llm.providers import LLMProvider
+from src.utils.metrics import MetricsRegistry, metrics as default_metrics
+
+# Smaller model used by the default routes
+FAST_MODEL: str = "gemini-2.0-flash-lite"
+
+# Templates whose answers are short enough for the fast model
+DEFAULT_FAST_ROUTES: Tuple[str, ...] = ("INTERPRET_COMMAND", "INTERPRET_COMMAND_BATCH", "CONFIRMATION")
+
+
+class ModelRouter:
+    """
+    Per-template model selection with escalation to the default model.
+
+    Attributes:
+        default: Provider of the default model, used for unrouted templates and escalations
+        routes: Mapping of template name to model name
+    """
+
+    def __init__(
+        self,
+        default: LLMProvider,
+        routes: Optional[Dict[str, str]] = None,
+        metrics: Optional[MetricsRegistry] = None
+    ) -> None:
+        self.default: LLMProvider = default
+        self.routes: Dict[str, str] = dict(routes or {})
+        self.metrics: MetricsRegistry = metrics or default_metrics
+        self._providers: Dict[str, LLMProvider] = {default.model: default}
+
+    @classmethod
+    def from_env(cls, default: LLMProvider, metrics: Optional[MetricsRegistry] = None) -> "ModelRouter":
+        """
+        Build a router from LLM_ROUTES, e.g. "INTERPRET_COMMAND=gemini-2.0-flash-lite,CONFIRMATION=gemini-2.0-flash-lite".
+
+        Without LLM_ROUTES the classification and confirmation templates go
+        to LLM_FAST_MODEL; an empty LLM_ROUTES sends everything to the default model.
+        """
+        spec: Optional[str] = os.getenv("LLM_ROUTES")
+        if spec is None:
+            fast: str = os.getenv("LLM_FAST_MODEL", FAST_MODEL)
+            return cls(default, {template: fast for template in DEFAULT_FAST_ROUTES}, metrics)
+
+        routes: Dict[str, str] = {}
+        for entry in filter(None, (part.strip() for part in spec.split(","))):
+            template, _, model = entry.partition("=")
+            if model.strip():
+                routes[template.strip()] = model.strip()
+        return cls(default, routes, metrics)
+
+    def select(self, template: str) -> LLMProvider:
+        """
+        Get the provider of the model a template is routed to.
+
+        Args:
+            template: Template name
+
+        Returns:
+            Provider of the routed model, or the default provider
+        """
+        model: str = self.routes.get(template, self.default.model)
+        provider: Optional[LLMProvider] = self._providers.get(model)
+        if provider is None:
+            provider = self._providers.setdefault(model, self.default.with_model(model))
+        return provider
+
+    def can_escalate(self, provider: LLMProvider) -> bool:
+        """
+        Check whether answers of a provider may be retried on the default model.
+
+        Args:
+            provider: Provider returned by select
+
+        Returns:
+            True if the provider is not the default one
+        """
+        return provider is not self.default
+
+    def record(self, template: str, provider: LLMProvider, latency: float) -> None:
+        """
+        Record one call made on a route.
+
+        Args:
+            template: Template name
+            provider: Provider the call was sent to
+            latency: Seconds the call took, including retries
+        """
+        self.metrics.increment("llm_route_calls", template=template, model=provider.model)
+        self.metrics.observe("llm_route_latency_seconds", latency, template=template, model=provider.model)
+
+    def record_escalation(self, template: str, provider: LLMProvider) -> None:
+        """
+        Record that an answer of a routed model was retried on the default model.
+
+        Args:
+            template: Template name
+            provider: Provider whose answer was rejected
+        """
+        self.metrics.increment("llm_escalations", template=template, model=provider.model)
+
+    def escalation_rate(self, template: str) -> float:
+        """
+        Share of a template's routed calls that had to be escalated.
+
+        Args:
+            template: Template name
+
+        Returns:
+            Escalations divided by calls on the routed model, 0 if unrouted or unused
+        """
+        model: Optional[str] = self.routes.get(template)
+        if not model:
+            return 0.0
+        calls: float = self.metrics.get("llm_route_calls", template=template, model=model)
+        return self.metrics.get("llm_escalations", template=template, model=model) / calls if calls else 0.0
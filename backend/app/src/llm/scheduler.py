@@ -0,0 +1,283 @@
+"""
+LLM scheduler module for the TaskGPT application.
+
+This module contains the LLMScheduler class which is shared by every chat
+session of the process and admits LLM requests under a global limit on
+in-flight requests and requests per minute. Waiting requests are queued
+per session and served round-robin, interactive turn calls ahead of
+speculative and background ones.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import AsyncIterator, Deque, Dict, Iterator, Optional
+
+from src.utils.logger import logger
+from src.utils.metrics import MetricsRegistry, metrics as default_metrics
+
+# Window the requests-per-minute limit is enforced over, in seconds
+RATE_WINDOW: float = 60.0
+
+
+class Priority(IntEnum):
+    """
+    Scheduling classes of LLM requests, served lowest value first.
+    """
+    INTERACTIVE = 0
+    SPECULATIVE = 1
+    BACKGROUND = 2
+
+
+_current_session: ContextVar[str] = ContextVar("llm_session", default="default")
+_current_priority: ContextVar[Priority] = ContextVar("llm_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def scheduling(session: Optional[str] = None, priority: Optional[Priority] = None) -> Iterator[None]:
+    """
+    Tag LLM requests made inside the block with a session and a priority.
+
+    Tasks created inside the block keep the tags after it exits.
+
+    Args:
+        session: Session the requests are queued under, unchanged if None
+        priority: Scheduling class of the requests, unchanged if None
+    """
+    session_token = _current_session.set(session) if session is not None else None
+    priority_token = _current_priority.set(priority) if priority is not None else None
+    try:
+        yield
+    finally:
+        if priority_token is not None:
+            _current_priority.reset(priority_token)
+        if session_token is not None:
+            _current_session.reset(session_token)
+
+
+class _Waiter:
+    __slots__ = ("loop", "future", "session", "priority", "granted")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, session: str, priority: Priority) -> None:
+        self.loop: asyncio.AbstractEventLoop = loop
+        self.future: asyncio.Future = loop.create_future()
+        self.session: str = session
+        self.priority: Priority = priority
+        self.granted: bool = False
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class LLMScheduler:
+    """
+    Process-wide admission control for LLM requests.
+
+    Sessions run on their own threads and event loops, so the scheduler
+    state is guarded by a lock and waiters are woken on their own loop.
+
+    Attributes:
+        max_in_flight: Maximum number of concurrent requests
+        requests_per_minute: Maximum number of requests started per minute, 0 for no limit
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 8,
+        requests_per_minute: int = 0,
+        metrics: Optional[MetricsRegistry] = None
+    ) -> None:
+        self.max_in_flight: int = max_in_flight
+        self.requests_per_minute: int = requests_per_minute
+        self.metrics: MetricsRegistry = metrics or default_metrics
+        self._lock: threading.Lock = threading.Lock()
+        self._in_flight: int = 0
+        self._started: Deque[float] = deque()
+        self._queues: Dict[Priority, "OrderedDict[str, Deque[_Waiter]]"] = {priority: OrderedDict() for priority in Priority}
+        self._timer: Optional[threading.Timer] = None
+
+    @classmethod
+    def from_env(cls, metrics: Optional[MetricsRegistry] = None) -> "LLMScheduler":
+        """
+        Build a scheduler from LLM_* environment variables, using defaults for unset ones.
+        """
+        return cls(
+            max_in_flight=int(os.getenv("LLM_MAX_IN_FLIGHT", 8)),
+            # Well under the 2000 RPM Gemini 2.0 Flash allows on the first paid tier
+            requests_per_minute=int(os.getenv("LLM_REQUESTS_PER_MINUTE", 1000)),
+            metrics=metrics
+        )
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return self._in_flight
+
+    def queue_depth(self, priority: Optional[Priority] = None) -> int:
+        """
+        Count the queued requests.
+
+        Args:
+            priority: Only count this scheduling class, all classes if None
+
+        Returns:
+            Number of requests waiting for a slot
+        """
+        with self._lock:
+            return self._depth(priority)
+
+    async def acquire(self) -> None:
+        """
+        Wait for a request slot, queued under the current session and priority.
+
+        Every successful acquire must be paired with a release.
+        """
+        session: str = _current_session.get()
+        priority: Priority = _current_priority.get()
+        started: float = time.monotonic()
+        with self._lock:
+            if not self._depth() and self._available(started):
+                self._grant(started)
+                self._update_gauges()
+                waiter: Optional[_Waiter] = None
+            else:
+                waiter = _Waiter(asyncio.get_running_loop(), session, priority)
+                self._queues[priority].setdefault(session, deque()).append(waiter)
+                self._dispatch()
+                self._update_gauges()
+
+        if waiter is not None:
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                with self._lock:
+                    granted: bool = waiter.granted
+                    if not granted:
+                        self._remove(waiter)
+                        self._update_gauges()
+                if granted:
+                    self.release()
+                raise
+
+        self.metrics.observe("llm_queue_wait_seconds", time.monotonic() - started, priority=priority.name.lower())
+
+    def try_acquire(self) -> bool:
+        """
+        Take a request slot only if one is free and nobody is queued for it.
+
+        Returns:
+            True if a slot was taken; it must be paired with a release
+        """
+        now: float = time.monotonic()
+        with self._lock:
+            if self._depth() or not self._available(now):
+                return False
+            self._grant(now)
+            self._update_gauges()
+            return True
+
+    def release(self) -> None:
+        """
+        Free a request slot and hand it to the next queued request.
+        """
+        with self._lock:
+            self._in_flight -= 1
+            self._dispatch()
+            self._update_gauges()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Hold a request slot for the duration of the block.
+        """
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _depth(self, priority: Optional[Priority] = None) -> int:
+        priorities = Priority if priority is None else (priority,)
+        return sum(len(waiters) for p in priorities for waiters in self._queues[p].values())
+
+    def _available(self, now: float) -> bool:
+        if self._in_flight >= self.max_in_flight:
+            return False
+        if not self.requests_per_minute:
+            return True
+        while self._started and now - self._started[0] >= RATE_WINDOW:
+            self._started.popleft()
+        return len(self._started) < self.requests_per_minute
+
+    def _grant(self, now: float) -> None:
+        self._in_flight += 1
+        if self.requests_per_minute:
+            self._started.append(now)
+
+    def _dispatch(self) -> None:
+        while self._depth():
+            now: float = time.monotonic()
+            if not self._available(now):
+                if self._in_flight < self.max_in_flight:
+                    self._wait_for_rate(now)
+                return
+
+            waiter: _Waiter = self._next()
+            waiter.granted = True
+            self._grant(now)
+            try:
+                waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+            except RuntimeError:
+                # The session's loop is already closed; give the slot to someone else
+                waiter.granted = False
+                self._in_flight -= 1
+                if self.requests_per_minute:
+                    self._started.pop()
+
+    def _next(self) -> _Waiter:
+        for priority in Priority:
+            queue: "OrderedDict[str, Deque[_Waiter]]" = self._queues[priority]
+            if queue:
+                # Serve the session at the head, then move it to the back of the round
+                session, waiters = next(iter(queue.items()))
+                waiter: _Waiter = waiters.popleft()
+                if waiters:
+                    queue.move_to_end(session)
+                else:
+                    del queue[session]
+                return waiter
+        raise LookupError("No queued LLM request")
+
+    def _remove(self, waiter: _Waiter) -> None:
+        waiters: Optional[Deque[_Waiter]] = self._queues[waiter.priority].get(waiter.session)
+        if waiters and waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del self._queues[waiter.priority][waiter.session]
+
+    def _wait_for_rate(self, now: float) -> None:
+        if self._timer is not None:
+            return
+        self.metrics.increment("llm_rate_limited")
+        logger.debug("LLM requests per minute reached, delaying queued requests")
+        self._timer = threading.Timer(max(self._started[0] + RATE_WINDOW - now, 0.0), self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+            self._dispatch()
+            self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        self.metrics.set_gauge("llm_in_flight", self._in_flight)
+        for priority in Priority:
+            self.metrics.set_gauge("llm_queue_depth", self._depth(priority), priority=priority.name.lower())
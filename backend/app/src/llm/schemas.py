@@ -0,0 +1,84 @@
+"""
+Structured result schemas for the LLM extractors.
+
+This module contains one Pydantic model per extraction prompt. The models
+are sent to Gemini as response schemas so the model can only answer with
+matching JSON, and are used to validate the answers it returns.
+"""
+
+from typing import Annotated, Literal, Optional
+
+from pydantic import BaseModel, BeforeValidator, Field
+
+
+def _none_string(value: object) -> object:
+    # The prompts predate structured output and still mention "None" for missing values
+    if isinstance(value, str) and value.strip().lower() in ("", "none", "null"):
+        return None
+    return value
+
+
+NullableStr = Annotated[Optional[str], BeforeValidator(_none_string)]
+NullableInt = Annotated[Optional[int], BeforeValidator(_none_string)]
+
+
+class ViewTaskResult(BaseModel):
+    """
+    Which tasks the user wants to see.
+
+    Attributes:
+        status: Whether the request names a specific kind of tasks
+        choice: View option number, null when ambiguous
+    """
+    status: Literal["specific", "ambiguous"]
+    choice: Optional[Literal["1", "2", "3", "4", "5", "6"]] = None
+
+
+class TaskData(BaseModel):
+    """
+    A new task described by the user.
+
+    Attributes:
+        name: Task title
+        date: Due date as YYYY-MM-DD
+    """
+    name: NullableStr = Field(None, description="Task title, null if the user gave none")
+    date: NullableStr = Field(None, description="Due date as YYYY-MM-DD, null if no date is mentioned")
+
+
+class EditTaskData(BaseModel):
+    """
+    Changes the user wants to make to a task.
+
+    Attributes:
+        title: New task title
+        due_date: New due date as YYYY-MM-DD
+    """
+    title: NullableStr = Field(None, description="New title, null if it stays the same")
+    due_date: NullableStr = Field(None, description="New due date as YYYY-MM-DD, null if it stays the same")
+
+
+class TaskReference(BaseModel):
+    """
+    The task a command refers to.
+
+    Attributes:
+        task_id: Task ID
+        task_title: Task title
+    """
+    task_id: NullableInt = Field(None, description="Task ID, null if the user gave none")
+    task_title: NullableStr = Field(None, description="Task title, null if the user gave none")
+
+
+class DateFilter(BaseModel):
+    """
+    Due date or date range to filter tasks by.
+
+    Attributes:
+        date: Single due date as YYYY-MM-DD
+        start: First day of the range as YYYY-MM-DD
+        end: Last day of the range as YYYY-MM-DD
+    """
+    date: NullableStr = Field(None, description="Specific due date as YYYY-MM-DD, null for a range")
+    start: NullableStr = Field(None, description="Range start as YYYY-MM-DD, null for a specific date")
+    end: NullableStr = Field(None, description="Range end as YYYY-MM-DD, null for a specific date")
@@ -0,0 +1,147 @@
+"""
+Semantic cache module for reusing interpretations of similar utterances.
+
+This module contains the SemanticCache class which stores utterance
+embeddings in a contiguous NumPy matrix together with the parsed
+interpretation, and answers new utterances from the nearest cached
+neighbour when it is similar enough.
+"""
+
+import copy
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.utils.logger import logger
+from src.utils.metrics import MetricsRegistry, metrics as default_metrics
+from src.vector_store.text_embedder import TextEmbedder
+
+
+class SemanticCache:
+    """
+    Bounded nearest-neighbour cache of interpretation results.
+
+    Vectors are L2-normalized so the similarity of a query to every cached
+    utterance is one matrix-vector product. Entries live in namespaces
+    (template id plus any other prompt inputs such as the menu options or
+    today's date) and only match within their own namespace. When the
+    matrix is full the least recently used row is overwritten, and a
+    namespace whose last row goes, such as a past day's, is forgotten.
+
+    Attributes:
+        embedder: Embedder used to vectorize utterances
+        capacity: Maximum number of cached utterances
+        threshold: Minimum cosine similarity for a hit
+    """
+
+    def __init__(
+        self,
+        embedder: TextEmbedder,
+        capacity: int = 2048,
+        threshold: float = 0.92,
+        metrics: Optional[MetricsRegistry] = None
+    ) -> None:
+        self.embedder: TextEmbedder = embedder
+        self.capacity: int = capacity
+        self.threshold: float = threshold
+        self.metrics: MetricsRegistry = metrics or default_metrics
+
+        self._lock: threading.Lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None
+        self._namespaces: np.ndarray = np.full(capacity, -1, dtype=np.int32)
+        self._last_used: np.ndarray = np.zeros(capacity, dtype=np.int64)
+        self._results: List[Any] = [None] * capacity
+        self._namespace_ids: Dict[str, int] = {}
+        self._next_namespace_id: int = 0
+        self._size: int = 0
+        self._clock: int = 0
+
+    @property
+    def ready(self) -> bool:
+        """
+        Whether the embedding model is loaded, so embed does not block on it.
+        """
+        return self.embedder.ready
+
+    def embed(self, text: str) -> np.ndarray:
+        """
+        Embed and normalize an utterance.
+
+        Args:
+            text: Utterance to embed
+
+        Returns:
+            Unit-length float32 vector
+        """
+        vector: np.ndarray = np.asarray(self.embedder.embed(text), dtype=np.float32)
+        norm: float = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def lookup(self, namespace: str, vector: np.ndarray, threshold: Optional[float] = None) -> Optional[Any]:
+        """
+        Find the cached result of the most similar utterance.
+
+        Args:
+            namespace: Namespace the result must belong to
+            vector: Normalized query vector from embed
+            threshold: Override of the default similarity threshold
+
+        Returns:
+            Copy of the cached result, or None if no neighbour is close enough
+        """
+        threshold = self.threshold if threshold is None else threshold
+        with self._lock:
+            namespace_id: Optional[int] = self._namespace_ids.get(namespace)
+            if namespace_id is None or self._size == 0:
+                self.metrics.increment("semantic_cache_misses", namespace=namespace.split(":", 1)[0])
+                return None
+
+            scores: np.ndarray = self._vectors[:self._size] @ vector
+            scores[self._namespaces[:self._size] != namespace_id] = -np.inf
+            best: int = int(np.argmax(scores))
+            if scores[best] < threshold:
+                self.metrics.increment("semantic_cache_misses", namespace=namespace.split(":", 1)[0])
+                return None
+
+            self._clock += 1
+            self._last_used[best] = self._clock
+            self.metrics.increment("semantic_cache_hits", namespace=namespace.split(":", 1)[0])
+            logger.debug(f"Semantic cache hit in {namespace} (score={scores[best]:.3f})")
+            return copy.deepcopy(self._results[best])
+
+    def store(self, namespace: str, vector: np.ndarray, result: Any) -> None:
+        """
+        Cache a result, evicting the least recently used entry when full.
+
+        Args:
+            namespace: Namespace of the result
+            vector: Normalized utterance vector from embed
+            result: Parsed interpretation to cache
+        """
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.capacity, vector.shape[0]), dtype=np.float32)
+
+            if self._size < self.capacity:
+                row: int = self._size
+                self._size += 1
+            else:
+                row = int(np.argmin(self._last_used))
+
+            namespace_id: Optional[int] = self._namespace_ids.get(namespace)
+            if namespace_id is None:
+                namespace_id = self._namespace_ids[namespace] = self._next_namespace_id
+                self._next_namespace_id += 1
+            evicted: int = int(self._namespaces[row])
+            self._clock += 1
+            self._vectors[row] = vector
+            self._namespaces[row] = namespace_id
+            if evicted >= 0 and evicted != namespace_id and not (self._namespaces[:self._size] == evicted).any():
+                self._namespace_ids = {name: i for name, i in self._namespace_ids.items() if i != evicted}
+            self._last_used[row] = self._clock
+            self._results[row] = copy.deepcopy(result)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._size
@@ -0,0 +1,134 @@
+"""
+Single-flight module for concurrent identical LLM prompts.
+
+This module contains the SingleFlight class which lets concurrent callers
+sending the same rendered prompt share one in-flight LLM request and its
+result, across all chat sessions of the process.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from src.utils.metrics import MetricsRegistry, metrics as default_metrics
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Registry of in-flight calls keyed by their rendered prompt.
+
+    Sessions run on their own event loops, so results are shared through
+    thread-safe futures. A follower whose leader was cancelled, for example
+    a discarded speculative extraction, makes the call itself.
+
+    Attributes:
+        metrics: Registry the deduplication counters are recorded in
+    """
+
+    def __init__(self, metrics: Optional[MetricsRegistry] = None) -> None:
+        self.metrics: MetricsRegistry = metrics or default_metrics
+        self._lock: threading.Lock = threading.Lock()
+        self._calls: Dict[str, concurrent.futures.Future] = {}
+
+    async def do(self, key: str, call: Callable[[], Awaitable[T]], template: str = "UNKNOWN") -> T:
+        """
+        Run the call, or wait for the identical call already in flight.
+
+        Args:
+            key: Rendered prompt identifying the call
+            call: Coroutine function making the call
+            template: Template id, used as the metrics label
+
+        Returns:
+            The result of whichever call ran
+        """
+        leader, shared = self.claim(key)
+        if not leader:
+            self.metrics.increment("llm_deduplicated", template=template)
+            try:
+                return await self.wait(shared)
+            except asyncio.CancelledError:
+                if not shared.cancelled():
+                    raise
+                return await call()
+
+        try:
+            result: T = await call()
+        except BaseException as e:
+            self.resolve(key, shared, error=e)
+            raise
+        self.resolve(key, shared, result)
+        return result
+
+    def claim(self, key: str) -> Tuple[bool, concurrent.futures.Future]:
+        """
+        Become the leader for a key, or get the leader's shared future.
+
+        A leader must call resolve once its call has finished.
+
+        Args:
+            key: Rendered prompt identifying the call
+
+        Returns:
+            Tuple of (whether the caller leads, future holding the result)
+        """
+        with self._lock:
+            shared: Optional[concurrent.futures.Future] = self._calls.get(key)
+            if shared is not None:
+                return False, shared
+            shared = concurrent.futures.Future()
+            self._calls[key] = shared
+            return True, shared
+
+    def resolve(
+        self,
+        key: str,
+        shared: concurrent.futures.Future,
+        result: Any = None,
+        error: Optional[BaseException] = None
+    ) -> None:
+        """
+        Publish the leader's outcome and let the next call of the key lead.
+
+        Args:
+            key: Rendered prompt identifying the call
+            shared: Future returned by claim
+            result: Result of the call
+            error: Exception the call raised; cancellation cancels the future
+        """
+        with self._lock:
+            if self._calls.get(key) is shared:
+                del self._calls[key]
+        if shared.done():
+            return
+        if isinstance(error, asyncio.CancelledError):
+            shared.cancel()
+        elif error is not None:
+            shared.set_exception(error)
+        else:
+            shared.set_result(result)
+
+    @staticmethod
+    async def wait(shared: concurrent.futures.Future) -> Any:
+        """
+        Wait for a leader's result on the current event loop.
+
+        Cancelling the waiter does not cancel the leader.
+
+        Args:
+            shared: Future returned by claim
+
+        Returns:
+            The leader's result
+
+        Raises:
+            asyncio.CancelledError: If the leader or the waiter was cancelled
+        """
+        return await asyncio.shield(asyncio.wrap_future(shared))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._calls)
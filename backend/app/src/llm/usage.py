@@ -0,0 +1,172 @@
+"""
+LLM usage reporting module for the TaskGPT application.
+
+This module turns the per-template LLM metrics recorded by
+AICommandInterpreter into a summary table and logs it periodically,
+showing which prompts dominate turn latency and token spend.
+"""
+
+import math
+import threading
+from typing import Dict, List, Optional
+
+from src.utils.logger import logger
+from src.utils.metrics import Histogram, LabelSet, MetricsRegistry, metrics as default_metrics
+
+# Rough characters-per-token ratio of Gemini models on English text
+CHARS_PER_TOKEN: float = 4.0
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text without calling the tokenizer.
+
+    Args:
+        text: Prompt or response text
+
+    Returns:
+        Approximate token count
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _template_values(snapshot: Dict[str, Dict[LabelSet, float]], name: str) -> Dict[str, float]:
+    values: Dict[str, float] = {}
+    for labels, value in snapshot.get(name, {}).items():
+        template: Optional[str] = dict(labels).get("template")
+        if template:
+            values[template] = values.get(template, 0) + value
+    return values
+
+
+def summarize(metrics: Optional[MetricsRegistry] = None) -> List[Dict[str, float]]:
+    """
+    Aggregate the LLM metrics per prompt template.
+
+    Args:
+        metrics: Registry to read, defaults to the process-wide one
+
+    Returns:
+        One row per template, sorted by total latency, most expensive first
+    """
+    metrics = metrics or default_metrics
+    snapshot: Dict[str, Dict[LabelSet, float]] = metrics.snapshot()
+    latencies: Dict[LabelSet, Histogram] = metrics.histograms().get("llm_latency_seconds", {})
+
+    columns: Dict[str, Dict[str, float]] = {
+        column: _template_values(snapshot, name) for column, name in (
+            ("calls", "llm_calls"),
+            ("prompt_tokens", "llm_prompt_tokens"),
+            ("response_tokens", "llm_response_tokens"),
+            ("retries", "llm_retries"),
+            ("failures", "llm_failed_calls"),
+            ("parse_failures", "llm_parse_failures"),
+            ("cache_hits", "llm_cache_hits"),
+            ("escalations", "llm_escalations"),
+        )
+    }
+    templates = set().union(*columns.values(), (dict(labels).get("template") for labels in latencies))
+    templates.discard(None)
+
+    rows: List[Dict[str, float]] = []
+    for template in templates:
+        histogram: Optional[Histogram] = latencies.get((("template", template),))
+        row: Dict[str, float] = {"template": template}
+        row.update({column: values.get(template, 0) for column, values in columns.items()})
+        row["latency_total"] = histogram.sum if histogram else 0.0
+        row["latency_mean"] = histogram.mean if histogram else 0.0
+        row["latency_p95"] = histogram.quantile(0.95) if histogram else 0.0
+        rows.append(row)
+    return sorted(rows, key=lambda row: row["latency_total"], reverse=True)
+
+
+def reprompts(metrics: Optional[MetricsRegistry] = None) -> Dict[str, float]:
+    """
+    Count the times users were asked again because an extraction came back empty.
+
+    Args:
+        metrics: Registry to read, defaults to the process-wide one
+
+    Returns:
+        Mapping of "request.field" to number of re-prompts
+    """
+    snapshot: Dict[str, Dict[LabelSet, float]] = (metrics or default_metrics).snapshot()
+    counts: Dict[str, float] = {}
+    for labels, value in snapshot.get("llm_reprompts", {}).items():
+        label: Dict[str, str] = dict(labels)
+        counts[f"{label.get('request')}.{label.get('field')}"] = value
+    return counts
+
+
+def format_summary(rows: List[Dict[str, float]]) -> str:
+    """
+    Render summarize() rows as a fixed-width table.
+
+    Args:
+        rows: Rows returned by summarize
+
+    Returns:
+        Table text, one line per template
+    """
+    lines: List[str] = [
+        f"{'template':<28} {'calls':>6} {'hits':>6} {'p_tok':>8} {'r_tok':>8} "
+        f"{'mean_s':>7} {'p95_s':>6} {'total_s':>8} {'retry':>6} {'fail':>5} {'parse':>6} {'esc':>5}"
+    ]
+    for row in rows:
+        lines.append(
+            f"{row['template']:<28} {row['calls']:>6.0f} {row['cache_hits']:>6.0f} "
+            f"{row['prompt_tokens']:>8.0f} {row['response_tokens']:>8.0f} "
+            f"{row['latency_mean']:>7.2f} {row['latency_p95']:>6.2f} {row['latency_total']:>8.1f} "
+            f"{row['retries']:>6.0f} {row['failures']:>5.0f} {row['parse_failures']:>6.0f} {row['escalations']:>5.0f}"
+        )
+    return "\n".join(lines)
+
+
+class UsageReporter:
+    """
+    Background thread logging the LLM usage summary at a fixed interval.
+
+    Attributes:
+        interval: Seconds between summaries
+        metrics: Registry to summarize
+    """
+
+    def __init__(self, interval: float = 300.0, metrics: Optional[MetricsRegistry] = None) -> None:
+        self.interval: float = interval
+        self.metrics: MetricsRegistry = metrics or default_metrics
+        self._stop: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Start logging summaries in the background.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="llm-usage-reporter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background thread.
+        """
+        self._stop.set()
+
+    def report(self) -> None:
+        """
+        Log the current summary, if any LLM call was recorded.
+        """
+        rows: List[Dict[str, float]] = summarize(self.metrics)
+        if rows:
+            logger.info("LLM usage by template:\n" + format_summary(rows))
+        counts: Dict[str, float] = reprompts(self.metrics)
+        if counts:
+            logger.info("Re-prompts after empty extractions: " + ", ".join(f"{k}={v:.0f}" for k, v in sorted(counts.items())))
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.report()
+            except Exception as e:
+                logger.error(f"Failed to report LLM usage: {e}")
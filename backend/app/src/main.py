@@ -27,14 +27,14 @@ if __name__ == "__main__":
     qdrant_host: str = os.getenv("QDRANT_HOST", "localhost")
     genai_key: Optional[str] = os.getenv("GEMINI_API_KEY")
 
-    if not genai_key:
+    if not genai_key and os.getenv("LLM_PROVIDER", "gemini").lower() != "replay":
         logger.error("ERROR: GEMINI_API_KEY not found! Please set it in your .env file.")
         exit(1)
 
     app_service: AppService = AppService(api_base_url, qdrant_host, genai_key)
 
     if args.socket:
-        server: SocketIOServer = SocketIOServer(handler=app_service.handle)
+        server: SocketIOServer = SocketIOServer(handler=app_service.handle, on_session_end=app_service.close_session)
         server.run()
     else:
         communicator: CLICommunicator = CLICommunicator()
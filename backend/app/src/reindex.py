@@ -0,0 +1,292 @@
+"""
+Reindex entry point for the TaskGPT vector store.
+
+This module rebuilds the task vectors from the task API: it streams every
+task page by page, embeds the titles in batches on a worker pool and bulk
+upserts them into a fresh Qdrant collection. Progress is checkpointed to a
+file so an interrupted run resumes where it stopped, and the collection
+alias used for search is only switched to the new collection once it is
+complete.
+
+With --copy the vectors are copied from the current collection instead of
+re-embedded, which migrates it to new collection settings such as the
+tenant-partitioned layout (QDRANT_LAYOUT=tenants).
+
+Stop the app for the duration of a reindex. Tasks added, edited or
+deleted while it runs are written to the old collection, after their page
+was already read, and are lost with it at the swap. Writes the app still
+had journaled when it stopped go through the alias, so it applies them to
+the new collection when it starts again.
+
+Run from backend/app, with the app stopped:
+    python -m src.reindex --page-size 500 --workers 4
+    QDRANT_LAYOUT=tenants python -m src.reindex --copy
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import (
+    CreateAlias,
+    CreateAliasOperation,
+    DeleteAlias,
+    DeleteAliasOperation,
+)
+
+from src.http_services.http_client import HttpClient
+from src.http_services.task_http_service import TaskHttpService
+from src.utils.logger import logger
+from src.utils.metrics import MetricsRegistry, metrics as default_metrics
+from src.vector_store.interfaces import TaskVector
+from src.vector_store.qdrant_client import CollectionConfig, create_task_collection
+from src.vector_store.task_vector_store import TaskVectorStore, task_point
+from src.vector_store.text_embedder import TextEmbedder
+
+
+class Reindexer:
+    """
+    Resumable rebuild of the task collection behind a Qdrant alias.
+
+    Writes made through the alias while the rebuild runs are not carried
+    over to the new collection, so nothing else may write to it meanwhile.
+
+    Attributes:
+        alias: Name search uses for the collection, e.g. "tasks"
+        page_size: Number of tasks fetched from the API per request
+        chunk_size: Number of tasks embedded and upserted by one worker call
+        checkpoint_path: File recording the collection being built and the last indexed task ID
+        config: Index and storage settings of the new collection
+        copy: Copy the vectors of the current collection instead of embedding the tasks from the API
+    """
+
+    def __init__(
+        self,
+        task_service: TaskHttpService,
+        client: QdrantClient,
+        embedder: TextEmbedder,
+        alias: str = "tasks",
+        vector_size: int = 384,
+        page_size: int = 500,
+        chunk_size: int = 64,
+        workers: Optional[int] = None,
+        checkpoint_path: str = "reindex_checkpoint.json",
+        metrics: Optional[MetricsRegistry] = None,
+        config: Optional[CollectionConfig] = None,
+        copy: bool = False
+    ) -> None:
+        """
+        Initialize the reindexer.
+
+        Args:
+            task_service: Service the tasks are read from
+            client: Qdrant client the collection is built in
+            embedder: Embedder for the task titles
+            alias: Name search uses for the collection
+            vector_size: Size of the embeddings
+            page_size: Number of tasks fetched from the API per request
+            chunk_size: Number of tasks embedded and upserted by one worker call
+            workers: Size of the embedding pool, the CPU count by default
+            checkpoint_path: File recording progress for resuming
+            metrics: Registry the progress counters are recorded in
+            config: Index and storage settings of the new collection
+            copy: Copy the vectors of the current collection instead of embedding the tasks from the API
+        """
+        self.task_service: TaskHttpService = task_service
+        self.client: QdrantClient = client
+        self.embedder: TextEmbedder = embedder
+        self.alias: str = alias
+        self.vector_size: int = vector_size
+        self.page_size: int = page_size
+        self.chunk_size: int = chunk_size
+        self.workers: int = workers or os.cpu_count() or 1
+        self.checkpoint_path: str = checkpoint_path
+        self.metrics: MetricsRegistry = metrics or default_metrics
+        self.config: CollectionConfig = config or CollectionConfig()
+        self.copy: bool = copy
+
+    async def run(self) -> int:
+        """
+        Build the collection, resuming from the checkpoint if there is one, and switch the alias to it.
+
+        Returns:
+            Number of tasks indexed, including those indexed before a resume
+        """
+        checkpoint: Dict[str, Any] = self._start()
+        collection: str = checkpoint["collection"]
+        if self.copy:
+            await self._copy(checkpoint, collection)
+        else:
+            await self._embed(checkpoint, collection)
+
+        self._swap(collection)
+        os.remove(self.checkpoint_path)
+        return checkpoint["indexed"]
+
+    async def _embed(self, checkpoint: Dict[str, Any], collection: str) -> None:
+        store: TaskVectorStore = TaskVectorStore(
+            client=self.client,
+            embedder=self.embedder,
+            collection_name=collection,
+            batch_size=self.chunk_size,
+            config=self.config
+        )
+
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="reindex") as pool:
+            page: List[Dict[str, Any]] = await self.task_service.get_tasks_page(checkpoint["after_id"], self.page_size)
+            while page:
+                # Fetch the next page while this one is embedded
+                next_page: asyncio.Task = asyncio.create_task(
+                    self.task_service.get_tasks_page(page[-1]["id"], self.page_size)
+                )
+                try:
+                    tasks: List[TaskVector] = [
+                        TaskVector(task["id"], task["title"], task["user_id"], task.get("due_date"))
+                        for task in page
+                    ]
+                    await asyncio.gather(*(
+                        loop.run_in_executor(pool, store.add_many, tasks[start:start + self.chunk_size])
+                        for start in range(0, len(tasks), self.chunk_size)
+                    ))
+                except BaseException:
+                    next_page.cancel()
+                    raise
+
+                checkpoint["after_id"] = page[-1]["id"]
+                checkpoint["indexed"] += len(page)
+                self._save(checkpoint)
+                self.metrics.increment("reindex_tasks", len(page))
+                logger.info(f"Reindexed {checkpoint['indexed']} tasks into {collection}")
+                page = await next_page
+
+    async def _copy(self, checkpoint: Dict[str, Any], collection: str) -> None:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        offset: Optional[int] = checkpoint.get("offset")
+        while True:
+            # The alias still names the current collection until the swap
+            points, offset = await loop.run_in_executor(None, partial(
+                self.client.scroll,
+                collection_name=self.alias,
+                limit=self.page_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True
+            ))
+            if points:
+                # Rebuilding the points adds the payload keys of the current layout, such as the tenant key
+                await loop.run_in_executor(None, partial(
+                    self.client.upsert,
+                    collection_name=collection,
+                    points=[
+                        task_point(
+                            TaskVector(p.payload["task_id"], p.payload["title"], p.payload["user"], p.payload.get("due_date")),
+                            p.vector
+                        )
+                        for p in points
+                    ]
+                ))
+
+            checkpoint["offset"] = offset
+            checkpoint["indexed"] += len(points)
+            self._save(checkpoint)
+            self.metrics.increment("reindex_tasks", len(points))
+            logger.info(f"Copied {checkpoint['indexed']} task vectors into {collection}")
+            if offset is None:
+                return
+
+    def _start(self) -> Dict[str, Any]:
+        checkpoint: Optional[Dict[str, Any]] = self._load()
+        if checkpoint and self.client.collection_exists(checkpoint["collection"]):
+            logger.info(f"Resuming reindex into {checkpoint['collection']} after task {checkpoint['after_id']}")
+            return checkpoint
+
+        checkpoint = {"collection": f"{self.alias}_{int(time.time())}", "after_id": 0, "indexed": 0}
+        create_task_collection(self.client, checkpoint["collection"], self.vector_size, self.config)
+        self._save(checkpoint)
+        logger.info(f"Reindexing into new collection {checkpoint['collection']}")
+        return checkpoint
+
+    def _swap(self, collection: str) -> None:
+        previous: List[str] = [
+            alias.collection_name for alias in self.client.get_aliases().aliases if alias.alias_name == self.alias
+        ]
+        if not previous and self.client.collection_exists(self.alias):
+            # A collection created before aliases were used holds the name; it has to go first,
+            # so searches fail until the alias below exists
+            logger.warning(f"Deleting collection {self.alias} to replace it with an alias of {collection}")
+            self.client.delete_collection(self.alias)
+
+        operations: list = [CreateAliasOperation(create_alias=CreateAlias(collection_name=collection, alias_name=self.alias))]
+        if previous:
+            operations.insert(0, DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=self.alias)))
+        # Replacing an alias applies both operations in one request, so searches see the old or the new collection
+        self.client.update_collection_aliases(change_aliases_operations=operations)
+        logger.info(f"Alias {self.alias} now points to {collection}")
+
+        for old in previous:
+            if old != collection:
+                self.client.delete_collection(old)
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, checkpoint: Dict[str, Any]) -> None:
+        temporary: str = f"{self.checkpoint_path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f)
+        os.replace(temporary, self.checkpoint_path)
+
+
+async def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Rebuild the task vector collection from the task API. Stop the app first: "
+                    "changes it makes during the rebuild are lost."
+    )
+    parser.add_argument("--alias", default="tasks")
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=None, help="embedding threads, the CPU count by default")
+    parser.add_argument("--checkpoint", default="reindex_checkpoint.json")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("--copy", action="store_true", help="copy the current vectors instead of embedding the tasks again")
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.restart and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+
+    http_client: HttpClient = HttpClient(base_url=os.getenv("API_BASE_URL", "http://localhost:8000"))
+    task_service: TaskHttpService = TaskHttpService(http_client)
+    reindexer: Reindexer = Reindexer(
+        task_service=task_service,
+        client=QdrantClient(host=os.getenv("QDRANT_HOST", "localhost"), port=6333),
+        embedder=TextEmbedder.from_env(),
+        alias=args.alias,
+        page_size=args.page_size,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        config=CollectionConfig.from_env(),
+        copy=args.copy
+    )
+    try:
+        indexed: int = await reindexer.run()
+        logger.info(f"Reindex complete: {indexed} tasks")
+    finally:
+        await http_client.close()
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    asyncio.run(main())
@@ -6,8 +6,10 @@ from src.communicator import SocketIoCommunicator
 from src.utils.logger import logger
 
 class SocketIOServer:
-    def __init__(self, handler):
+    def __init__(self, handler, on_session_end=None):
         self.handler = handler
+        # Coroutine function run on a session's loop after its handler ends, to release what the loop holds
+        self.on_session_end = on_session_end
         self.sio = socketio.AsyncServer()
         self.app = web.Application()
         self.sio.attach(self.app)
@@ -19,6 +21,7 @@ class SocketIOServer:
         self.app.router.add_get('/', self.index) 
 
         self.sid_to_communicator = {}
+        self.sid_to_session = {}
 
     async def index(self, request):
         """Serve the client-side HTML (optional)."""
@@ -33,8 +36,17 @@ class SocketIOServer:
             communicator = SocketIoCommunicator(self.sio, sid, loop=loop)
             self.sid_to_communicator[sid] = communicator
 
-            loop.run_until_complete(self.handler(communicator))
-            loop.close()
+            session = loop.create_task(self.handler(communicator))
+            self.sid_to_session[sid] = (loop, session)
+            try:
+                loop.run_until_complete(session)
+            except asyncio.CancelledError:
+                logger.debug(f"Session {sid} ended")
+            finally:
+                self.sid_to_session.pop(sid, None)
+                if self.on_session_end is not None:
+                    loop.run_until_complete(self.on_session_end())
+                loop.close()
 
         threading.Thread(target=run_main_in_thread).start()    
 
@@ -47,6 +59,10 @@ class SocketIOServer:
     async def handle_disconnect(self, sid):
         logger.info("Client disconnected:", sid)
         del self.sid_to_communicator[sid]
+        # The handler waits for input forever; cancelling it ends the session thread
+        if sid in self.sid_to_session:
+            loop, session = self.sid_to_session[sid]
+            loop.call_soon_threadsafe(session.cancel)
 
     def run(self, host="0.0.0.0", port=8080):
         web.run_app(self.app, host=host, port=port)    
@@ -0,0 +1,305 @@
+"""
+Date expression parser module for the TaskGPT application.
+
+This module resolves common English date expressions ("tomorrow",
+"next Friday", "this week", "2025-03-01", "between July 10 and July 14")
+against a reference date without calling the LLM.
+"""
+
+import re
+from datetime import date, timedelta
+from typing import Callable, Dict, List, NamedTuple, Optional, Pattern, Tuple
+
+MONTHS: Dict[str, int] = {
+    "january": 1, "jan": 1, "february": 2, "feb": 2, "march": 3, "mar": 3,
+    "april": 4, "apr": 4, "may": 5, "june": 6, "jun": 6, "july": 7, "jul": 7,
+    "august": 8, "aug": 8, "september": 9, "sept": 9, "sep": 9,
+    "october": 10, "oct": 10, "november": 11, "nov": 11, "december": 12, "dec": 12,
+}
+
+WEEKDAYS: Dict[str, int] = {
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+    "friday": 4, "saturday": 5, "sunday": 6,
+}
+
+NUMBER_WORDS: Dict[str, int] = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11,
+    "twelve": 12, "a couple of": 2, "a few": 3,
+}
+
+# Words that may surround a date without carrying any other meaning
+FILLER_WORDS = frozenset({
+    "a", "at", "by", "change", "date", "deadline", "due", "for", "from", "in",
+    "it", "its", "make", "move", "new", "on", "please", "postpone", "push",
+    "reschedule", "set", "the", "to", "until", "update",
+})
+
+_MONTH = r"(?P<month>" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")\.?"
+_WEEKDAY = r"(?P<weekday>" + "|".join(WEEKDAYS) + r")"
+_ORDINAL = r"(?:st|nd|rd|th)?"
+_NUMBER = r"(?P<count>\d+|" + "|".join(sorted(NUMBER_WORDS, key=len, reverse=True)) + r")"
+_RANGE_START = re.compile(r"\b(?:between|from)\s+$")
+_RANGE_JOIN = re.compile(r"\s*(?:and|to|until|till|through|-)\s*")
+# Words before "the Nth" that make it a day of the month rather than an ordinal ("the 2nd draft")
+_NTH_CUE = re.compile(
+    r"\b(?:on|by|due|until|till|before|between|from)\s+$"
+    r"|\b(?:between|from)\s+the\s+\d{1,2}(?:st|nd|rd|th)\s*(?:and|to|through|-)\s*$"
+)
+
+
+class DateMatch(NamedTuple):
+    """
+    A resolved date expression.
+
+    Attributes:
+        start: First day covered by the expression
+        end: Last day covered; equal to start for single days
+        span: Character span of the expression in the parsed text
+    """
+    start: date
+    end: date
+    span: Tuple[int, int]
+
+    @property
+    def is_range(self) -> bool:
+        return self.start != self.end
+
+    @property
+    def due_date(self) -> str:
+        """ISO date to use as a deadline; ranges resolve to their last day."""
+        return self.end.isoformat()
+
+    def to_filter(self) -> Dict[str, str]:
+        """
+        Convert to the date filter format used by ViewTasksUserRequest.
+
+        Returns:
+            {"date": ...} for single days, {"start": ..., "end": ...} for ranges
+        """
+        if self.is_range:
+            return {"start": self.start.isoformat(), "end": self.end.isoformat()}
+        return {"date": self.start.isoformat()}
+
+
+def _safe_date(year: int, month: int, day: int) -> Optional[date]:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _infer_year(month: int, day: int, today: date) -> Optional[date]:
+    # Dates without a year refer to the coming occurrence unless only recently past
+    candidate: Optional[date] = _safe_date(today.year, month, day)
+    if candidate and (today - candidate).days > 183:
+        candidate = _safe_date(today.year + 1, month, day)
+    return candidate
+
+
+def _add_months(day: date, months: int) -> date:
+    month_index: int = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    for last_day in (day.day, 30, 29, 28):
+        resolved: Optional[date] = _safe_date(year, month, min(day.day, last_day))
+        if resolved:
+            return resolved
+    return day
+
+
+def _month_bounds(year: int, month: int) -> Tuple[date, date]:
+    first: date = date(year, month, 1)
+    return first, _add_months(first, 1) - timedelta(days=1)
+
+
+def _count(value: str) -> int:
+    return int(value) if value.isdigit() else NUMBER_WORDS[value]
+
+
+def _numeric(m: re.Match, today: date) -> Optional[Tuple[date, date]]:
+    day: Optional[date] = _safe_date(int(m["year"]), int(m["m"]), int(m["d"]))
+    return (day, day) if day else None
+
+
+def _month_day(m: re.Match, today: date) -> Optional[Tuple[date, date]]:
+    month: int = MONTHS[m["month"]]
+    day_number: int = int(m["d"])
+    day: Optional[date] = (_safe_date(int(m["year"]), month, day_number) if m["year"]
+                           else _infer_year(month, day_number, today))
+    return (day, day) if day else None
+
+
+def _nth_of_month(m: re.Match, today: date) -> Optional[Tuple[date, date]]:
+    if not _NTH_CUE.search(m.string[:m.start()]):
+        rest: List[str] = re.findall(r"[a-z0-9']+", m.string[:m.start()] + " " + m.string[m.end():])
+        if any(word not in FILLER_WORDS for word in rest):
+            return None
+    day_number: int = int(m["d"])
+    day: Optional[date] = _safe_date(today.year, today.month, day_number)
+    if not day or day < today:
+        following: date = _add_months(date(today.year, today.month, 1), 1)
+        day = _safe_date(following.year, following.month, day_number)
+    return (day, day) if day else None
+
+
+def _relative_day(m: re.Match, today: date) -> Optional[Tuple[date, date]]:
+    word: str = m["word"]
+    offset: int = {"today": 0, "tonight": 0, "tomorrow": 1, "tmrw": 1, "yesterday": -1}.get(word, 2)
+    day: date = today + timedelta(days=offset)
+    return day, day
+
+
+def _in_period(m: re.Match, today: date) -> Optional[Tuple[date, date]]:
+    count: int = _count(m["count"])
+    unit: str = m["unit"]
+    if unit == "day":
+        day: date = today + timedelta(days=count)
+    elif unit == "week":
+        day = today + timedelta(weeks=count)
+    elif unit == "month":
+        day = _add_months(today, count)
+    else:
+        day = _add_months(today, 12 * count)
+    return day, day
+
+
+def _weekday(m: re.Match, today: date) -> Optional[Tuple[date, date]]:
+    target: int = WEEKDAYS[m["weekday"]]
+    if m["modifier"] == "next":
+        # "next Friday" is the Friday of next week
+        monday: date = today - timedelta(days=today.weekday()) + timedelta(weeks=1)
+        day: date = monday + timedelta(days=target)
+    elif m["modifier"] == "last":
+        day = today - timedelta(days=(today.weekday() - target) % 7 or 7)
+    else:
+        day = today + timedelta(days=(target - today.weekday()) % 7)
+    return day, day
+
+
+def _period(m: re.Match, today: date) -> Optional[Tuple[date, date]]:
+    shift: int = {"this": 0, "next": 1, "coming": 1, "last": -1}[m["modifier"]]
+    unit: str = m["unit"]
+    if unit in ("week", "weekend"):
+        monday: date = today - timedelta(days=today.weekday()) + timedelta(weeks=shift)
+        if unit == "weekend":
+            return monday + timedelta(days=5), monday + timedelta(days=6)
+        return monday, monday + timedelta(days=6)
+    if unit == "month":
+        first: date = _add_months(date(today.year, today.month, 1), shift)
+        return _month_bounds(first.year, first.month)
+    year: int = today.year + shift
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+def _end_of(m: re.Match, today: date) -> Optional[Tuple[date, date]]:
+    if m["unit"] == "week":
+        day: date = today + timedelta(days=6 - today.weekday())
+    elif m["unit"] == "month":
+        day = _month_bounds(today.year, today.month)[1]
+    else:
+        day = date(today.year, 12, 31)
+    return day, day
+
+
+_Resolver = Callable[[re.Match, date], Optional[Tuple[date, date]]]
+
+_PATTERNS: List[Tuple[Pattern[str], _Resolver]] = [
+    (re.compile(r"\b(?P<year>\d{4})[-/.](?P<m>\d{1,2})[-/.](?P<d>\d{1,2})\b"), _numeric),
+    (re.compile(r"\b(?P<m>\d{1,2})/(?P<d>\d{1,2})/(?P<year>\d{4})\b"), _numeric),
+    (re.compile(r"\b" + _MONTH + r"\s+(?P<d>\d{1,2})" + _ORDINAL + r"\b(?:,?\s+(?P<year>\d{4})\b)?"), _month_day),
+    (re.compile(r"\b(?P<d>\d{1,2})" + _ORDINAL + r"\s+(?:of\s+)?" + _MONTH + r"(?:,?\s+(?P<year>\d{4})\b)?"), _month_day),
+    (re.compile(r"\bthe\s+(?P<d>\d{1,2})(?:st|nd|rd|th)\b(?!\s+(?:of\s+)?" + _MONTH + ")"), _nth_of_month),
+    (re.compile(r"\b(?P<word>(?:the\s+)?day\s+after\s+tomorrow|today|tonight|tomorrow|tmrw|yesterday)\b"), _relative_day),
+    (re.compile(r"\bin\s+" + _NUMBER + r"\s+(?P<unit>day|week|month|year)s?\b"), _in_period),
+    (re.compile(r"\b" + _NUMBER + r"\s+(?P<unit>day|week|month|year)s?\s+from\s+(?:now|today)\b"), _in_period),
+    (re.compile(r"\b(?:(?P<modifier>this|next|last|coming|on)\s+)?" + _WEEKDAY + r"\b"), _weekday),
+    (re.compile(r"\b(?:the\s+)?(?P<modifier>this|next|last|coming)\s+(?P<unit>weekend|week|month|year)\b"), _period),
+    (re.compile(r"\b(?:by\s+)?(?:the\s+)?end\s+of\s+(?:the\s+|this\s+)?(?P<unit>week|month|year)\b"), _end_of),
+]
+
+
+def _scan(text: str, today: date) -> List[DateMatch]:
+    matches: List[DateMatch] = []
+    for pattern, resolver in _PATTERNS:
+        for m in pattern.finditer(text):
+            resolved: Optional[Tuple[date, date]] = resolver(m, today)
+            if resolved:
+                matches.append(DateMatch(resolved[0], resolved[1], m.span()))
+
+    # Keep the leftmost-longest expression where matches overlap
+    matches.sort(key=lambda match: (match.span[0], -match.span[1]))
+    selected: List[DateMatch] = []
+    for match in matches:
+        if not selected or match.span[0] >= selected[-1].span[1]:
+            selected.append(match)
+    return selected
+
+
+def parse_date_expression(text: str, today: Optional[date] = None) -> Optional[DateMatch]:
+    """
+    Find and resolve the first date expression in a sentence.
+
+    "between A and B" / "from A to B" are combined into a single range.
+    Weekdays resolve to their next occurrence (today included), while
+    "next <weekday>" means that weekday in the following calendar week.
+
+    Args:
+        text: Free-form user input
+        today: Reference date, defaults to date.today()
+
+    Returns:
+        The resolved expression, or None if the text holds no known date
+    """
+    today = today or date.today()
+    lowered: str = text.lower()
+    matches: List[DateMatch] = _scan(lowered, today)
+    if not matches:
+        return None
+
+    first: DateMatch = matches[0]
+    range_start: Optional[re.Match] = _RANGE_START.search(lowered[:first.span[0]])
+    if range_start and len(matches) > 1:
+        second: DateMatch = matches[1]
+        if _RANGE_JOIN.fullmatch(lowered[first.span[1]:second.span[0]]):
+            return DateMatch(
+                min(first.start, second.start),
+                max(first.end, second.end),
+                (range_start.start(), second.span[1])
+            )
+    return first
+
+
+def remainder(text: str, match: DateMatch) -> str:
+    """
+    Return the text around a date expression with filler words removed.
+
+    An empty result means the sentence was only a date (e.g. "due next
+    Friday"), so nothing is left for the LLM to interpret.
+
+    Args:
+        text: Text the match was found in
+        match: Match returned by parse_date_expression
+
+    Returns:
+        Remaining meaningful words joined by spaces
+    """
+    rest: str = text[:match.span[0]] + " " + text[match.span[1]:]
+    words: List[str] = re.findall(r"[a-z0-9']+", rest.lower())
+    return " ".join(word for word in words if word not in FILLER_WORDS)
+
+
+def normalize_date(value: Optional[str], today: Optional[date] = None) -> Optional[str]:
+    """
+    Normalize a date string or expression to YYYY-MM-DD.
+
+    Args:
+        value: ISO date or any expression understood by parse_date_expression
+        today: Reference date, defaults to date.today()
+
+    Returns:
+        ISO date string, or None if the value is not a recognizable date
+    """
+    if not value:
+        return None
+    match: Optional[DateMatch] = parse_date_expression(value, today)
+    return match.due_date if match else None
@@ -22,6 +22,15 @@ class MenuChoice(str, Enum):
     EDIT_TASK = "5"
     NONE = "None"
 
+# Main menu options offered to the command interpreter
+menu_options: Final[str] = """
+    1. View Tasks
+    2. Add Task
+    3. Mark Task as Done
+    4. Delete Task
+    5. Edit Task
+    """
+
 # Predefined view options for task filtering
 view_options: Final[str] = """
     1. Completed Tasks
@@ -0,0 +1,206 @@
+"""
+Metrics utility module for the TaskGPT application.
+
+This module provides a small thread-safe in-process metrics registry
+with labelled counters, gauges and histograms, shared by all application components.
+"""
+
+import bisect
+import copy
+import math
+import threading
+from collections import defaultdict
+from typing import Dict, Final, List, Optional, Sequence, Tuple
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+# Default histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS: Final[Tuple[float, ...]] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, math.inf)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram.
+
+    Attributes:
+        buckets: Sorted bucket upper bounds, the last one being infinity
+        counts: Number of observations per bucket
+        count: Total number of observations
+        sum: Sum of all observed values
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.buckets: Tuple[float, ...] = tuple(buckets)
+        self.counts: List[int] = [0] * len(self.buckets)
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[min(bisect.bisect_left(self.buckets, value), len(self.buckets) - 1)] += 1
+        self.count += 1
+        self.sum += value
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile as the upper bound of the bucket holding it.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Bucket upper bound, or 0 if nothing was observed
+        """
+        if not self.count:
+            return 0.0
+        rank: float = q * self.count
+        seen: int = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of labelled counters.
+
+    Counters and histograms are identified by a name and a set of string
+    labels, for example ``llm_cache_hits{template="EXTRACT_TASK"}``.
+    """
+
+    def __init__(self) -> None:
+        self._lock: threading.Lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelSet, float]] = defaultdict(lambda: defaultdict(float))
+        self._histograms: Dict[str, Dict[LabelSet, Histogram]] = defaultdict(dict)
+        self._gauges: Dict[str, Dict[LabelSet, float]] = defaultdict(dict)
+
+    def increment(self, name: str, amount: float = 1, **labels: str) -> None:
+        """
+        Increase a counter.
+
+        Args:
+            name: Counter name
+            amount: Value to add
+            **labels: Labels identifying the counter series
+        """
+        key: LabelSet = self._labels(labels)
+        with self._lock:
+            self._counters[name][key] += amount
+
+    def get(self, name: str, **labels: str) -> float:
+        """
+        Read a counter value.
+
+        Args:
+            name: Counter name
+            **labels: Labels identifying the counter series
+
+        Returns:
+            Current value, or 0 if the series was never incremented
+        """
+        key: LabelSet = self._labels(labels)
+        with self._lock:
+            return self._counters.get(name, {}).get(key, 0)
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        """
+        Set a gauge to its current value.
+
+        Args:
+            name: Gauge name
+            value: Current value
+            **labels: Labels identifying the gauge series
+        """
+        key: LabelSet = self._labels(labels)
+        with self._lock:
+            self._gauges[name][key] = value
+
+    def gauge(self, name: str, **labels: str) -> float:
+        """
+        Read a gauge value.
+
+        Args:
+            name: Gauge name
+            **labels: Labels identifying the gauge series
+
+        Returns:
+            Last value set, or 0 if the series was never set
+        """
+        key: LabelSet = self._labels(labels)
+        with self._lock:
+            return self._gauges.get(name, {}).get(key, 0)
+
+    def observe(self, name: str, value: float, buckets: Sequence[float] = LATENCY_BUCKETS, **labels: str) -> None:
+        """
+        Record a value in a histogram.
+
+        Args:
+            name: Histogram name
+            value: Observed value
+            buckets: Bucket upper bounds, used when the series is created
+            **labels: Labels identifying the histogram series
+        """
+        key: LabelSet = self._labels(labels)
+        with self._lock:
+            series: Dict[LabelSet, Histogram] = self._histograms[name]
+            if key not in series:
+                series[key] = Histogram(buckets)
+            series[key].observe(value)
+
+    def histogram(self, name: str, **labels: str) -> Optional[Histogram]:
+        """
+        Read a histogram.
+
+        Args:
+            name: Histogram name
+            **labels: Labels identifying the histogram series
+
+        Returns:
+            Copy of the histogram, or None if nothing was observed
+        """
+        key: LabelSet = self._labels(labels)
+        with self._lock:
+            histogram: Optional[Histogram] = self._histograms.get(name, {}).get(key)
+            return copy.deepcopy(histogram) if histogram else None
+
+    def histograms(self) -> Dict[str, Dict[LabelSet, Histogram]]:
+        """
+        Return a copy of all histograms.
+
+        Returns:
+            Mapping of histogram name to {label set: histogram}
+        """
+        with self._lock:
+            return {name: copy.deepcopy(series) for name, series in self._histograms.items()}
+
+    def snapshot(self) -> Dict[str, Dict[LabelSet, float]]:
+        """
+        Return a copy of all counters.
+
+        Returns:
+            Mapping of counter name to {label set: value}
+        """
+        with self._lock:
+            return {name: dict(series) for name, series in self._counters.items()}
+
+    def reset(self) -> None:
+        """
+        Clear all counters, gauges and histograms.
+        """
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    @staticmethod
+    def _labels(labels: Dict[str, str]) -> LabelSet:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+# Process-wide registry used by the application
+metrics: Final[MetricsRegistry] = MetricsRegistry()
@@ -1,18 +1,104 @@
-INTERPRET_COMMAND_TEMPLATE = """
+import hashlib
+from typing import Optional, Type
+
+from pydantic import BaseModel
+
+from src.llm.schemas import DateFilter, EditTaskData, TaskData, TaskReference, ViewTaskResult
+
+
+class PromptTemplate:
+    """
+    A named prompt template.
+
+    Templates are split into a static prefix holding the instructions and
+    a short dynamic tail holding the per-call values, so that providers
+    with context caching can upload the prefix once and send only the tail.
+
+    Attributes:
+        name: Stable identifier used for caching and metrics
+        text: Dynamic tail with str.format placeholders
+        date_relative: Whether the answer depends on today's date
+        cacheable: Whether responses to this template may be cached
+        copies_input: Whether the answer quotes the user input, such as a task title, so its casing matters
+        prefix: Static instructions preceding the tail, without placeholders
+        schema: Result model the answer must match, for structured output
+    """
+
+    def __init__(
+        self,
+        name: str,
+        text: str,
+        date_relative: bool = False,
+        cacheable: bool = True,
+        copies_input: bool = False,
+        prefix: str = "",
+        schema: Optional[Type[BaseModel]] = None
+    ) -> None:
+        self.name: str = name
+        self.text: str = text
+        self.date_relative: bool = date_relative
+        self.cacheable: bool = cacheable
+        self.copies_input: bool = copies_input
+        self.prefix: str = prefix
+        self.schema: Optional[Type[BaseModel]] = schema
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Short hash of the prompt wording, so answers cached for an earlier wording are not reused.
+        """
+        return hashlib.sha256(str(self).encode("utf-8")).hexdigest()[:16]
+
+    def format(self, **kwargs) -> str:
+        return self.prefix + self.text.format(**kwargs)
+
+    def tail(self, prompt: str) -> str:
+        """
+        Strip the static prefix from a prompt rendered with format.
+
+        Args:
+            prompt: Full prompt
+
+        Returns:
+            The dynamic tail of the prompt
+        """
+        return prompt[len(self.prefix):] if prompt.startswith(self.prefix) else prompt
+
+    def __str__(self) -> str:
+        return self.prefix + self.text
+
+
+INTERPRET_COMMAND_TEMPLATE = PromptTemplate("INTERPRET_COMMAND", prefix="""
 You are an AI system that understands user commands in natural language.
+You will be given the options you support and a textual command from a user.
+Your job is to return the option number (1 to N),
+or "None" if it does not match any of the supported options.
+""", text="""
 You support the following options:
 
 {options}
 
-You will be given a textual command from a user.
-Your job is to return the option number (1 to N),  
-or "None" if it does not match any of the supported options.
-
 Now process this command:
 "{command}"
-"""
+""")
+
+INTERPRET_COMMAND_BATCH_TEMPLATE = PromptTemplate("INTERPRET_COMMAND_BATCH", prefix="""
+You are an AI system that understands user commands in natural language.
+You will be given the options you support and a numbered list of textual commands, each from a different user.
+Your job is to return, for every command, the option number (1 to N),
+or "None" if it does not match any of the supported options.
+Return ONLY a VALID JSON array of strings with one answer per command, in the same order,
+for example: ["2", "None", "1"]
+""", text="""
+You support the following options:
+
+{options}
 
-VIEW_TASK_TEMPLATE = """
+Now process these commands:
+{commands}
+""", cacheable=False)
+
+VIEW_TASK_TEMPLATE = PromptTemplate("VIEW_TASK", prefix="""
 You are an AI assistant that helps users view their tasks.
 
 You will receive a command from the user like:
@@ -24,10 +110,10 @@ You will receive a command from the user like:
 
 Your job is to return a VALID JSON object in this exact format:
 
-{{
+{
   "status": "specific" | "ambiguous",
   "choice": "1" | "2" | "3" | "4" | "5" | "6" | null
-}}
+}
 
 Guidelines:
 - If the user clearly specifies the type of task, set "status" to "specific", and "choice" to the matching number:
@@ -41,30 +127,28 @@ Guidelines:
 - If the user is vague (like "show me my tasks"), set:
   * "status": "ambiguous"
   * "choice": null
- 
+
 
 IMPORTANT:
 - Do not return explanations or extra text — just the valid JSON object.
-
+""", text="""
 Now process this command:
 "{command}"
-"""
+""", schema=ViewTaskResult)
 
 
-EDIT_TASK_TEMPLATE = """
-You are an AI system that understands user commands in natural language. The user chose to edit his tasks. Now you need to understand what he wants to edit:
-
-{edit_options}
+EDIT_TASK_TEMPLATE = PromptTemplate("EDIT_TASK", prefix="""
+You are an AI system that understands user commands in natural language. The user chose to edit his tasks. Now you need to understand what he wants to edit.
 
 Your job is to return the task type number (1 to 4), or "None" if it does not match any of the supported tasks.
+""", text="""
+{edit_options}
 
 Now process this command:
 "{command}"
-"""
-
-EXTRACT_TASK_TEMPLATE = """
-Today is {today}.
+""")
 
+EXTRACT_TASK_TEMPLATE = PromptTemplate("EXTRACT_TASK", prefix="""
 You are an expert AI assistant that extracts structured data from text.
 
 Your job is to extract two things:
@@ -73,10 +157,10 @@ Your job is to extract two things:
 
 You MUST return a VALID JSON in this exact format:
 
-{{
+{
     "name": "task name here",
     "date": "YYYY-MM-DD"  // If a date is mentioned. If no date → "None".
-}}
+}
 
 IMPORTANT:
 - Understand dates in ANY FORMAT:
@@ -89,19 +173,19 @@ IMPORTANT:
     * "this Friday"
     * "next week"
     * "next month"
-- Normalize ALL dates to "YYYY-MM-DD" using the current date (Today is {today}).
+- Normalize ALL dates to "YYYY-MM-DD" using the current date given below.
 - If no date is mentioned → set "date" to "None".
-- Please note that vague tasks like "add a task" or "create a task" are not titles. Only consider real task descriptions as titles. If not, return "None" as title 
+- Please note that vague tasks like "add a task" or "create a task" are not titles. Only consider real task descriptions as titles. If not, return "None" as title
+""", text="""
+Today is {today}.
 
 Here is the sentence:
 "{user_input}"
 
 Now return ONLY the JSON
-"""
-
-EXTRACT_EDIT_TASK_TEMPLATE = """
-Today is {today}.
+""", date_relative=True, copies_input=True, schema=TaskData)
 
+EXTRACT_EDIT_TASK_TEMPLATE = PromptTemplate("EXTRACT_EDIT_TASK", prefix="""
 You are an expert AI assistant that helps update tasks. The user gave you a sentence describing what they want to change about a task.
 
 Extract the following from the sentence:
@@ -109,53 +193,59 @@ Extract the following from the sentence:
 - New due date (if they want to change it)
 
 Return this JSON format exactly:
-{{
+{
     "title": "new title here or null",
     "due_date": "YYYY-MM-DD or null"
-}}
+}
 
 If the user does not want to change a field, return null for it.
+""", text="""
+Today is {today}.
 
 Now process this sentence:
 "{user_input}"
 
 Return ONLY the JSON.
-"""
+""", date_relative=True, copies_input=True, schema=EditTaskData)
 
-EXTRACT_ID_OR_TITLE_TEMPLATE = """
+EXTRACT_ID_OR_TITLE_TEMPLATE = PromptTemplate("EXTRACT_ID_OR_TITLE", prefix="""
 You are an expert AI assistant. The user wants to select a task to mark as done.
-Extract EITHER the TASK ID (number) OR the TASK TITLE (string) from this command:
-"{user_input}"
+Extract EITHER the TASK ID (number) OR the TASK TITLE (string) from the command given below.
 Return a VALID JSON in this exact format:
-{{
+{
     "task_id": 123,      // If the user said a task ID. If no ID, set to null.
     "task_title": "..."  // If the user said a title. If no title, set to null.
-}}
+}
 IMPORTANT:
 - If both are mentioned, return both.
 - If neither is mentioned, set both to null.
+""", text="""
+Command:
+"{user_input}"
 Now return ONLY the JSON.
-"""
+""", copies_input=True, schema=TaskReference)
 
-EXTRACT_ID_OR_TITLE_TO_EDIT_TEMPLATE = """
-Today is {today}.
+EXTRACT_ID_OR_TITLE_TO_EDIT_TEMPLATE = PromptTemplate("EXTRACT_ID_OR_TITLE_TO_EDIT", prefix="""
 You are an expert AI assistant. The user wants to select a task to edit.
-Extract EITHER the TASK ID (number) OR the TASK TITLE (string) from this command:
-"{user_input}"
+Extract EITHER the TASK ID (number) OR the TASK TITLE (string) from the command given below.
 Return a VALID JSON in this exact format:
-{{
+{
     "task_id": 123,      // If the user said a task ID. If no ID, set to null.
     "task_title": "..."  // If the user said a title. If no title, set to null.
-}}
+}
 IMPORTANT:
 - If both are mentioned, return both.
 - If neither is mentioned, set both to null.
 - Please note that vague tasks like "edit a task" or "edit a title" or "change a due date" or "change the title" are not titles. Only consider real task descriptions as titles. If not, return "None" as title.
 - Understand dates in ANY FORMAT and normalize to YYYY-MM-DD.
+""", text="""
+Today is {today}.
+Command:
+"{user_input}"
 Now return ONLY the JSON.
-"""
+""", date_relative=True, copies_input=True, schema=TaskReference)
 
-MENU_TEMPLATE = """
+MENU_TEMPLATE = PromptTemplate("MENU", """
 You are a friendly virtual assistant for a to-do app.
 Greet the user by saying "Hi {name_intro}" and then present 5 things you can help with:
 1. View tasks
@@ -163,32 +253,32 @@ Greet the user by saying "Hi {name_intro}" and then present 5 things you can hel
 3. Mark a task as done
 4. Delete a task
 5. Edit a task
-Make it feel friendly, not robotic. Add emojis if helpful. Return only the message. 
-"""
+Make it feel friendly, not robotic. Add emojis if helpful. Return only the message.
+""", cacheable=False)
 
-FOLLOWUP_TEMPLATE = """
+FOLLOWUP_TEMPLATE = PromptTemplate("FOLLOWUP", """
 You are a friendly virtual assistant following up after a successful action.
 Encourage the user with a motivational sentence like "You are conquering your day!" or "Nice job keep it up!" or "You're on a roll!"
-Then ask something like : "what else can I help you with?" 
-Make it feel friendly, not robotic. Add emojis if helpful. Return only the message. 
-"""
+Then ask something like : "what else can I help you with?"
+Make it feel friendly, not robotic. Add emojis if helpful. Return only the message.
+""", cacheable=False)
 
-CONFIRMATION_TEMPLATE = """
+CONFIRMATION_TEMPLATE = PromptTemplate("CONFIRMATION", prefix="""
 You are a friendly, helpful AI assistant for a to-do list app.
 
-The user typed: "{user_input}"
-You interpreted their intent as: {intent}
-
+You will be given what the user typed and the intent you interpreted from it.
 Write a short, warm response confirming what the user wants to do.
 Example: “Sure! Let's edit that task. ✏️”
 Keep it conversational and kind. Emojis are okay. Do not give instructions here.
 Just confirm and encourage the user .
 
 Respond with just 1–2 sentences.
-"""
+""", text="""
+The user typed: "{user_input}"
+You interpreted their intent as: {intent}
+""", cacheable=False)
 
-EXTRACT_TASK_DATE_FILTER_TEMPLATE = """
-Today is {today}.
+EXTRACT_TASK_DATE_FILTER_TEMPLATE = PromptTemplate("EXTRACT_TASK_DATE_FILTER", prefix="""
 You are an AI assistant helping users filter tasks by date.
 
 Extract either:
@@ -198,12 +288,13 @@ Extract either:
 Return VALID JSON in one of the following forms:
 
 For specific date:
-{{ "date": "YYYY-MM-DD" }}
+{ "date": "YYYY-MM-DD" }
 
 For date range:
-{{ "start": "YYYY-MM-DD", "end": "YYYY-MM-DD" }}
+{ "start": "YYYY-MM-DD", "end": "YYYY-MM-DD" }
+""", text="""
+Today is {today}.
 
 Now process:
 \"{user_input}\"
-"""
-
+""", date_relative=True, schema=DateFilter)
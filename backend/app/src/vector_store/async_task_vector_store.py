@@ -0,0 +1,257 @@
+"""
+Asyncio task vector store module for the TaskGPT application.
+
+This module contains the AsyncTaskVectorStore class, the non-blocking
+counterpart of TaskVectorStore used by the request handlers: titles are
+embedded on a thread pool and Qdrant is called through the async client,
+so one session's vector search does not stall the others on its loop.
+Searches that arrive while the embedding model is still loading fall back
+to lexical matching of the stored titles.
+"""
+
+import asyncio
+import os
+import re
+import threading
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, List, Optional, Set
+
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import PointIdsList, ScoredPoint
+
+from src.utils.logger import logger
+from src.utils.metrics import MetricsRegistry, metrics as default_metrics
+from .interfaces import AsyncEditableVectorStore, AsyncSearchableVectorStore, TaskVector
+from .qdrant_client import CollectionConfig
+from .task_vector_store import task_point, user_filter
+from .text_embedder import TextEmbedder
+
+
+# Most tasks of one user scanned by the lexical fallback
+LEXICAL_SCAN_LIMIT: int = 1000
+
+
+class AsyncTaskVectorStore(AsyncSearchableVectorStore, AsyncEditableVectorStore):
+    """
+    A vector store for task data using the async Qdrant client and text embedding.
+
+    Every chat session runs its own event loop, and an async client is
+    bound to the loop it was first used on, so a client is created per
+    loop from client_factory. The embedding pool is shared by all of them.
+
+    Attributes:
+        embedder: Embedding utility for task titles
+        collection_name: The name of the Qdrant collection to use
+        batch_size: Number of points sent per upsert or delete request by the bulk methods
+        executor: Pool the embeddings are computed on
+        warm_up_wait: Seconds a search waits for the embedding model before matching titles lexically
+        config: Layout and search settings of the collection
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], AsyncQdrantClient],
+        embedder: TextEmbedder,
+        collection_name: str = "tasks",
+        batch_size: int = 256,
+        executor: Optional[Executor] = None,
+        warm_up_wait: float = 0.5,
+        metrics: Optional[MetricsRegistry] = None,
+        config: Optional[CollectionConfig] = None
+    ) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            client_factory: Creates an async Qdrant client for the calling event loop
+            embedder: Embedding utility for task titles
+            collection_name: The name of the Qdrant collection to use
+            batch_size: Number of points sent per upsert or delete request by the bulk methods
+            executor: Pool for the embeddings, a thread pool sized to the CPU count by default
+            warm_up_wait: Seconds a search waits for the embedding model before matching titles lexically
+            metrics: Registry the lexical fallbacks are counted in
+            config: Layout and search settings of the collection, the shared layout with server defaults if None
+        """
+        self.client_factory: Callable[[], AsyncQdrantClient] = client_factory
+        self.embedder: TextEmbedder = embedder
+        self.collection_name: str = collection_name
+        self.batch_size: int = batch_size
+        # The model is loaded once and shared; encoding releases the GIL, so threads suffice
+        self.executor: Executor = executor or ThreadPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            thread_name_prefix="embedder"
+        )
+        self.warm_up_wait: float = warm_up_wait
+        self.metrics: MetricsRegistry = metrics or default_metrics
+        self.config: CollectionConfig = config or CollectionConfig()
+        self._lock: threading.Lock = threading.Lock()
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncQdrantClient]" = weakref.WeakKeyDictionary()
+
+    @property
+    def client(self) -> AsyncQdrantClient:
+        """
+        The async Qdrant client of the running event loop.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        with self._lock:
+            client: Optional[AsyncQdrantClient] = self._clients.get(loop)
+            if client is None:
+                client = self._clients[loop] = self.client_factory()
+            return client
+
+    async def add(self, task_id: int, title: str, user_id: int, due_date: Optional[str] = None) -> None:
+        """
+        Adds a new task vector to the collection.
+
+        Args:
+            task_id: Unique ID of the task
+            title: Title of the task to be embedded
+            user_id: ID of the user who owns the task
+            due_date: Optional due date in string format
+        """
+        vector: List[float] = await self._embed(title)
+        logger.debug(f"Storing vector for task_id={task_id}, title='{title}', user_id={user_id}")
+
+        await self.client.upsert(
+            collection_name=self.collection_name,
+            points=[task_point(TaskVector(task_id, title, user_id, due_date), vector)]
+        )
+        logger.info(f"Vector upserted for task_id={task_id}, user_id={user_id}, title='{title}', due_date={due_date}")
+
+    async def add_many(self, tasks: List[TaskVector]) -> None:
+        """
+        Adds several task vectors to the collection.
+
+        Args:
+            tasks: Tasks to embed and store
+        """
+        if not tasks:
+            return
+
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        vectors: List[List[float]] = await loop.run_in_executor(
+            self.executor, self.embedder.embed_many, [task.title for task in tasks]
+        )
+        points = [task_point(task, vector) for task, vector in zip(tasks, vectors)]
+
+        for start in range(0, len(points), self.batch_size):
+            await self.client.upsert(
+                collection_name=self.collection_name,
+                points=points[start:start + self.batch_size]
+            )
+        logger.info(f"Vectors upserted for {len(points)} tasks in {-(-len(points) // self.batch_size)} requests")
+
+    async def search(self, query: str, user_id: int, top_k: int = 5) -> List[ScoredPoint]:
+        """
+        Searches for the top-k most relevant tasks for a given query and user.
+
+        If the embedding model is still loading after warm_up_wait seconds,
+        the user's tasks are ranked by the words their titles share with the query.
+
+        Args:
+            query: Text to search against stored task titles
+            user_id: ID of the user to restrict the search to
+            top_k: Maximum number of results to return
+
+        Returns:
+            Top matching task vectors
+        """
+        if not await self._model_ready():
+            return await self._lexical_search(query, user_id, top_k)
+
+        logger.debug(f"Embedding and searching for query='{query}' (user_id={user_id})")
+        vector: List[float] = await self._embed(query)
+
+        results: List[ScoredPoint] = await self.client.search(
+            collection_name=self.collection_name,
+            query_vector=vector,
+            query_filter=user_filter(user_id, self.config.tenants),
+            search_params=self.config.search_params(),
+            limit=top_k
+        )
+
+        logger.info(f"Search completed: query='{query}', top_k={top_k}, user_id={user_id}, results={len(results)}")
+        return results
+
+    async def remove(self, task_id: int, user_id: int) -> None:
+        """
+        Removes a task vector from the collection by its point ID, the task ID.
+
+        Args:
+            task_id: ID of the task to remove
+            user_id: ID of the user who owns the task
+        """
+        # Point IDs are the task IDs the API assigns, unique across users, so no filter scan is needed
+        await self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=PointIdsList(points=[task_id])
+        )
+        logger.debug(f"Task removal issued for task_id={task_id}, user_id={user_id}")
+
+    async def remove_many(self, task_ids: List[int], user_id: int) -> None:
+        """
+        Removes several task vectors of a user from the collection.
+
+        Args:
+            task_ids: IDs of the tasks to remove
+            user_id: ID of the user who owns the tasks
+        """
+        for start in range(0, len(task_ids), self.batch_size):
+            await self.client.delete(
+                collection_name=self.collection_name,
+                points_selector=PointIdsList(points=task_ids[start:start + self.batch_size])
+            )
+        logger.debug(f"Removal issued for {len(task_ids)} tasks of user_id={user_id}")
+
+    async def close(self) -> None:
+        """
+        Close the async Qdrant client of the running event loop.
+        """
+        with self._lock:
+            client: Optional[AsyncQdrantClient] = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+    async def _embed(self, text: str) -> List[float]:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.embedder.embed, text)
+
+    async def _model_ready(self) -> bool:
+        if self.embedder.ready:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(self.embedder.warm_up())), self.warm_up_wait)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        except Exception as e:
+            logger.error(f"Embedding model unavailable, matching titles lexically: {e}")
+            return False
+
+    async def _lexical_search(self, query: str, user_id: int, top_k: int) -> List[ScoredPoint]:
+        self.metrics.increment("vector_search_lexical_fallbacks")
+        words: Set[str] = _words(query)
+        points, _ = await self.client.scroll(
+            collection_name=self.collection_name,
+            scroll_filter=user_filter(user_id, self.config.tenants),
+            limit=LEXICAL_SCAN_LIMIT,
+            with_payload=True,
+            with_vectors=False
+        )
+
+        scored: List[ScoredPoint] = []
+        for point in points:
+            title_words: Set[str] = _words(point.payload.get("title", ""))
+            overlap: int = len(words & title_words)
+            if overlap:
+                score: float = overlap / len(words | title_words)
+                scored.append(ScoredPoint(id=point.id, version=0, score=score, payload=point.payload))
+        scored.sort(key=lambda point: point.score, reverse=True)
+
+        logger.info(f"Lexical search while the model loads: query='{query}', user_id={user_id}, results={len(scored[:top_k])}")
+        return scored[:top_k]
+
+
+def _words(text: str) -> Set[str]:
+    return set(re.findall(r"\w+", text.lower()))
@@ -0,0 +1,252 @@
+"""
+Embedding cache module for the TaskGPT application.
+
+This module contains the EmbeddingCache class, a two-tier cache of text
+embeddings: an in-memory LRU in front of an on-disk store that keeps the
+float32 vectors in a memory-mapped file and their content hashes in a
+SQLite index, so embeddings survive restarts.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from src.utils.logger import logger
+from src.utils.metrics import MetricsRegistry, metrics as default_metrics
+
+
+class EmbeddingCache:
+    """
+    Two-tier cache of embeddings keyed by a hash of the text.
+
+    The on-disk store belongs to one model: opening it with another model
+    name or vector size discards its contents. The vector file is a ring
+    buffer, so once max_disk_entries vectors are stored the oldest ones
+    are overwritten.
+
+    Attributes:
+        model_name: Name of the model the embeddings were computed with
+        path: Directory of the on-disk store, or None to keep the cache in memory only
+        max_memory_entries: Capacity of the in-memory LRU
+        max_disk_entries: Capacity of the on-disk store
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        path: Optional[str] = None,
+        max_memory_entries: int = 4096,
+        max_disk_entries: int = 200_000,
+        metrics: Optional[MetricsRegistry] = None
+    ) -> None:
+        self.model_name: str = model_name
+        self.path: Optional[str] = path
+        self.max_memory_entries: int = max_memory_entries
+        self.max_disk_entries: int = max_disk_entries
+        self.metrics: MetricsRegistry = metrics or default_metrics
+
+        self._lock: threading.Lock = threading.Lock()
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._dim: Optional[int] = None
+        self._vectors: Optional[np.memmap] = None
+        self._next_row: int = 0
+        self._db: Optional[sqlite3.Connection] = None
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(path, "index.sqlite3"), check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, row INTEGER NOT NULL UNIQUE)")
+            self._db.commit()
+            self._load_meta()
+
+    def key(self, text: str) -> str:
+        """
+        Build the cache key of a text.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Hex digest of the model name and the text
+        """
+        return hashlib.sha256(f"{self.model_name}\x1f{text}".encode("utf-8")).hexdigest()
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """
+        Look up the embedding of a text.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Cached float32 vector, or None on a miss
+        """
+        key: str = self.key(text)
+        with self._lock:
+            vector: Optional[np.ndarray] = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.metrics.increment("embedding_cache_hits", tier="memory")
+                return vector
+
+            vector = self._disk_get(key)
+            if vector is not None:
+                self._memory_put(key, vector)
+                self.metrics.increment("embedding_cache_hits", tier="disk")
+                return vector
+
+        self.metrics.increment("embedding_cache_misses")
+        return None
+
+    def put(self, text: str, vector: np.ndarray) -> None:
+        """
+        Store the embedding of a text.
+
+        Args:
+            text: Embedded text
+            vector: Its embedding
+        """
+        key: str = self.key(text)
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            self._memory_put(key, vector)
+            if self._db is not None:
+                try:
+                    self._disk_put(key, vector)
+                except (sqlite3.Error, OSError, ValueError) as e:
+                    logger.error(f"Failed to persist embedding: {e}")
+
+    def hit_rate(self) -> float:
+        """
+        Share of lookups answered from either tier.
+
+        Returns:
+            Hits divided by lookups, 0 before the first lookup
+        """
+        hits: float = self.metrics.get("embedding_cache_hits", tier="memory") + self.metrics.get("embedding_cache_hits", tier="disk")
+        lookups: float = hits + self.metrics.get("embedding_cache_misses")
+        return hits / lookups if lookups else 0.0
+
+    def clear(self) -> None:
+        """
+        Drop every cached embedding, in memory and on disk.
+        """
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._reset_disk()
+
+    def close(self) -> None:
+        """
+        Flush the vector file and close the index.
+        """
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+                self._vectors = None
+            if self._db is not None:
+                if self._dim is not None:
+                    self._save_meta()
+                self._db.close()
+                self._db = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._db is None:
+                return len(self._memory)
+            return self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def _memory_put(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str) -> Optional[np.ndarray]:
+        if self._db is None or self._vectors is None:
+            return None
+        row = self._db.execute("SELECT row FROM embeddings WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return np.array(self._vectors[row[0]])
+
+    def _disk_put(self, key: str, vector: np.ndarray) -> None:
+        if self._dim is None:
+            self._dim = len(vector)
+            self._save_meta()
+        if len(vector) != self._dim:
+            raise ValueError(f"Embedding size {len(vector)} does not match the store's {self._dim}")
+        if self._db.execute("SELECT 1 FROM embeddings WHERE key = ?", (key,)).fetchone():
+            return
+
+        row: int = self._next_row % self.max_disk_entries
+        self._ensure_capacity(row + 1)
+        self._vectors[row] = vector
+        with self._db:
+            # Overwrites the oldest entry once the ring buffer is full
+            self._db.execute("DELETE FROM embeddings WHERE row = ?", (row,))
+            self._db.execute("INSERT INTO embeddings (key, row) VALUES (?, ?)", (key, row))
+        self._next_row += 1
+        if self._next_row % 256 == 0:
+            self._save_meta()
+
+    def _ensure_capacity(self, rows: int) -> None:
+        capacity: int = self._vectors.shape[0] if self._vectors is not None else 0
+        if rows <= capacity:
+            return
+        capacity = min(max(rows, capacity * 2, 1024), self.max_disk_entries)
+        if self._vectors is not None:
+            self._vectors.flush()
+        file_path: str = self._vectors_path()
+        with open(file_path, "ab") as f:
+            f.truncate(capacity * self._dim * 4)
+        self._vectors = np.memmap(file_path, dtype=np.float32, mode="r+", shape=(capacity, self._dim))
+
+    def _vectors_path(self) -> str:
+        return os.path.join(self.path, "vectors.f32")
+
+    def _meta_path(self) -> str:
+        return os.path.join(self.path, "meta.json")
+
+    def _load_meta(self) -> None:
+        try:
+            with open(self._meta_path(), encoding="utf-8") as f:
+                meta: dict = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+
+        if meta.get("model") != self.model_name or not meta.get("dim"):
+            if meta:
+                logger.info(f"Embedding model changed from {meta.get('model')} to {self.model_name}, clearing the embedding cache")
+            self._reset_disk()
+            return
+
+        self._dim = int(meta["dim"])
+        # The saved position may lag behind; continue after the highest stored row
+        last_row = self._db.execute("SELECT MAX(row) FROM embeddings").fetchone()[0]
+        self._next_row = max(int(meta.get("next_row", 0)), -1 if last_row is None else last_row + 1)
+        size: int = os.path.getsize(self._vectors_path()) if os.path.exists(self._vectors_path()) else 0
+        rows: int = size // (self._dim * 4)
+        if rows:
+            self._vectors = np.memmap(self._vectors_path(), dtype=np.float32, mode="r+", shape=(rows, self._dim))
+
+    def _save_meta(self) -> None:
+        with open(self._meta_path(), "w", encoding="utf-8") as f:
+            json.dump({"model": self.model_name, "dim": self._dim, "next_row": self._next_row}, f)
+
+    def _reset_disk(self) -> None:
+        self._vectors = None
+        self._dim = None
+        self._next_row = 0
+        with self._db:
+            self._db.execute("DELETE FROM embeddings")
+        if os.path.exists(self._vectors_path()):
+            os.remove(self._vectors_path())
+        if os.path.exists(self._meta_path()):
+            os.remove(self._meta_path())
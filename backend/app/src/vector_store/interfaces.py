@@ -2,11 +2,27 @@
 Vector store interfaces module for the TaskGPT application.
 
 This module defines abstract base classes for vector store operations
-including adding, searching, and removing task embeddings.
+including adding, searching, and removing task embeddings, in blocking
+and asyncio flavours.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, NamedTuple, Optional
+
+class TaskVector(NamedTuple):
+    """
+    A task to store in a vector store.
+
+    Attributes:
+        task_id: ID of the task
+        title: Title of the task for embedding
+        user_id: ID of the user who owns the task
+        due_date: Optional due date in string format
+    """
+    task_id: int
+    title: str
+    user_id: int
+    due_date: Optional[str] = None
 
 class SearchableVectorStore(ABC):
     """
@@ -61,3 +77,99 @@ class EditableVectorStore(ABC):
             user_id: ID of the user who owns the task
         """
         pass
+    
+    @abstractmethod
+    def add_many(self, tasks: List[TaskVector]) -> None:
+        """
+        Add several task embeddings to the vector store in bulk.
+        
+        Args:
+            tasks: Tasks to embed and store
+        """
+        pass
+    
+    @abstractmethod
+    def remove_many(self, task_ids: List[int], user_id: int) -> None:
+        """
+        Remove several task embeddings of a user from the vector store in bulk.
+        
+        Args:
+            task_ids: IDs of the tasks to remove
+            user_id: ID of the user who owns the tasks
+        """
+        pass
+
+class AsyncSearchableVectorStore(ABC):
+    """
+    Asyncio counterpart of SearchableVectorStore.
+    
+    Implementations must not block the event loop while embedding the
+    query or waiting for the vector database.
+    """
+    
+    @abstractmethod
+    async def search(self, query: str, user_id: int, top_k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Search for similar tasks using semantic similarity.
+        
+        Args:
+            query: Search query string
+            user_id: ID of the user whose tasks to search
+            top_k: Maximum number of results to return
+            
+        Returns:
+            List of search results with task information
+        """
+        pass
+
+class AsyncEditableVectorStore(ABC):
+    """
+    Asyncio counterpart of EditableVectorStore.
+    
+    Implementations must not block the event loop while embedding titles
+    or waiting for the vector database.
+    """
+    
+    @abstractmethod
+    async def add(self, task_id: int, title: str, user_id: int) -> None:
+        """
+        Add a task embedding to the vector store.
+        
+        Args:
+            task_id: ID of the task
+            title: Title of the task for embedding
+            user_id: ID of the user who owns the task
+        """
+        pass
+    
+    @abstractmethod
+    async def remove(self, task_id: int, user_id: int) -> None:
+        """
+        Remove a task embedding from the vector store.
+        
+        Args:
+            task_id: ID of the task to remove
+            user_id: ID of the user who owns the task
+        """
+        pass
+    
+    @abstractmethod
+    async def add_many(self, tasks: List[TaskVector]) -> None:
+        """
+        Add several task embeddings to the vector store in bulk.
+        
+        Args:
+            tasks: Tasks to embed and store
+        """
+        pass
+    
+    @abstractmethod
+    async def remove_many(self, task_ids: List[int], user_id: int) -> None:
+        """
+        Remove several task embeddings of a user from the vector store in bulk.
+        
+        Args:
+            task_ids: IDs of the tasks to remove
+            user_id: ID of the user who owns the tasks
+        """
+        pass
@@ -0,0 +1,276 @@
+"""
+In-process vector store module for single-node deployments.
+
+This module contains the NumpyVectorStore class, which keeps each user's
+task embeddings in a contiguous float32 matrix instead of a Qdrant
+collection. A search is one matrix-vector product over the user's rows
+followed by argpartition, which for a few hundred or thousand tasks per
+user is faster than a round trip to Qdrant. Matrices can be persisted to
+memory-mapped files, with the task payloads in a JSON sidecar per user.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from qdrant_client.http.models import ScoredPoint
+
+from src.utils.logger import logger
+from .interfaces import EditableVectorStore, SearchableVectorStore, TaskVector
+from .task_vector_store import task_payload
+from .text_embedder import TextEmbedder
+
+# Rows allocated for a new user; the matrix doubles when it is full
+INITIAL_CAPACITY: int = 64
+
+
+class _UserIndex:
+    """
+    Embeddings and payloads of one user's tasks.
+
+    Rows 0..size-1 of vectors hold unit-length embeddings; ids and payloads
+    are aligned with them, and rows[task_id] is the row of a task.
+    version counts the changes; saved is the version the sidecar on disk holds.
+    """
+
+    def __init__(self, dim: int, vectors: Optional[np.ndarray] = None) -> None:
+        self.dim: int = dim
+        self.vectors: np.ndarray = vectors if vectors is not None else np.zeros((INITIAL_CAPACITY, dim), dtype=np.float32)
+        self.size: int = 0
+        self.ids: List[int] = []
+        self.payloads: List[Dict[str, Any]] = []
+        self.rows: Dict[int, int] = {}
+        self.version: int = 0
+        self.saved: int = 0
+        self.save_lock: threading.Lock = threading.Lock()
+
+
+class NumpyVectorStore(SearchableVectorStore, EditableVectorStore):
+    """
+    A vector store for task data kept in per-user NumPy matrices.
+
+    Attributes:
+        embedder: Embedding utility for task titles
+        path: Directory the matrices are persisted to, or None to keep them in memory only
+    """
+
+    def __init__(self, embedder: TextEmbedder, path: Optional[str] = None) -> None:
+        """
+        Initialize the store, loading the users persisted under path.
+
+        Args:
+            embedder: Embedding utility for task titles
+            path: Directory the matrices are persisted to, or None to keep them in memory only
+        """
+        self.embedder: TextEmbedder = embedder
+        self.path: Optional[str] = path
+        self._lock: threading.Lock = threading.Lock()
+        self._users: Dict[int, _UserIndex] = {}
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+            for name in os.listdir(path):
+                if name.startswith("user_") and name.endswith(".json"):
+                    self._load(int(name[len("user_"):-len(".json")]))
+
+    def add(self, task_id: int, title: str, user_id: int, due_date: Optional[str] = None) -> None:
+        """
+        Adds a task vector, replacing the task's previous one.
+
+        Args:
+            task_id: Unique ID of the task
+            title: Title of the task to be embedded
+            user_id: ID of the user who owns the task
+            due_date: Optional due date in string format
+        """
+        self.add_many([TaskVector(task_id, title, user_id, due_date)])
+        logger.debug(f"Vector stored for task_id={task_id}, user_id={user_id}, title='{title}'")
+
+    def add_many(self, tasks: List[TaskVector]) -> None:
+        """
+        Adds several task vectors, embedding the titles in one batch.
+
+        Args:
+            tasks: Tasks to embed and store
+        """
+        if not tasks:
+            return
+        vectors: np.ndarray = _normalize(np.asarray(self.embedder.embed_many([task.title for task in tasks]), dtype=np.float32))
+
+        with self._lock:
+            touched: Dict[int, _UserIndex] = {}
+            for task, vector in zip(tasks, vectors):
+                index: _UserIndex = self._index(task.user_id, len(vector))
+                row: Optional[int] = index.rows.get(task.task_id)
+                if row is None:
+                    row = index.size
+                    self._reserve(task.user_id, index, row + 1)
+                    index.size += 1
+                    index.ids.append(task.task_id)
+                    index.payloads.append({})
+                    index.rows[task.task_id] = row
+                index.vectors[row] = vector
+                index.payloads[row] = task_payload(task)
+                touched[task.user_id] = index
+            snapshots = [(user_id, self._snapshot(index)) for user_id, index in touched.items()]
+        for user_id, snapshot in snapshots:
+            self._save(user_id, snapshot)
+
+    def search(self, query: str, user_id: int, top_k: int = 5) -> List[ScoredPoint]:
+        """
+        Searches for the top-k most relevant tasks for a given query and user.
+
+        Args:
+            query: Text to search against stored task titles
+            user_id: ID of the user to restrict the search to
+            top_k: Maximum number of results to return
+
+        Returns:
+            Top matching tasks, best first, with the same fields as Qdrant results
+        """
+        vector: np.ndarray = _normalize(np.asarray(self.embedder.embed(query), dtype=np.float32)[None, :])[0]
+        with self._lock:
+            index: Optional[_UserIndex] = self._users.get(user_id)
+            if index is None or index.size == 0:
+                return []
+            scores: np.ndarray = index.vectors[:index.size] @ vector
+            k: int = min(top_k, index.size)
+            # Partial selection of the k best rows, then sort only those
+            best: np.ndarray = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+            results: List[ScoredPoint] = [
+                ScoredPoint(id=index.ids[row], version=0, score=float(scores[row]), payload=dict(index.payloads[row]))
+                for row in best
+            ]
+
+        logger.debug(f"Search completed: query='{query}', top_k={top_k}, user_id={user_id}, results={len(results)}")
+        return results
+
+    def remove(self, task_id: int, user_id: int) -> None:
+        """
+        Removes a task vector.
+
+        Args:
+            task_id: ID of the task to remove
+            user_id: ID of the user who owns the task
+        """
+        self.remove_many([task_id], user_id)
+
+    def remove_many(self, task_ids: List[int], user_id: int) -> None:
+        """
+        Removes several task vectors of a user.
+
+        Args:
+            task_ids: IDs of the tasks to remove
+            user_id: ID of the user who owns the tasks
+        """
+        with self._lock:
+            index: Optional[_UserIndex] = self._users.get(user_id)
+            if index is None:
+                return
+            removed: bool = False
+            for task_id in task_ids:
+                row: Optional[int] = index.rows.pop(task_id, None)
+                if row is None:
+                    continue
+                # Move the last row into the hole so the matrix stays contiguous
+                last: int = index.size - 1
+                if row != last:
+                    index.vectors[row] = index.vectors[last]
+                    index.ids[row] = index.ids[last]
+                    index.payloads[row] = index.payloads[last]
+                    index.rows[index.ids[row]] = row
+                index.ids.pop()
+                index.payloads.pop()
+                index.size = last
+                removed = True
+            if not removed:
+                return
+            snapshot = self._snapshot(index)
+        self._save(user_id, snapshot)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(index.size for index in self._users.values())
+
+    def _index(self, user_id: int, dim: int) -> _UserIndex:
+        index: Optional[_UserIndex] = self._users.get(user_id)
+        if index is None:
+            index = _UserIndex(dim, self._open(user_id, dim, INITIAL_CAPACITY))
+            self._users[user_id] = index
+        if index.dim != dim:
+            raise ValueError(f"Embedding size {dim} does not match the store's {index.dim}")
+        return index
+
+    def _reserve(self, user_id: int, index: _UserIndex, rows: int) -> None:
+        capacity: int = index.vectors.shape[0]
+        if rows <= capacity:
+            return
+        while capacity < rows:
+            capacity *= 2
+        if isinstance(index.vectors, np.memmap):
+            index.vectors.flush()
+        grown: Optional[np.ndarray] = self._open(user_id, index.dim, capacity)
+        if grown is None:
+            grown = np.zeros((capacity, index.dim), dtype=np.float32)
+            grown[:index.size] = index.vectors[:index.size]
+        # A memory-mapped file keeps its rows when it is extended
+        index.vectors = grown
+
+    def _open(self, user_id: int, dim: int, capacity: int) -> Optional[np.ndarray]:
+        if not self.path:
+            return None
+        file_path: str = self._file(user_id, "f32")
+        with open(file_path, "ab") as f:
+            if f.tell() < capacity * dim * 4:
+                f.truncate(capacity * dim * 4)
+        rows: int = os.path.getsize(file_path) // (dim * 4)
+        return np.memmap(file_path, dtype=np.float32, mode="r+", shape=(rows, dim))
+
+    def _load(self, user_id: int) -> None:
+        try:
+            with open(self._file(user_id, "json"), encoding="utf-8") as f:
+                meta: Dict[str, Any] = json.load(f)
+            index: _UserIndex = _UserIndex(meta["dim"], self._open(user_id, meta["dim"], INITIAL_CAPACITY))
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Failed to load vectors of user {user_id}: {e}")
+            return
+        index.ids = [int(task_id) for task_id in meta["ids"]]
+        index.payloads = meta["payloads"]
+        index.size = len(index.ids)
+        index.rows = {task_id: row for row, task_id in enumerate(index.ids)}
+        self._users[user_id] = index
+
+    def _snapshot(self, index: _UserIndex) -> Tuple[_UserIndex, int, Dict[str, Any]]:
+        # Taken under _lock; the lists are copied so the sidecar is written without it
+        index.version += 1
+        if not self.path:
+            return index, index.version, {}
+        return index, index.version, {"dim": index.dim, "ids": list(index.ids), "payloads": list(index.payloads)}
+
+    def _save(self, user_id: int, snapshot: Tuple[_UserIndex, int, Dict[str, Any]]) -> None:
+        if not self.path:
+            return
+        index, version, meta = snapshot
+        # Searches and other users' writes go on meanwhile; saves of one user are ordered by version
+        with index.save_lock:
+            if version <= index.saved:
+                return
+            vectors: np.ndarray = index.vectors
+            if isinstance(vectors, np.memmap):
+                vectors.flush()
+            temporary: str = f"{self._file(user_id, 'json')}.tmp"
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(temporary, self._file(user_id, "json"))
+            index.saved = version
+
+    def _file(self, user_id: int, extension: str) -> str:
+        return os.path.join(self.path, f"user_{user_id}.{extension}")
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms: np.ndarray = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
@@ -1,35 +1,209 @@
 import os
+from typing import Any, Dict, NamedTuple, Optional
+
 from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, VectorParams
+from qdrant_client.http.models import (
+    Disabled,
+    Distance,
+    Filter,
+    HnswConfigDiff,
+    IntegerIndexParams,
+    IntegerIndexType,
+    IsEmptyCondition,
+    KeywordIndexParams,
+    KeywordIndexType,
+    PayloadField,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+    VectorParamsDiff,
+)
 
-def _ensure_collection(client: QdrantClient, collection_name: str, vector_size: int, reset: bool):
-    collections = [c.name for c in client.get_collections().collections]
+from src.utils.logger import logger
 
-    if collection_name not in collections:
-        client.create_collection(
-            collection_name=collection_name,
-            vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
-        )             
-        
-    elif collection_name not in collections:
-        client.recreate_collection(
+# Every search filters on user and every delete on user and task_id, by exact match only
+PAYLOAD_INDEXES: Dict[str, IntegerIndexParams] = {
+    "user": IntegerIndexParams(type=IntegerIndexType.INTEGER, lookup=True, range=False),
+    "task_id": IntegerIndexParams(type=IntegerIndexType.INTEGER, lookup=True, range=False),
+}
+
+# Keyword copy of the user ID; only keyword fields can be tenant keys
+TENANT_FIELD: str = "tenant"
+
+
+class CollectionConfig(NamedTuple):
+    """
+    Index and storage settings of the task collection.
+
+    Attributes:
+        hnsw_m: Edges per node of the HNSW graph
+        hnsw_ef_construct: Neighbours considered while building the graph
+        search_ef: Neighbours considered per search, or None for the server default
+        quantization: Keep int8 copies of the vectors in RAM and the originals on disk
+        quantile: Share of values the int8 range covers, clipping outliers
+        oversampling: Candidates fetched per result with the int8 vectors before rescoring with the originals
+        tenants: Partition the collection by user: the tenant key is indexed as such, and instead of
+            one HNSW graph over all points, each user gets a graph of their own with hnsw_m edges per node
+    """
+    hnsw_m: int = 16
+    hnsw_ef_construct: int = 100
+    search_ef: Optional[int] = None
+    quantization: bool = False
+    quantile: float = 0.99
+    oversampling: float = 2.0
+    tenants: bool = False
+
+    @classmethod
+    def from_env(cls) -> "CollectionConfig":
+        """
+        Build the settings from QDRANT_* environment variables, using defaults for unset ones.
+        """
+        search_ef: str = os.getenv("QDRANT_SEARCH_EF", "")
+        return cls(
+            hnsw_m=int(os.getenv("QDRANT_HNSW_M", 16)),
+            hnsw_ef_construct=int(os.getenv("QDRANT_HNSW_EF_CONSTRUCT", 100)),
+            search_ef=int(search_ef) if search_ef else None,
+            quantization=os.getenv("QDRANT_QUANTIZATION", "none").lower() == "int8",
+            quantile=float(os.getenv("QDRANT_QUANTIZATION_QUANTILE", 0.99)),
+            oversampling=float(os.getenv("QDRANT_QUANTIZATION_OVERSAMPLING", 2.0)),
+            tenants=os.getenv("QDRANT_LAYOUT", "shared").lower() == "tenants",
+        )
+
+    def search_params(self) -> Optional[SearchParams]:
+        """
+        Parameters of a search of the collection, or None when the server defaults apply.
+        """
+        if self.search_ef is None and not self.quantization:
+            return None
+        return SearchParams(
+            hnsw_ef=self.search_ef,
+            quantization=QuantizationSearchParams(rescore=True, oversampling=self.oversampling) if self.quantization else None,
+        )
+
+
+def _quantization(config: CollectionConfig) -> Optional[ScalarQuantization]:
+    if not config.quantization:
+        return None
+    return ScalarQuantization(
+        scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=config.quantile, always_ram=True)
+    )
+
+
+def _hnsw(config: CollectionConfig) -> HnswConfigDiff:
+    if config.tenants:
+        # m=0 skips the global graph; payload_m builds one per value of the tenant key
+        return HnswConfigDiff(m=0, payload_m=config.hnsw_m, ef_construct=config.hnsw_ef_construct)
+    return HnswConfigDiff(m=config.hnsw_m, ef_construct=config.hnsw_ef_construct)
+
+
+def _payload_indexes(config: CollectionConfig) -> Dict[str, Any]:
+    if not config.tenants:
+        return PAYLOAD_INDEXES
+    return {**PAYLOAD_INDEXES, TENANT_FIELD: KeywordIndexParams(type=KeywordIndexType.KEYWORD, is_tenant=True)}
+
+
+def _index_matches(existing: Any, schema: Any) -> bool:
+    if existing is None or existing.data_type.value != schema.type.value:
+        return False
+    return bool(getattr(existing.params, "is_tenant", False)) == bool(getattr(schema, "is_tenant", False))
+
+
+def create_task_collection(client: QdrantClient, collection_name: str, vector_size: int, config: CollectionConfig):
+    client.create_collection(
+        collection_name=collection_name,
+        # With quantization the int8 copies are searched in RAM and the originals only read to rescore
+        vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE, on_disk=config.quantization),
+        hnsw_config=_hnsw(config),
+        quantization_config=_quantization(config),
+    )
+    for field, schema in _payload_indexes(config).items():
+        client.create_payload_index(collection_name=collection_name, field_name=field, field_schema=schema)
+
+
+def _reconcile_collection(client: QdrantClient, collection_name: str, config: CollectionConfig):
+    info = client.get_collection(collection_name)
+    changes = {}
+
+    hnsw, wanted = info.config.hnsw_config, _hnsw(config)
+    if (hnsw.m, hnsw.ef_construct, hnsw.payload_m) != (wanted.m, wanted.ef_construct, wanted.payload_m):
+        changes["hnsw_config"] = wanted
+    if info.config.quantization_config != _quantization(config):
+        changes["quantization_config"] = _quantization(config) or Disabled.DISABLED
+    vectors = info.config.params.vectors
+    if isinstance(vectors, VectorParams) and bool(vectors.on_disk) != config.quantization:
+        changes["vectors_config"] = {"": VectorParamsDiff(on_disk=config.quantization)}
+
+    if changes:
+        # The server rebuilds the affected segments in the background; searches keep working meanwhile
+        client.update_collection(collection_name=collection_name, **changes)
+        logger.info(f"Updated {', '.join(changes)} of collection {collection_name}")
+
+    for field, schema in _payload_indexes(config).items():
+        existing = info.payload_schema.get(field)
+        if _index_matches(existing, schema):
+            continue
+        if existing is not None:
+            client.delete_payload_index(collection_name=collection_name, field_name=field)
+        client.create_payload_index(collection_name=collection_name, field_name=field, field_schema=schema)
+        logger.info(f"Created payload index on {field} of collection {collection_name}")
+
+    if config.tenants and TENANT_FIELD not in info.payload_schema:
+        untagged: int = client.count(
             collection_name=collection_name,
-            vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
-        )             
+            count_filter=Filter(must=[IsEmptyCondition(is_empty=PayloadField(key=TENANT_FIELD))]),
+            exact=True
+        ).count
+        if untagged:
+            # Searches match on the tenant key, which points written by the shared layout lack
+            logger.warning(
+                f"{untagged} points of collection {collection_name} have no {TENANT_FIELD} key and will not be found; "
+                f"migrate them with `python -m src.reindex --copy`"
+            )
+
+
+def _ensure_collection(
+        client: QdrantClient,
+        collection_name: str,
+        vector_size: int,
+        reset: bool,
+        config: Optional[CollectionConfig] = None
+    ):
+    config = config or CollectionConfig()
+    collections = [c.name for c in client.get_collections().collections]
+    # After a reindex the name is an alias of the rebuilt collection
+    aliases = {a.alias_name: a.collection_name for a in client.get_aliases().aliases}
+    target = aliases.get(collection_name, collection_name)
+
+    if reset and target in collections:
+        # Deleting the collection behind an alias drops the alias too, so the name is free again
+        client.delete_collection(collection_name=target)
+        target = collection_name
+    elif target in collections:
+        _reconcile_collection(client, target, config)
+        return
+
+    create_task_collection(client, target, vector_size, config)
 
 def get_qdrant_client(
-        host=None,  
-        port=6333, 
-        collection_name="tasks", 
-        vector_size=384, 
-        reset=False
+        host=None,
+        port=6333,
+        collection_name="tasks",
+        vector_size=384,
+        reset=False,
+        config: Optional[CollectionConfig] = None
     ) -> QdrantClient:
 
     host = host or os.getenv("QDRANT_HOST", "localhost")
     client = QdrantClient(host=host, port=port)
-    _ensure_collection(client, collection_name, vector_size, reset)
-    return client        
+    _ensure_collection(client, collection_name, vector_size, reset, config)
+    return client
 
 # This file connects to a running Qdrant instance, ensures the "tasks" collection exists,
 # and sets it up to accept 384-dimensional vectors with cosine similarity (same as sentence-transformers model output).
-# Use `reset=True` only in development/testing to forcibly recreate the collection.
\ No newline at end of file
+# The user and task_id payload fields are indexed, and existing collections are brought in line with the CollectionConfig.
+# QDRANT_LAYOUT=tenants partitions the collection by user; an existing shared collection is migrated with
+# `python -m src.reindex --copy` before the app is started with that setting.
+# Use `reset=True` only in development/testing to forcibly recreate the collection.
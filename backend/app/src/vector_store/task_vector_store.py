@@ -1,9 +1,55 @@
-from qdrant_client.http.models import PointStruct, Filter, FieldCondition, MatchValue
+from qdrant_client.http.models import PointStruct, PointIdsList, Filter, FieldCondition, MatchValue
 from qdrant_client import QdrantClient
 from .text_embedder import TextEmbedder
-from .interfaces import EditableVectorStore, SearchableVectorStore 
+from .interfaces import EditableVectorStore, SearchableVectorStore, TaskVector
+from .qdrant_client import TENANT_FIELD, CollectionConfig
 from src.utils.logger import logger
-from typing import Optional
+from typing import List, Optional
+
+def task_payload(task: TaskVector) -> dict:
+    """
+    Builds the payload stored with a task's vector.
+    """
+    payload = {
+    "task_id": task.task_id,
+    "title": task.title,
+    "user": task.user_id
+    }
+
+    if task.due_date: 
+        payload["due_date"] = task.due_date
+
+    return payload
+
+def task_point(task: TaskVector, vector: List[float]) -> PointStruct:
+    """
+    Builds the Qdrant point of a task, with its IDs and due date as payload.
+
+    The user ID is also stored as a keyword, the tenant key of the tenant-partitioned layout.
+    """
+    return PointStruct(
+        id = task.task_id, 
+        vector=vector,
+        payload={**task_payload(task), TENANT_FIELD: str(task.user_id)}
+    )
+
+def user_filter(user_id: int, tenants: bool = False) -> Filter:
+    """
+    Builds the filter restricting a search to the tasks of one user.
+
+    With tenants, the filter matches the tenant key of the tenant-partitioned layout.
+    """
+    if tenants:
+        # Matching on the tenant key lets Qdrant search only that user's graph and segments
+        condition = FieldCondition(key=TENANT_FIELD, match=MatchValue(value=str(user_id)))
+    else:
+        condition = FieldCondition(key="user", match=MatchValue(value=user_id))
+    return Filter(
+        must=[
+            condition
+        ]
+    )
+
 class TaskVectorStore(SearchableVectorStore, EditableVectorStore):
     """
     A vector store for task data using Qdrant and text embedding.
@@ -16,11 +62,22 @@ class TaskVectorStore(SearchableVectorStore, EditableVectorStore):
         client (QdrantClient): Qdrant client for vector database operations.
         embedder (TextEmbedder): Embedding utility for task titles.
         collection_name (str): The name of the Qdrant collection to use.
+        batch_size (int): Number of points sent per upsert or delete request by the bulk methods.
+        config (CollectionConfig): Layout and search settings of the collection.
     """
-    def __init__(self, client: QdrantClient, embedder: TextEmbedder, collection_name: str ="tasks"):
+    def __init__(
+        self,
+        client: QdrantClient,
+        embedder: TextEmbedder,
+        collection_name: str ="tasks",
+        batch_size: int = 256,
+        config: Optional[CollectionConfig] = None
+    ):
         self.client = client
         self.embedder = embedder
         self.collection_name = collection_name
+        self.batch_size = batch_size
+        self.config = config or CollectionConfig()
 
     def add(self, task_id: int, title: str, user_id: int, due_date: Optional[str]=None):
         """
@@ -34,21 +91,8 @@ class TaskVectorStore(SearchableVectorStore, EditableVectorStore):
         """
         vector = self.embedder.embed(title)
         logger.debug(f"Storing vector for task_id={task_id}, title='{title}', user_id={user_id}")
-        
-        payload = {
-        "task_id": task_id,
-        "title": title,
-        "user": user_id
-        }
-
-        if due_date: 
-            payload["due_date"] = due_date
-
-        point = PointStruct(
-            id = task_id, 
-            vector=vector,
-            payload=payload
-        )
+
+        point = task_point(TaskVector(task_id, title, user_id, due_date), vector)
 
         self.client.upsert(
             collection_name=self.collection_name, 
@@ -56,6 +100,28 @@ class TaskVectorStore(SearchableVectorStore, EditableVectorStore):
         )
         logger.info(f"Vector upserted for task_id={task_id}, user_id={user_id}, title='{title}', due_date={due_date}")
 
+    def add_many(self, tasks: List[TaskVector]):
+        """
+        Adds several task vectors to the collection.
+
+        Titles are embedded in batches and the points are upserted in chunks
+        of batch_size, so a backfill costs a few requests instead of one per task.
+
+        Args:
+            tasks (List[TaskVector]): Tasks to embed and store.
+        """
+        if not tasks:
+            return
+
+        vectors = self.embedder.embed_many([task.title for task in tasks])
+        points = [task_point(task, vector) for task, vector in zip(tasks, vectors)]
+
+        for start in range(0, len(points), self.batch_size):
+            self.client.upsert(
+                collection_name=self.collection_name,
+                points=points[start:start + self.batch_size]
+            )
+        logger.info(f"Vectors upserted for {len(points)} tasks in {-(-len(points) // self.batch_size)} requests")
 
     def search(self, query: str, user_id: int, top_k: int = 5):
         """
@@ -72,19 +138,11 @@ class TaskVectorStore(SearchableVectorStore, EditableVectorStore):
         logger.debug(f"Embedding and searching for query='{query}' (user_id={user_id})")
         vector = self.embedder.embed(query)
 
-        user_filter = Filter(
-            must=[
-                FieldCondition(
-                    key="user",
-                    match=MatchValue(value=user_id)
-                )
-            ]
-        ) 
-
         results = self.client.search(
             collection_name = self.collection_name,
             query_vector=vector,
-            query_filter=user_filter,
+            query_filter=user_filter(user_id, self.config.tenants),
+            search_params=self.config.search_params(),
             limit=top_k
         ) 
 
@@ -93,24 +151,32 @@ class TaskVectorStore(SearchableVectorStore, EditableVectorStore):
 
     def remove(self, task_id: int, user_id: int):
         """
-        Removes a task vector from the collection based on task and user ID.
+        Removes a task vector from the collection by its point ID, the task ID.
 
         Args:
             task_id (int): ID of the task to remove.
             user_id (int): ID of the user who owns the task.
         """
+        # Point IDs are the task IDs the API assigns, unique across users, so no filter scan is needed
         self.client.delete(
             collection_name=self.collection_name,
-            points_selector=Filter(
-                must=[
-                    FieldCondition(key="task_id", match=MatchValue(value=task_id)),
-                    FieldCondition(key="user", match=MatchValue(value=user_id))
-                ]
-            )
+            points_selector=PointIdsList(points=[task_id])
         )
 
         logger.debug(f"Task removal issued for task_id={task_id}, user_id={user_id}")
 
+    def remove_many(self, task_ids: List[int], user_id: int):
+        """
+        Removes several task vectors of a user from the collection.
 
-        
+        Args:
+            task_ids (List[int]): IDs of the tasks to remove.
+            user_id (int): ID of the user who owns the tasks.
+        """
+        for start in range(0, len(task_ids), self.batch_size):
+            self.client.delete(
+                collection_name=self.collection_name,
+                points_selector=PointIdsList(points=task_ids[start:start + self.batch_size])
+            )
 
+        logger.debug(f"Removal issued for {len(task_ids)} tasks of user_id={user_id}")
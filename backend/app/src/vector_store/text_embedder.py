@@ -1,12 +1,121 @@
-from sentence_transformers import SentenceTransformer
+import os
+import platform
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Optional
+
+import numpy as np
+
+from src.utils.logger import logger
+from src.utils.metrics import MetricsRegistry
+from .embedding_cache import EmbeddingCache
+
+# Embedding backends: full-precision PyTorch, or an int8-quantized ONNX export run by ONNX Runtime
+BACKENDS = ("torch", "onnx-int8")
+
+def default_onnx_file() -> str:
+    # Quantized exports shipped in the sentence-transformers model repositories, per CPU family
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return "onnx/model_qint8_arm64.onnx"
+    return "onnx/model_quint8_avx2.onnx"
+
+def load_model(model_name: str, backend: str = "torch", onnx_file: Optional[str] = None) -> Any:
+    # Imported here: torch and sentence_transformers take seconds to import
+    from sentence_transformers import SentenceTransformer
+    if backend == "onnx-int8":
+        return SentenceTransformer(
+            model_name,
+            backend="onnx",
+            model_kwargs={"file_name": onnx_file or default_onnx_file(), "provider": "CPUExecutionProvider"}
+        )
+    return SentenceTransformer(model_name)
 
 class TextEmbedder:
-    def __init__(self, model_name = "all-MiniLM-L6-v2"):
-        self.model = SentenceTransformer(model_name)
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        cache_dir: Optional[str] = None,
+        cache_size: int = 4096,
+        batch_size: int = 64,
+        backend: str = "torch",
+        onnx_file: Optional[str] = None,
+        metrics: Optional[MetricsRegistry] = None
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown embedding backend {backend!r}, expected one of {', '.join(BACKENDS)}")
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.backend = backend
+        self.onnx_file = (onnx_file or default_onnx_file()) if backend == "onnx-int8" else None
+        self._loaded: Optional[Future] = None
+        self._load_lock = threading.Lock()
+        # Titles and queries repeat across add, edit and search; keyed by model so a model change misses.
+        # Quantized vectors differ slightly from full-precision ones, so each backend has its own entries.
+        cache_key = model_name if backend == "torch" else f"{model_name}@{self.onnx_file}"
+        self.cache = EmbeddingCache(cache_key, path=cache_dir, max_memory_entries=cache_size, metrics=metrics)
+
+    @classmethod
+    def from_env(cls, metrics: Optional[MetricsRegistry] = None, cache_dir: Optional[str] = None) -> "TextEmbedder":
+        # EMBEDDING_BACKEND selects torch (default) or onnx-int8, EMBEDDING_ONNX_FILE overrides the quantized file.
+        # EMBEDDING_CACHE_DIR overrides cache_dir; set empty, or with neither set, the cache stays in memory.
+        return cls(
+            model_name=os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2"),
+            cache_dir=os.getenv("EMBEDDING_CACHE_DIR", cache_dir or "") or None,
+            batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", "64")),
+            backend=os.getenv("EMBEDDING_BACKEND", "torch"),
+            onnx_file=os.getenv("EMBEDDING_ONNX_FILE") or None,
+            metrics=metrics
+        )
+
+    def warm_up(self) -> Future:
+        # Starts loading the model on a background thread, once; the future holds the model
+        with self._load_lock:
+            if self._loaded is None:
+                self._loaded = Future()
+                threading.Thread(target=self._load, name="embedder-warm-up", daemon=True).start()
+            return self._loaded
+
+    @property
+    def ready(self) -> bool:
+        return self._loaded is not None and self._loaded.done() and self._loaded.exception() is None
+
+    @property
+    def model(self) -> Any:
+        # Blocks until the model is loaded, loading it now if warm_up was not called
+        return self.warm_up().result()
+
+    def _load(self) -> None:
+        started = time.perf_counter()
+        try:
+            model = load_model(self.model_name, self.backend, self.onnx_file)
+        except BaseException as e:
+            logger.error(f"Failed to load embedding model {self.model_name} ({self.backend}): {e}")
+            self._loaded.set_exception(e)
+            return
+        logger.info(f"Embedding model {self.model_name} ({self.backend}) loaded in {time.perf_counter() - started:.1f}s")
+        self._loaded.set_result(model)
 
     def embed(self, text: str) -> list[float]:
-        return self.model.encode(text).tolist()    
+        vector = self.cache.get(text)
+        if vector is None:
+            vector = np.asarray(self.model.encode(text), dtype=np.float32)
+            self.cache.put(text, vector)
+        return vector.tolist()
+
+    def embed_many(self, texts: list[str], batch_size: Optional[int] = None) -> list[list[float]]:
+        vectors = [self.cache.get(text) for text in texts]
+        # Encode each missing text once, in batches of batch_size
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+        if missing:
+            encoded = np.asarray(self.model.encode(missing, batch_size=batch_size or self.batch_size), dtype=np.float32)
+            computed = dict(zip(missing, encoded))
+            for text, vector in computed.items():
+                self.cache.put(text, vector)
+            vectors = [computed[text] if vector is None else vector for text, vector in zip(texts, vectors)]
+        return [vector.tolist() for vector in vectors]
 
-# Load a sentence-transformers model.
-# Provides a function to convert a string (like task title) to a vector.
-# TODO: this TextEmbedder is from open-source i will need to check if its good
\ No newline at end of file
+# Load a sentence-transformers model, lazily or on a background thread via warm_up.
+# Provides a function to convert a string (like task title) to a vector, and a batched one for bulk writes.
+# Embeddings are cached in memory and, with cache_dir, on disk across restarts.
+# TODO: this TextEmbedder is from open-source i will need to check if its good
@@ -0,0 +1,68 @@
+"""
+Thread-pool adapter from the blocking to the asyncio vector store interfaces.
+
+This module contains the ThreadedVectorStore class, which lets the request
+handlers await a blocking vector store such as NumpyVectorStore: every
+call runs on a thread pool, so embedding a title does not stall the
+session's event loop.
+"""
+
+import asyncio
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, List, Optional, TypeVar
+
+from .interfaces import (
+    AsyncEditableVectorStore,
+    AsyncSearchableVectorStore,
+    EditableVectorStore,
+    SearchableVectorStore,
+    TaskVector,
+)
+
+T = TypeVar("T")
+
+
+class ThreadedVectorStore(AsyncSearchableVectorStore, AsyncEditableVectorStore):
+    """
+    Runs a blocking vector store's methods on a thread pool.
+
+    Attributes:
+        store: The blocking store, implementing both blocking interfaces
+        executor: Pool the calls run on
+    """
+
+    def __init__(self, store: Any, executor: Optional[Executor] = None) -> None:
+        """
+        Initialize the adapter.
+
+        Args:
+            store: Blocking store implementing SearchableVectorStore and EditableVectorStore
+            executor: Pool for the calls, a thread pool sized to the CPU count by default
+        """
+        if not isinstance(store, SearchableVectorStore) or not isinstance(store, EditableVectorStore):
+            raise TypeError(f"{type(store).__name__} is not a searchable and editable vector store")
+        self.store: Any = store
+        self.executor: Executor = executor or ThreadPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            thread_name_prefix="vector-store"
+        )
+
+    async def search(self, query: str, user_id: int, top_k: int = 5) -> List[Any]:
+        return await self._run(partial(self.store.search, query, user_id, top_k))
+
+    async def add(self, task_id: int, title: str, user_id: int, due_date: Optional[str] = None) -> None:
+        await self._run(partial(self.store.add, task_id, title, user_id, due_date))
+
+    async def remove(self, task_id: int, user_id: int) -> None:
+        await self._run(partial(self.store.remove, task_id, user_id))
+
+    async def add_many(self, tasks: List[TaskVector]) -> None:
+        await self._run(partial(self.store.add_many, tasks))
+
+    async def remove_many(self, task_ids: List[int], user_id: int) -> None:
+        await self._run(partial(self.store.remove_many, task_ids, user_id))
+
+    async def _run(self, call: Callable[[], T]) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, call)
@@ -0,0 +1,433 @@
+"""
+Write-behind queue module for task vector mutations.
+
+This module contains the WriteBehindVectorStore class, which sits between
+the request handlers and a vector store: adds and removes return as soon
+as they are journaled, and a background thread applies them to the store
+in batches. Consecutive changes to the same task are coalesced, so a task
+that is added and then edited before the next flush is embedded and
+upserted once. Pending changes are journaled in SQLite and replayed after
+a restart.
+
+A batch that keeps failing is retried up to a limit per write; past it
+the batch is split and each of its writes tried alone, and those that
+still fail are moved to a dead_letter table of the journal for
+inspection instead of holding up the queue.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from src.utils.logger import logger
+from src.utils.metrics import MetricsRegistry, metrics as default_metrics
+from .interfaces import AsyncEditableVectorStore, AsyncSearchableVectorStore, TaskVector
+
+UPSERT: str = "upsert"
+DELETE: str = "delete"
+
+
+class _PendingWrite(NamedTuple):
+    """
+    Latest unflushed change of one task.
+
+    Attributes:
+        kind: UPSERT or DELETE
+        task: The task; only task_id and user_id are meaningful for a delete
+        enqueued_at: Wall-clock time of the first change coalesced into this one
+        seq: Journal sequence number of the latest change
+        attempts: Failed flushes of this change since the queue started
+    """
+    kind: str
+    task: TaskVector
+    enqueued_at: float
+    seq: int
+    attempts: int = 0
+
+
+class WriteBehindVectorStore(AsyncSearchableVectorStore, AsyncEditableVectorStore):
+    """
+    Queues vector store mutations and applies them to the store in batches.
+
+    Changes are keyed by task ID, so only the latest one of each task is
+    written: add then edit becomes one upsert, and add then delete drops
+    the upsert and its embedding. The delete itself is kept, as an ID
+    delete, since an add cannot be told apart from an edit of a task
+    stored earlier. Searches go to the store directly and leave out tasks
+    with a pending delete; a pending add becomes searchable once flushed.
+
+    Attributes:
+        store: The vector store the changes are applied to
+        path: SQLite journal of pending changes, or None to keep them in memory only
+        batch_size: Pending changes that trigger a flush
+        max_delay: Seconds the oldest pending change waits before a flush is triggered
+        retry_delay: Seconds to wait after a failed flush before retrying
+        max_attempts: Failed flushes of a write before it is tried alone and, failing that, dead-lettered
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        path: Optional[str] = "vector_write_journal.sqlite3",
+        batch_size: int = 256,
+        max_delay: float = 0.5,
+        retry_delay: float = 2.0,
+        max_attempts: int = 30,
+        metrics: Optional[MetricsRegistry] = None
+    ) -> None:
+        """
+        Initialize the queue, reload the journaled changes and start flushing.
+
+        Args:
+            store: Vector store implementing AsyncSearchableVectorStore and AsyncEditableVectorStore
+            path: SQLite journal of pending changes, or None to keep them in memory only
+            batch_size: Pending changes that trigger a flush
+            max_delay: Seconds the oldest pending change waits before a flush is triggered
+            retry_delay: Seconds to wait after a failed flush before retrying
+            max_attempts: Failed flushes of a write before it is tried alone and, failing that, dead-lettered
+            metrics: Registry the queue depth, flush lag, coalesced and dead-lettered changes are recorded in
+        """
+        self.store: Any = store
+        self.path: Optional[str] = path
+        self.batch_size: int = batch_size
+        self.max_delay: float = max_delay
+        self.retry_delay: float = retry_delay
+        self.max_attempts: int = max_attempts
+        self.metrics: MetricsRegistry = metrics or default_metrics
+
+        self._changed: threading.Condition = threading.Condition()
+        # Serializes enqueues and guards the SQLite connection; never taken while holding _changed
+        self._journal_lock: threading.Lock = threading.Lock()
+        self._pending: Dict[int, _PendingWrite] = {}
+        self._inflight: Dict[int, _PendingWrite] = {}
+        self._seq: int = 0
+        self._closing: bool = False
+        self._db: Optional[sqlite3.Connection] = None
+
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            # Every change is committed before it is acknowledged; WAL keeps that to an append
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS pending ("
+                " task_id INTEGER PRIMARY KEY,"
+                " kind TEXT NOT NULL,"
+                " user_id INTEGER NOT NULL,"
+                " title TEXT NOT NULL,"
+                " due_date TEXT,"
+                " enqueued_at REAL NOT NULL,"
+                " seq INTEGER NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS dead_letter ("
+                " task_id INTEGER NOT NULL,"
+                " kind TEXT NOT NULL,"
+                " user_id INTEGER NOT NULL,"
+                " title TEXT NOT NULL,"
+                " due_date TEXT,"
+                " enqueued_at REAL NOT NULL,"
+                " seq INTEGER NOT NULL,"
+                " attempts INTEGER NOT NULL,"
+                " error TEXT NOT NULL,"
+                " failed_at REAL NOT NULL)"
+            )
+            self._db.commit()
+            self._replay()
+
+        self._thread: threading.Thread = threading.Thread(target=self._run, name="vector-write-behind", daemon=True)
+        self._thread.start()
+
+    async def search(self, query: str, user_id: int, top_k: int = 5) -> List[Any]:
+        """
+        Searches the store, leaving out tasks with a pending delete.
+
+        Args:
+            query: Text to search against stored task titles
+            user_id: ID of the user to restrict the search to
+            top_k: Maximum number of results to return
+
+        Returns:
+            Top matching tasks
+        """
+        results: List[Any] = await self.store.search(query, user_id, top_k)
+        with self._changed:
+            deleted = {
+                task_id for writes in (self._inflight, self._pending)
+                for task_id, write in writes.items() if write.kind == DELETE
+            }
+        return [point for point in results if point.id not in deleted]
+
+    async def add(self, task_id: int, title: str, user_id: int, due_date: Optional[str] = None) -> None:
+        """
+        Queues an upsert of a task vector.
+
+        Args:
+            task_id: Unique ID of the task
+            title: Title of the task to be embedded
+            user_id: ID of the user who owns the task
+            due_date: Optional due date in string format
+        """
+        await self._enqueue([(UPSERT, TaskVector(task_id, title, user_id, due_date))])
+
+    async def add_many(self, tasks: List[TaskVector]) -> None:
+        """
+        Queues upserts of several task vectors.
+
+        Args:
+            tasks: Tasks to embed and store
+        """
+        await self._enqueue([(UPSERT, task) for task in tasks])
+
+    async def remove(self, task_id: int, user_id: int) -> None:
+        """
+        Queues the removal of a task vector.
+
+        Args:
+            task_id: ID of the task to remove
+            user_id: ID of the user who owns the task
+        """
+        await self._enqueue([(DELETE, TaskVector(task_id, "", user_id))])
+
+    async def remove_many(self, task_ids: List[int], user_id: int) -> None:
+        """
+        Queues the removal of several task vectors of a user.
+
+        Args:
+            task_ids: IDs of the tasks to remove
+            user_id: ID of the user who owns the tasks
+        """
+        await self._enqueue([(DELETE, TaskVector(task_id, "", user_id)) for task_id in task_ids])
+
+    def pending(self) -> int:
+        """
+        Number of changes not yet applied to the store, including those being flushed.
+        """
+        with self._changed:
+            return len(self._pending) + len(self._inflight)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Flush the pending changes and stop the flusher thread.
+
+        Changes that still cannot be written stay in the journal for the next start.
+
+        Args:
+            timeout: Seconds to wait for the final flush, or None to wait until it ends
+        """
+        with self._changed:
+            self._closing = True
+            self._changed.notify_all()
+        self._thread.join(timeout)
+
+    async def close_session(self) -> None:
+        """
+        Close the store's clients bound to the running event loop, such as those of an ending chat session.
+
+        The queue keeps flushing on its own loop.
+        """
+        close = getattr(self.store, "close", None)
+        if close is not None and asyncio.iscoroutinefunction(close):
+            await close()
+
+    async def _enqueue(self, changes: List[tuple]) -> None:
+        if not changes:
+            return
+        if self._db is None:
+            self._append(changes)
+        else:
+            # The commit runs off the session's loop; the turn only waits for its own changes
+            await asyncio.to_thread(self._append, changes)
+
+    def _append(self, changes: List[tuple]) -> None:
+        now: float = time.time()
+        with self._journal_lock:
+            with self._changed:
+                # Lag is measured from the first change the write is behind on
+                first: Dict[int, float] = {
+                    task.task_id: self._pending[task.task_id].enqueued_at
+                    for _, task in changes if task.task_id in self._pending
+                }
+            writes: List[_PendingWrite] = []
+            for kind, task in changes:
+                self._seq += 1
+                writes.append(_PendingWrite(kind, task, first.setdefault(task.task_id, now), self._seq))
+            # Committed before the changes are queued, so the flusher never forgets a row yet to be written
+            self._journal(writes)
+
+            with self._changed:
+                for write in writes:
+                    previous: Optional[_PendingWrite] = self._pending.get(write.task.task_id)
+                    if previous is not None:
+                        self.metrics.increment("vector_writes_coalesced", kind=f"{previous.kind}_{write.kind}")
+                    self._pending[write.task.task_id] = write
+                self.metrics.set_gauge("vector_write_queue_depth", len(self._pending) + len(self._inflight))
+                self._changed.notify_all()
+
+    def _run(self) -> None:
+        # The flusher has its own loop, so the store's async clients are bound to it
+        loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        try:
+            while True:
+                batch: Optional[List[_PendingWrite]] = self._next_batch()
+                if batch is None:
+                    break
+                try:
+                    loop.run_until_complete(self._flush(batch))
+                except Exception as e:
+                    logger.error(f"Failed to flush {len(batch)} vector writes, retrying: {e}")
+                    self.metrics.increment("vector_write_flush_errors")
+                    exhausted: List[_PendingWrite] = self._requeue(batch)
+                    if len(exhausted) > 1:
+                        # One bad write fails the whole batch; find which ones fail on their own
+                        self._dead_letter(self._isolate(loop, exhausted))
+                    elif exhausted:
+                        self._dead_letter([(exhausted[0], str(e))])
+                    with self._changed:
+                        if self._closing:
+                            break
+                        self._changed.wait(self.retry_delay)
+            close = getattr(self.store, "close", None)
+            if close is not None and asyncio.iscoroutinefunction(close):
+                loop.run_until_complete(close())
+        finally:
+            loop.close()
+
+    def _next_batch(self) -> Optional[List[_PendingWrite]]:
+        with self._changed:
+            while True:
+                if not self._pending:
+                    if self._closing:
+                        return None
+                    self._changed.wait()
+                    continue
+                oldest: float = min(write.enqueued_at for write in self._pending.values())
+                wait: float = oldest + self.max_delay - time.time()
+                if len(self._pending) >= self.batch_size or wait <= 0 or self._closing:
+                    break
+                self._changed.wait(wait)
+
+            batch: List[_PendingWrite] = sorted(self._pending.values(), key=lambda write: write.seq)[:self.batch_size]
+            for write in batch:
+                del self._pending[write.task.task_id]
+                self._inflight[write.task.task_id] = write
+            return batch
+
+    async def _flush(self, batch: List[_PendingWrite]) -> None:
+        upserts: List[TaskVector] = [write.task for write in batch if write.kind == UPSERT]
+        deletes: Dict[int, List[int]] = defaultdict(list)
+        for write in batch:
+            if write.kind == DELETE:
+                deletes[write.task.user_id].append(write.task.task_id)
+
+        if upserts:
+            await self.store.add_many(upserts)
+        for user_id, task_ids in deletes.items():
+            await self.store.remove_many(task_ids, user_id)
+
+        now: float = time.time()
+        self._forget(batch)
+        with self._changed:
+            for write in batch:
+                del self._inflight[write.task.task_id]
+                self.metrics.observe("vector_write_flush_lag_seconds", now - write.enqueued_at)
+            self.metrics.set_gauge("vector_write_queue_depth", len(self._pending) + len(self._inflight))
+        self.metrics.increment("vector_write_flushes")
+        logger.debug(f"Flushed {len(upserts)} vector upserts and {len(batch) - len(upserts)} deletes")
+
+    def _requeue(self, batch: List[_PendingWrite]) -> List[_PendingWrite]:
+        exhausted: List[_PendingWrite] = []
+        with self._changed:
+            for write in batch:
+                # A change queued during the flush supersedes the failed one
+                if write.task.task_id in self._pending:
+                    del self._inflight[write.task.task_id]
+                    continue
+                write = write._replace(attempts=write.attempts + 1)
+                if write.attempts >= self.max_attempts:
+                    # Stays in flight until it is flushed alone or dead-lettered
+                    self._inflight[write.task.task_id] = write
+                    exhausted.append(write)
+                else:
+                    del self._inflight[write.task.task_id]
+                    self._pending[write.task.task_id] = write
+        return exhausted
+
+    def _isolate(self, loop: asyncio.AbstractEventLoop, writes: List[_PendingWrite]) -> List[Tuple[_PendingWrite, str]]:
+        failed: List[Tuple[_PendingWrite, str]] = []
+        for write in writes:
+            try:
+                loop.run_until_complete(self._flush([write]))
+            except Exception as e:
+                failed.append((write, str(e)))
+        return failed
+
+    def _dead_letter(self, failed: List[Tuple[_PendingWrite, str]]) -> None:
+        if not failed:
+            return
+        now: float = time.time()
+        if self._db is not None:
+            with self._journal_lock:
+                self._db.executemany(
+                    "INSERT INTO dead_letter (task_id, kind, user_id, title, due_date, enqueued_at, seq, attempts, error, failed_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (w.task.task_id, w.kind, w.task.user_id, w.task.title, w.task.due_date, w.enqueued_at, w.seq,
+                         w.attempts, error, now)
+                        for w, error in failed
+                    ]
+                )
+                self._db.executemany(
+                    "DELETE FROM pending WHERE task_id = ? AND seq = ?",
+                    [(write.task.task_id, write.seq) for write, _ in failed]
+                )
+                self._db.commit()
+
+        with self._changed:
+            for write, error in failed:
+                del self._inflight[write.task.task_id]
+                self.metrics.increment("vector_writes_dead_lettered", kind=write.kind)
+                logger.error(
+                    f"Giving up on vector {write.kind} of task {write.task.task_id} "
+                    f"after {write.attempts} attempts: {error}"
+                )
+            self.metrics.set_gauge("vector_write_queue_depth", len(self._pending) + len(self._inflight))
+
+    def _journal(self, writes: List[_PendingWrite]) -> None:
+        # Called with _journal_lock held
+        if self._db is None:
+            return
+        self._db.executemany(
+            "INSERT OR REPLACE INTO pending (task_id, kind, user_id, title, due_date, enqueued_at, seq)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (w.task.task_id, w.kind, w.task.user_id, w.task.title, w.task.due_date, w.enqueued_at, w.seq)
+                for w in writes
+            ]
+        )
+        self._db.commit()
+
+    def _forget(self, batch: List[_PendingWrite]) -> None:
+        if self._db is None:
+            return
+        # Rows replaced by a later change have a newer seq and are kept
+        with self._journal_lock:
+            self._db.executemany(
+                "DELETE FROM pending WHERE task_id = ? AND seq = ?",
+                [(write.task.task_id, write.seq) for write in batch]
+            )
+            self._db.commit()
+
+    def _replay(self) -> None:
+        rows = self._db.execute(
+            "SELECT task_id, kind, user_id, title, due_date, enqueued_at, seq FROM pending ORDER BY seq"
+        ).fetchall()
+        for task_id, kind, user_id, title, due_date, enqueued_at, seq in rows:
+            self._pending[task_id] = _PendingWrite(kind, TaskVector(task_id, title, user_id, due_date), enqueued_at, seq)
+            self._seq = max(self._seq, seq)
+        if rows:
+            logger.info(f"Replaying {len(rows)} journaled vector writes")
+        self.metrics.set_gauge("vector_write_queue_depth", len(self._pending))
@@ -0,0 +1,43 @@
+"""
+Per-call latency benchmark for the local date expression parser.
+
+Run from the repository root:
+    PYTHONPATH=backend/app python backend/benchmarks/bench_date_parser.py
+"""
+
+import statistics
+import time
+from datetime import date
+from typing import List
+
+from src.utils.date_parser import parse_date_expression
+
+EXPRESSIONS: List[str] = [
+    "tomorrow",
+    "next Friday",
+    "this week",
+    "2025-03-01",
+    "in two weeks",
+    "between July 10 and July 14",
+    "Buy milk the day after tomorrow",
+    "remind me to call mom on July 1st",
+    "show me my completed tasks",
+]
+
+
+def main(iterations: int = 20_000) -> None:
+    today: date = date(2025, 7, 9)
+    print(f"{'expression':<40} {'mean us':>9} {'p50 us':>9} {'p99 us':>9}")
+    for text in EXPRESSIONS:
+        samples: List[float] = []
+        for _ in range(iterations):
+            start: float = time.perf_counter()
+            parse_date_expression(text, today)
+            samples.append((time.perf_counter() - start) * 1e6)
+        samples.sort()
+        print(f"{text:<40} {statistics.fmean(samples):>9.1f} {samples[len(samples) // 2]:>9.1f} "
+              f"{samples[int(len(samples) * 0.99)]:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Latency, throughput and agreement of the TextEmbedder backends.
+
+Loads the model with the full-precision PyTorch backend and with the
+int8-quantized ONNX backend, then reports per-query latency, batched
+throughput, the cosine similarity between the two backends' embeddings
+of the same titles, and how often both pick the same nearest title for a
+query, which is what task search depends on.
+
+Needs the ONNX extra (pip install "sentence-transformers[onnx]") and
+network access to fetch the model files on first run.
+
+Run from the repository root:
+    PYTHONPATH=backend/app python backend/benchmarks/bench_embedding_backends.py --titles 2000
+"""
+
+import argparse
+import logging
+import statistics
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from bench_vector_store import titles
+from src.utils.logger import logger
+from src.vector_store.text_embedder import BACKENDS, load_model
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--onnx-file", help="quantized ONNX file in the model repository")
+    parser.add_argument("--titles", type=int, default=2_000, help="titles encoded for throughput and agreement")
+    parser.add_argument("--queries", type=int, default=200, help="single-text encodes timed for latency")
+    parser.add_argument("--batch-size", type=int, default=64)
+    args: argparse.Namespace = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+
+    corpus: List[str] = titles(args.titles)
+    queries: List[str] = corpus[:args.queries]
+    embeddings: Dict[str, np.ndarray] = {}
+
+    for backend in BACKENDS:
+        model = load_model(args.model, backend, args.onnx_file)
+        model.encode(queries[:8])
+
+        latencies: List[float] = []
+        for query in queries:
+            started: float = time.perf_counter()
+            model.encode(query)
+            latencies.append(time.perf_counter() - started)
+        latencies.sort()
+
+        started = time.perf_counter()
+        embeddings[backend] = normalize(np.asarray(model.encode(corpus, batch_size=args.batch_size), dtype=np.float32))
+        throughput: float = len(corpus) / (time.perf_counter() - started)
+
+        print(f"{backend:<10} p50={statistics.median(latencies) * 1e3:6.2f}ms "
+              f"p95={latencies[int(len(latencies) * 0.95)] * 1e3:6.2f}ms "
+              f"throughput={throughput:8.0f} texts/s")
+
+    full, quantized = embeddings["torch"], embeddings["onnx-int8"]
+    cosine: np.ndarray = np.sum(full * quantized, axis=1)
+    print(f"cosine agreement: mean={cosine.mean():.4f} min={cosine.min():.4f} p1={np.percentile(cosine, 1):.4f}")
+
+    # Nearest other title of each query under both backends
+    queried: np.ndarray = np.arange(len(queries))
+    nearest: Dict[str, np.ndarray] = {}
+    for backend, vectors in embeddings.items():
+        scores: np.ndarray = vectors[queried] @ vectors.T
+        scores[queried, queried] = -np.inf
+        nearest[backend] = scores.argmax(axis=1)
+    agreement: float = float(np.mean(nearest["torch"] == nearest["onnx-int8"]))
+    print(f"nearest-title agreement: {agreement:.1%} of {len(queries)} queries")
+
+
+if __name__ == "__main__":
+    main()
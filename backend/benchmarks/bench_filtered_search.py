@@ -0,0 +1,131 @@
+"""
+Filtered-search latency of the task collection under different index settings.
+
+Loads the same random vectors, spread over many users, into one
+collection per setting and times searches filtered to a single user, as
+TaskVectorStore.search issues them, reporting p50 and p99 latency and
+recall@k against an exact search. The settings are:
+
+    plain   no payload index, full-precision vectors in RAM (the old bootstrap)
+    indexed integer payload indexes on user and task_id
+    int8    indexed, plus int8 scalar quantization with the originals on disk
+
+Payload indexes and quantization only exist in a Qdrant server, so point
+--qdrant-host at one for meaningful numbers; the in-process client runs
+the same code as a smoke test. Loading 10M points takes a while and
+several GB of disk per setting; --settings limits the run to some of them.
+
+Run from the repository root:
+    PYTHONPATH=backend/app python backend/benchmarks/bench_filtered_search.py --qdrant-host localhost --points 10000000
+"""
+
+import argparse
+import logging
+import time
+from typing import Dict, Iterator, List
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import CollectionStatus, Distance, SearchParams, VectorParams
+
+from src.utils.logger import logger
+from src.vector_store.qdrant_client import CollectionConfig, create_task_collection
+from src.vector_store.task_vector_store import user_filter
+
+SETTINGS: Dict[str, CollectionConfig] = {
+    "plain": CollectionConfig(),
+    "indexed": CollectionConfig(),
+    "int8": CollectionConfig(quantization=True),
+}
+
+
+def vectors(count: int, dim: int, chunk: int, seed: int = 0) -> Iterator[np.ndarray]:
+    rng: np.random.Generator = np.random.default_rng(seed)
+    for start in range(0, count, chunk):
+        block: np.ndarray = rng.standard_normal((min(chunk, count - start), dim), dtype=np.float32)
+        yield block / np.linalg.norm(block, axis=1, keepdims=True)
+
+
+def load(client: QdrantClient, name: str, setting: str, args: argparse.Namespace) -> None:
+    if client.collection_exists(name):
+        client.delete_collection(name)
+    config: CollectionConfig = SETTINGS[setting]._replace(hnsw_m=args.hnsw_m, hnsw_ef_construct=args.ef_construct)
+    if setting == "plain":
+        client.create_collection(name, vectors_config=VectorParams(size=args.dim, distance=Distance.COSINE))
+    else:
+        create_task_collection(client, name, args.dim, config)
+
+    started: float = time.perf_counter()
+    for start, block in zip(range(0, args.points, args.chunk), vectors(args.points, args.dim, args.chunk)):
+        ids: List[int] = list(range(start, start + len(block)))
+        client.upload_collection(
+            collection_name=name,
+            vectors=block,
+            payload=({"task_id": i, "user": i % args.users, "title": f"task {i}"} for i in ids),
+            ids=ids,
+            batch_size=1024,
+            parallel=args.parallel
+        )
+    while client.get_collection(name).status != CollectionStatus.GREEN:
+        time.sleep(1)
+    print(f"{setting:<8} loaded and indexed {args.points} points in {time.perf_counter() - started:8.1f}s")
+
+
+def measure(client: QdrantClient, name: str, setting: str, args: argparse.Namespace) -> None:
+    rng: np.random.Generator = np.random.default_rng(1)
+    queries: np.ndarray = next(vectors(args.queries, args.dim, args.queries, seed=2))
+    users: np.ndarray = rng.integers(0, args.users, args.queries)
+    params = SETTINGS[setting]._replace(search_ef=args.ef).search_params()
+
+    latencies: List[float] = []
+    recalls: List[float] = []
+    for i, (query, user) in enumerate(zip(queries, users)):
+        started: float = time.perf_counter()
+        found = client.search(name, query_vector=query.tolist(), query_filter=user_filter(int(user)),
+                              search_params=params, limit=args.top_k)
+        latencies.append(time.perf_counter() - started)
+        if i < args.recall_queries:
+            exact = client.search(name, query_vector=query.tolist(), query_filter=user_filter(int(user)),
+                                  search_params=SearchParams(exact=True), limit=args.top_k)
+            expected = {point.id for point in exact}
+            recalls.append(len(expected & {point.id for point in found}) / max(len(expected), 1))
+    latencies.sort()
+
+    print(f"{setting:<8} p50={latencies[len(latencies) // 2] * 1e3:7.2f}ms "
+          f"p99={latencies[int(len(latencies) * 0.99)] * 1e3:7.2f}ms "
+          f"recall@{args.top_k}={np.mean(recalls):.3f}")
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--points", type=int, default=10_000_000)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=1_000)
+    parser.add_argument("--recall-queries", type=int, default=100, help="queries also run exactly, for recall")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--hnsw-m", type=int, default=16)
+    parser.add_argument("--ef-construct", type=int, default=100)
+    parser.add_argument("--ef", type=int, default=None, help="search ef, the server default if unset")
+    parser.add_argument("--chunk", type=int, default=100_000, help="vectors generated and uploaded at a time")
+    parser.add_argument("--parallel", type=int, default=4, help="upload processes")
+    parser.add_argument("--settings", nargs="+", choices=list(SETTINGS), default=list(SETTINGS))
+    parser.add_argument("--keep", action="store_true", help="keep the collections and skip loading when they exist")
+    parser.add_argument("--qdrant-host", help="Qdrant server to benchmark instead of an in-process one")
+    args: argparse.Namespace = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+
+    client: QdrantClient = QdrantClient(host=args.qdrant_host, timeout=600) if args.qdrant_host else QdrantClient(":memory:")
+    if not args.qdrant_host:
+        args.parallel = 1
+    for setting in args.settings:
+        name: str = f"bench_filtered_{setting}"
+        if not (args.keep and client.collection_exists(name)):
+            load(client, name, setting, args)
+        measure(client, name, setting, args)
+        if not args.keep:
+            client.delete_collection(name)
+
+
+if __name__ == "__main__":
+    main()
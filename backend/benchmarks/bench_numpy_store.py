@@ -0,0 +1,97 @@
+"""
+Search latency of the in-process NumPy vector store vs Qdrant.
+
+For each per-user collection size, stores the same synthetic tasks for a
+few users in NumpyVectorStore and in TaskVectorStore, then times searches
+of one user's tasks and reports p50 and p99 latency per store. Titles are
+embedded by a memoized hashing embedder, so only the store is timed.
+
+By default Qdrant runs in process; --qdrant-host targets a running server
+instead, which adds the network round trip the NumPy store avoids.
+
+Run from the repository root:
+    PYTHONPATH=backend/app python backend/benchmarks/bench_numpy_store.py --sizes 100 1000 10000
+"""
+
+import argparse
+import logging
+import random
+import time
+from typing import Dict, List
+
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import Distance, VectorParams
+
+from bench_vector_store import HashEmbedder, titles
+from src.utils.logger import logger
+from src.vector_store.interfaces import TaskVector
+from src.vector_store.numpy_vector_store import NumpyVectorStore
+from src.vector_store.task_vector_store import TaskVectorStore
+
+
+class MemoizedEmbedder(HashEmbedder):
+    """
+    HashEmbedder that computes each title's vector once.
+    """
+
+    def __init__(self, dim: int = 384) -> None:
+        super().__init__(dim)
+        self.vectors: Dict[str, List[float]] = {}
+
+    def embed(self, text: str) -> List[float]:
+        vector = self.vectors.get(text)
+        if vector is None:
+            vector = self.vectors[text] = super().embed(text)
+        return vector
+
+
+def latencies(store, queries: List[str], user_id: int, top_k: int) -> List[float]:
+    samples: List[float] = []
+    for query in queries:
+        started: float = time.perf_counter()
+        store.search(query, user_id=user_id, top_k=top_k)
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return samples
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000], help="tasks per user")
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--qdrant-host", help="Qdrant server to compare against instead of an in-process one")
+    args: argparse.Namespace = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+
+    embedder: MemoizedEmbedder = MemoizedEmbedder()
+    for size in args.sizes:
+        tasks: List[TaskVector] = [
+            TaskVector(i, title, i % args.users) for i, title in enumerate(titles(size * args.users))
+        ]
+        queries: List[str] = random.Random(size).sample([task.title for task in tasks], args.queries)
+        embedder.embed_many(queries)
+
+        client: QdrantClient = QdrantClient(host=args.qdrant_host) if args.qdrant_host else QdrantClient(":memory:")
+        name: str = f"bench_numpy_{size}"
+        if client.collection_exists(name):
+            client.delete_collection(name)
+        client.create_collection(name, vectors_config=VectorParams(size=embedder.dim, distance=Distance.COSINE))
+        stores: Dict[str, object] = {
+            "numpy": NumpyVectorStore(embedder),
+            "qdrant": TaskVectorStore(client=client, embedder=embedder, collection_name=name),
+        }
+
+        for label, store in stores.items():
+            store.add_many(tasks)
+            samples: List[float] = latencies(store, queries, user_id=0, top_k=args.top_k)
+            print(f"{size:>8} tasks/user {label:<7} p50={samples[len(samples) // 2] * 1e3:8.3f}ms "
+                  f"p99={samples[int(len(samples) * 0.99)] * 1e3:8.3f}ms")
+
+        client.delete_collection(name)
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Multi-session throughput benchmark for AppService.handle.
+
+Runs many scripted chat sessions concurrently against in-memory task and
+user services and a replayed LLM, so no API, Qdrant or Gemini is needed.
+Without --recording a synthetic recording of the scripted turns is used;
+pass a JSONL file captured with LLM_PROVIDER=record to replay real traffic.
+
+Run from the repository root:
+    PYTHONPATH=backend/app python backend/benchmarks/bench_sessions.py --sessions 50 --latency 0.4
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from datetime import date
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from src.app_services import AppService
+from src.communicator import Communicator
+from src.genai import AICommandInterpreter
+from src.llm.message_pool import NAME_TOKEN
+from src.llm.providers import ReplayProvider
+from src.llm.resilience import ResiliencePolicy
+from src.llm.scheduler import LLMScheduler
+from src.utils.logger import logger
+from src.utils.menus import MenuChoice, menu_options, view_options
+from src.utils.prompt_templates import (
+    INTERPRET_COMMAND_TEMPLATE,
+    CONFIRMATION_TEMPLATE,
+    EXTRACT_TASK_TEMPLATE,
+    EXTRACT_ID_OR_TITLE_TEMPLATE,
+    VIEW_TASK_TEMPLATE,
+    MENU_TEMPLATE,
+    FOLLOWUP_TEMPLATE
+)
+
+# Each scripted turn: utterance, menu choice, and the template/answer of its extraction step, if any.
+# Besides hinted turns there are small talk with no intent hint, an add without one and an add hinting at edit.
+SCRIPT: List[Dict[str, Any]] = [
+    {"text": "add buy milk tomorrow", "choice": MenuChoice.ADD_TASK,
+     "extract": (EXTRACT_TASK_TEMPLATE, {"name": "Buy milk", "date": "tomorrow"})},
+    {"text": "show my completed tasks", "choice": MenuChoice.VIEW_TASKS,
+     "extract": (VIEW_TASK_TEMPLATE, {"status": "specific", "choice": "1"})},
+    {"text": "mark task 1 as done", "choice": MenuChoice.MARK_DONE,
+     "extract": (EXTRACT_ID_OR_TITLE_TEMPLATE, {"task_id": 1, "task_title": None})},
+    {"text": "hi", "choice": MenuChoice.NONE, "extract": None},
+    {"text": "pick up the laundry tomorrow", "choice": MenuChoice.ADD_TASK,
+     "extract": (EXTRACT_TASK_TEMPLATE, {"name": "Pick up the laundry", "date": "tomorrow"})},
+    {"text": "change of plans, buy bread tomorrow", "choice": MenuChoice.ADD_TASK,
+     "extract": (EXTRACT_TASK_TEMPLATE, {"name": "Buy bread", "date": "tomorrow"})},
+    {"text": "thanks", "choice": MenuChoice.NONE, "extract": None},
+]
+
+
+class SessionFinished(BaseException):
+    """Raised by the scripted communicator once its inputs are used up."""
+
+
+class ScriptedCommunicator(Communicator):
+    def __init__(self, inputs: List[str]) -> None:
+        self.inputs: List[str] = inputs
+        self.turn_latencies: List[float] = []
+        self._turn_started: Optional[float] = None
+
+    async def input(self, text: str) -> str:
+        now: float = time.perf_counter()
+        if self._turn_started is not None:
+            self.turn_latencies.append(now - self._turn_started)
+        if not self.inputs:
+            raise SessionFinished()
+        self._turn_started = now
+        return self.inputs.pop(0)
+
+    async def output(self, text: str) -> None:
+        pass
+
+    async def output_stream(self, chunks: AsyncIterator[str]) -> str:
+        return "".join([chunk async for chunk in chunks])
+
+
+class InMemoryUserService:
+    async def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
+        return {"id": abs(hash(username)) % 10_000, "username": username}
+
+
+class InMemoryTaskService:
+    def __init__(self) -> None:
+        self.tasks: Dict[int, Dict[str, Any]] = {}
+
+    async def get_tasks(self, user_id: int, **filters: Any) -> List[Dict[str, Any]]:
+        return [task for task in self.tasks.values() if task["user_id"] == user_id]
+
+    async def get_task_by_id(self, task_id: int) -> Optional[Dict[str, Any]]:
+        return self.tasks.get(task_id) or {"id": task_id, "title": "Buy milk", "done": False, "due_date": None}
+
+    async def create_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
+        task: Dict[str, Any] = {"id": len(self.tasks) + 1, "done": False, **task_data}
+        self.tasks[task["id"]] = task
+        return task
+
+    async def update_task(self, task_id: int, task_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {"id": task_id, **task_data}
+
+    async def delete_task(self, task_id: int) -> bool:
+        return self.tasks.pop(task_id, None) is not None
+
+
+class InMemoryVectorStore:
+    async def search(self, query: str, user_id: int, top_k: int = 5) -> List[Dict[str, Any]]:
+        return []
+
+    async def add(self, task_id: int, title: str, user_id: int, due_date: Optional[str] = None) -> None:
+        pass
+
+    async def remove(self, task_id: int, user_id: int) -> None:
+        pass
+
+
+def synthetic_recording(provider: ReplayProvider) -> None:
+    today: date = date.today()
+    provider.add(MENU_TEMPLATE.format(name_intro=NAME_TOKEN), f"Hi {NAME_TOKEN} what would you like to do today?")
+    provider.add(FOLLOWUP_TEMPLATE.format(name_intro=NAME_TOKEN), "Anything else I can help with?")
+    for turn in SCRIPT:
+        text: str = turn["text"]
+        provider.add(INTERPRET_COMMAND_TEMPLATE.format(command=text, options=menu_options), turn["choice"].value)
+        if not turn["extract"]:
+            continue
+        provider.add(CONFIRMATION_TEMPLATE.format(user_input=text, intent=turn["choice"].name),
+                     f"Sure! Let me take care of '{text}' for you right away.")
+        template, answer = turn["extract"]
+        prompt: str = template.format(user_input=text, command=text, view_options=view_options, today=today)
+        provider.add(prompt, json.dumps(answer))
+
+
+async def run(sessions: int, turns: int, provider: ReplayProvider, max_in_flight: int = 0) -> None:
+    scheduler: Optional[LLMScheduler] = LLMScheduler(max_in_flight=max_in_flight) if max_in_flight else None
+    genai_client: AICommandInterpreter = AICommandInterpreter(
+        provider=provider,
+        resilience=ResiliencePolicy(attempt_timeout=30, turn_budget=60, scheduler=scheduler)
+    )
+    app_service: AppService = AppService(
+        "http://localhost:8000", "localhost", None,
+        user_service=InMemoryUserService(),
+        task_service=InMemoryTaskService(),
+        genai_client=genai_client,
+        vector_store=InMemoryVectorStore()
+    )
+    await genai_client.message_pool.refresh()
+
+    communicators: List[ScriptedCommunicator] = [
+        ScriptedCommunicator([f"user{i}"] + [SCRIPT[t % len(SCRIPT)]["text"] for t in range(turns)])
+        for i in range(sessions)
+    ]
+
+    async def session(communicator: ScriptedCommunicator) -> None:
+        try:
+            await app_service.handle(communicator)
+        except SessionFinished:
+            pass
+
+    started: float = time.perf_counter()
+    await asyncio.gather(*(session(c) for c in communicators))
+    elapsed: float = time.perf_counter() - started
+    genai_client.message_pool.stop()
+
+    latencies: List[float] = sorted(l for c in communicators for l in c.turn_latencies[1:])
+    print(f"sessions={sessions} turns/session={turns} elapsed={elapsed:.2f}s "
+          f"throughput={len(latencies) / elapsed:.1f} turns/s")
+    print(f"turn latency ms: mean={statistics.fmean(latencies) * 1e3:.1f} "
+          f"p50={latencies[len(latencies) // 2] * 1e3:.1f} p99={latencies[int(len(latencies) * 0.99)] * 1e3:.1f}")
+    if scheduler:
+        waits = genai_client.metrics.histogram("llm_queue_wait_seconds", priority="interactive")
+        print(f"queue wait ms: mean={waits.mean * 1e3:.1f} p95<={waits.quantile(0.95) * 1e3:.0f}")
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=9)
+    parser.add_argument("--latency", type=float, default=0.3, help="synthetic seconds per LLM call")
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--recording", help="JSONL recording to replay instead of the synthetic one")
+    parser.add_argument("--recorded-latency", action="store_true", help="replay recorded latencies")
+    parser.add_argument("--max-in-flight", type=int, default=0, help="admit LLM calls through a scheduler")
+    args: argparse.Namespace = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+
+    provider: ReplayProvider = ReplayProvider(
+        args.recording,
+        latency=args.latency,
+        jitter=args.jitter,
+        use_recorded_latency=args.recorded_latency,
+        default="None"
+    )
+    if not args.recording:
+        synthetic_recording(provider)
+    asyncio.run(run(args.sessions, args.turns, provider, args.max_in_flight))
+
+
+if __name__ == "__main__":
+    main()
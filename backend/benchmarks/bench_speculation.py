@@ -0,0 +1,83 @@
+"""
+Latency comparison of sequential vs speculative intent classification.
+
+Replays the scripted turns of bench_sessions (or a JSONL recording) and
+times classification plus the first extraction of each turn, once with
+interpret_command followed by the extraction and once with
+interpret_command_speculative, where the extraction starts concurrently.
+
+Run from the repository root:
+    PYTHONPATH=backend/app python backend/benchmarks/bench_speculation.py --latency 0.4
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from typing import Dict, List
+
+from bench_sessions import SCRIPT, synthetic_recording
+from src.genai import AICommandInterpreter, SPECULATIVE_EXTRACTIONS
+from src.llm.providers import ReplayProvider
+from src.llm.resilience import ResiliencePolicy
+from src.utils.logger import logger
+from src.utils.menus import menu_options, view_options
+from src.utils.metrics import MetricsRegistry
+
+
+async def turn(ai: AICommandInterpreter, text: str, speculative: bool) -> float:
+    started: float = time.perf_counter()
+    if speculative:
+        choice = await ai.interpret_command_speculative(text, menu_options)
+    else:
+        choice = await ai.interpret_command(text, menu_options)
+    if choice not in SPECULATIVE_EXTRACTIONS:
+        return time.perf_counter() - started
+    method: str = SPECULATIVE_EXTRACTIONS[choice]
+    args = (text, view_options) if method == "interpret_view_task_command" else (text,)
+    await getattr(ai, method)(*args)
+    return time.perf_counter() - started
+
+
+async def run(provider: ReplayProvider, rounds: int) -> None:
+    results: Dict[str, List[float]] = {}
+    for mode in ("sequential", "speculative"):
+        metrics: MetricsRegistry = MetricsRegistry()
+        ai: AICommandInterpreter = AICommandInterpreter(
+            provider=provider,
+            resilience=ResiliencePolicy(attempt_timeout=30, metrics=metrics),
+            metrics=metrics
+        )
+        results[mode] = [
+            await turn(ai, step["text"], mode == "speculative")
+            for _ in range(rounds) for step in SCRIPT
+        ]
+        calls: float = sum(metrics.snapshot().get("llm_calls", {}).values())
+        samples: List[float] = sorted(results[mode])
+        print(f"{mode:<12} mean={statistics.fmean(samples) * 1e3:7.1f}ms "
+              f"p50={samples[len(samples) // 2] * 1e3:7.1f}ms "
+              f"p95={samples[int(len(samples) * 0.95)] * 1e3:7.1f}ms "
+              f"llm_calls/turn={calls / len(samples):.2f}")
+
+    saved: float = 1 - statistics.fmean(results["speculative"]) / statistics.fmean(results["sequential"])
+    print(f"speculation saves {saved:.0%} of classification + extraction latency")
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.3, help="synthetic seconds per LLM call")
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--recording", help="JSONL recording to replay instead of the synthetic one")
+    args: argparse.Namespace = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+
+    provider: ReplayProvider = ReplayProvider(args.recording, latency=args.latency, jitter=args.jitter, default="None")
+    if not args.recording:
+        synthetic_recording(provider)
+    asyncio.run(run(provider, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Startup time of AppService with background vs blocking model loading.
+
+Each run starts a fresh interpreter, imports the application and builds
+an AppService with in-memory users, tasks and vector store and a replay
+LLM provider, and reports when the service could accept its first
+connection and when the embedding model became ready. The blocking run
+waits for the model before returning, as AppService did before the model
+was warmed up in the background.
+
+Run from the repository root:
+    PYTHONPATH=backend/app python backend/benchmarks/bench_startup.py --runs 3
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+
+def child(mode: str) -> None:
+    started: float = time.perf_counter()
+    import logging
+
+    from bench_sessions import InMemoryTaskService, InMemoryUserService, InMemoryVectorStore
+    from src.app_services import AppService
+    from src.utils.logger import logger
+
+    logger.setLevel(logging.WARNING)
+    imported: float = time.perf_counter()
+    service: AppService = AppService(
+        "http://localhost:8000", "localhost", None,
+        user_service=InMemoryUserService(),
+        task_service=InMemoryTaskService(),
+        vector_store=InMemoryVectorStore()
+    )
+    loaded = service.genai_client.semantic_cache.embedder.warm_up()
+    if mode == "blocking":
+        wait(loaded)
+    accepting: float = time.perf_counter()
+    ready: Optional[float] = time.perf_counter() - started if wait(loaded) else None
+    print(json.dumps({"import": imported - started, "accepting": accepting - started, "ready": ready}))
+
+
+def wait(loaded: Future) -> bool:
+    try:
+        loaded.result()
+        return True
+    except Exception:
+        # e.g. no network to download the model; startup is still measured
+        return False
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", choices=("background", "blocking"), help=argparse.SUPPRESS)
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    workdir: str = tempfile.mkdtemp(prefix="bench_startup_")
+    recording: str = os.path.join(workdir, "recording.jsonl")
+    open(recording, "w").close()
+    env: Dict[str, str] = dict(
+        os.environ,
+        LLM_PROVIDER="replay",
+        LLM_RECORDING_PATH=recording,
+        LLM_CACHE_PATH=os.path.join(workdir, "llm_cache.sqlite3"),
+        EMBEDDING_CACHE_DIR=os.path.join(workdir, "embedding_cache"),
+        LLM_USAGE_REPORT_INTERVAL="0"
+    )
+    for mode in ("blocking", "background"):
+        samples: Dict[str, List[Optional[float]]] = {"import": [], "accepting": [], "ready": []}
+        for _ in range(args.runs):
+            output: str = subprocess.run(
+                [sys.executable, __file__, "--child", mode],
+                env=env, capture_output=True, text=True, check=True
+            ).stdout
+            for key, value in json.loads(output.strip().splitlines()[-1]).items():
+                samples[key].append(value)
+        ready: List[float] = [value for value in samples["ready"] if value is not None]
+        print(f"{mode:<10} import={statistics.median(samples['import']):6.2f}s "
+              f"accepting={statistics.median(samples['accepting']):6.2f}s "
+              f"model_ready={f'{statistics.median(ready):6.2f}s' if ready else 'model unavailable'}")
+
+
+if __name__ == "__main__":
+    main()
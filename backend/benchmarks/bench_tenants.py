@@ -0,0 +1,98 @@
+"""
+p99 search latency of the shared and tenant-partitioned layouts as users grow.
+
+For each tenant count, loads the same random task vectors, a fixed number
+per user, once into a collection with the shared layout (one HNSW graph,
+user filtered through a payload index) and once with the tenant layout
+(QDRANT_LAYOUT=tenants: a per-user graph over a tenant-keyed index), then
+times searches of random users as TaskVectorStore.search issues them.
+
+The layouts only differ in a Qdrant server, so point --qdrant-host at one
+for meaningful numbers; the in-process client runs the same code as a
+smoke test.
+
+Run from the repository root:
+    PYTHONPATH=backend/app python backend/benchmarks/bench_tenants.py --qdrant-host localhost --tenants 1000 10000 100000
+"""
+
+import argparse
+import logging
+import time
+from typing import Dict, List
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import CollectionStatus
+
+from bench_filtered_search import vectors
+from src.utils.logger import logger
+from src.vector_store.qdrant_client import TENANT_FIELD, CollectionConfig, create_task_collection
+from src.vector_store.task_vector_store import user_filter
+
+LAYOUTS: Dict[str, CollectionConfig] = {
+    "shared": CollectionConfig(),
+    "tenants": CollectionConfig(tenants=True),
+}
+
+
+def load(client: QdrantClient, name: str, config: CollectionConfig, tenants: int, args: argparse.Namespace) -> None:
+    if client.collection_exists(name):
+        client.delete_collection(name)
+    create_task_collection(client, name, args.dim, config)
+
+    points: int = tenants * args.tasks_per_tenant
+    for start, block in zip(range(0, points, args.chunk), vectors(points, args.dim, args.chunk)):
+        ids: List[int] = list(range(start, start + len(block)))
+        client.upload_collection(
+            collection_name=name,
+            vectors=block,
+            payload=({"task_id": i, "user": i % tenants, TENANT_FIELD: str(i % tenants), "title": f"task {i}"} for i in ids),
+            ids=ids,
+            batch_size=1024,
+            parallel=args.parallel
+        )
+    while client.get_collection(name).status != CollectionStatus.GREEN:
+        time.sleep(1)
+
+
+def p99(client: QdrantClient, name: str, config: CollectionConfig, tenants: int, args: argparse.Namespace) -> float:
+    queries: np.ndarray = next(vectors(args.queries, args.dim, args.queries, seed=2))
+    users: np.ndarray = np.random.default_rng(1).integers(0, tenants, args.queries)
+    latencies: List[float] = []
+    for query, user in zip(queries, users):
+        started: float = time.perf_counter()
+        client.search(name, query_vector=query.tolist(), query_filter=user_filter(int(user), config.tenants),
+                      search_params=config.search_params(), limit=args.top_k)
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return latencies[int(len(latencies) * 0.99)]
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--tenants", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--tasks-per-tenant", type=int, default=100)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=1_000)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--chunk", type=int, default=100_000, help="vectors generated and uploaded at a time")
+    parser.add_argument("--parallel", type=int, default=4, help="upload processes")
+    parser.add_argument("--qdrant-host", help="Qdrant server to benchmark instead of an in-process one")
+    args: argparse.Namespace = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+
+    client: QdrantClient = QdrantClient(host=args.qdrant_host, timeout=600) if args.qdrant_host else QdrantClient(":memory:")
+    if not args.qdrant_host:
+        args.parallel = 1
+    for tenants in args.tenants:
+        results: List[str] = []
+        for layout, config in LAYOUTS.items():
+            name: str = f"bench_tenants_{layout}"
+            load(client, name, config, tenants, args)
+            results.append(f"{layout}={p99(client, name, config, tenants, args) * 1e3:7.2f}ms")
+            client.delete_collection(name)
+        print(f"{tenants:>8} tenants x {args.tasks_per_tenant} tasks  p99 " + " ".join(results))
+
+
+if __name__ == "__main__":
+    main()
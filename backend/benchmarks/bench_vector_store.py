@@ -0,0 +1,103 @@
+"""
+Throughput of per-task vs bulk writes to the task vector store.
+
+Generates synthetic task titles and stores them once with
+TaskVectorStore.add, one call per task, and once with add_many, which
+embeds in batches and upserts in chunks, reporting vectors per second.
+The per-task pass runs on a sample of the titles since it is the slow one.
+
+By default the titles are written to an in-process Qdrant; --qdrant-host
+targets a running server instead. --embedder hash swaps the
+sentence-transformers model for a deterministic hashing embedder, to
+measure the store overhead alone.
+
+Run from the repository root:
+    PYTHONPATH=backend/app python backend/benchmarks/bench_vector_store.py --titles 100000
+"""
+
+import argparse
+import hashlib
+import logging
+import random
+import time
+from typing import List
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import Distance, VectorParams
+
+from src.utils.logger import logger
+from src.vector_store.interfaces import TaskVector
+from src.vector_store.task_vector_store import TaskVectorStore
+from src.vector_store.text_embedder import TextEmbedder
+
+VERBS: List[str] = ["buy", "call", "email", "book", "pay", "clean", "fix", "review", "send", "plan"]
+OBJECTS: List[str] = ["milk", "mom", "the dentist", "rent", "the car", "slides", "invoice", "groceries", "tickets", "report"]
+
+
+class HashEmbedder:
+    """
+    Deterministic stand-in for TextEmbedder that skips the model.
+    """
+
+    def __init__(self, dim: int = 384) -> None:
+        self.dim: int = dim
+
+    def embed(self, text: str) -> List[float]:
+        seed: int = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        return np.random.default_rng(seed).standard_normal(self.dim, dtype=np.float32).tolist()
+
+    def embed_many(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed(text) for text in texts]
+
+
+def titles(count: int) -> List[str]:
+    rng: random.Random = random.Random(0)
+    return [f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} #{i}" for i in range(count)]
+
+
+def store(args: argparse.Namespace, embedder, name: str) -> TaskVectorStore:
+    client: QdrantClient = QdrantClient(host=args.qdrant_host) if args.qdrant_host else QdrantClient(":memory:")
+    if client.collection_exists(name):
+        client.delete_collection(name)
+    client.create_collection(
+        collection_name=name,
+        vectors_config=VectorParams(size=384, distance=Distance.COSINE),
+    )
+    return TaskVectorStore(client=client, embedder=embedder, collection_name=name, batch_size=args.batch_size)
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--titles", type=int, default=100_000)
+    parser.add_argument("--sample", type=int, default=2_000, help="titles written by the per-task pass")
+    parser.add_argument("--batch-size", type=int, default=256, help="points per upsert request")
+    parser.add_argument("--embedder", choices=("model", "hash"), default="model")
+    parser.add_argument("--qdrant-host", help="Qdrant server to write to instead of an in-process one")
+    args: argparse.Namespace = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+
+    tasks: List[TaskVector] = [TaskVector(i, title, i % 100) for i, title in enumerate(titles(args.titles))]
+
+    def embedder():
+        # A fresh embedder per pass so neither reuses the other's cached embeddings
+        return HashEmbedder() if args.embedder == "hash" else TextEmbedder()
+
+    single: TaskVectorStore = store(args, embedder(), "bench_single")
+    sample: List[TaskVector] = tasks[:args.sample]
+    started: float = time.perf_counter()
+    for task in sample:
+        single.add(task.task_id, task.title, task.user_id)
+    single_rate: float = len(sample) / (time.perf_counter() - started)
+    print(f"add       {len(sample):>7} vectors {single_rate:10.0f} vectors/s")
+
+    bulk: TaskVectorStore = store(args, embedder(), "bench_bulk")
+    started = time.perf_counter()
+    bulk.add_many(tasks)
+    bulk_rate: float = len(tasks) / (time.perf_counter() - started)
+    print(f"add_many  {len(tasks):>7} vectors {bulk_rate:10.0f} vectors/s")
+    print(f"speedup {bulk_rate / single_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
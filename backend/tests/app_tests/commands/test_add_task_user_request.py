@@ -6,7 +6,7 @@ class MockGenAI:
         self.title = title
         self.date = date
 
-    def extract_task_data(self, user_input):
+    async def extract_task_data(self, user_input):
         return {"name": self.title, "date": self.date}
 
 
@@ -34,7 +34,7 @@ class MockTaskService:
 
 
 class MockVectorEditor:
-    def add(self, task_id, title, user_id):
+    async def add(self, task_id, title, user_id):
         assert isinstance(task_id, int)
         assert isinstance(title, str)
         assert isinstance(user_id, int)
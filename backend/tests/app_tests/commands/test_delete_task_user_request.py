@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock
 from app.src.commands.delete_task_user_request import DeleteTaskUserRequest
 
 class MockCommunicator:
@@ -20,8 +20,8 @@ class MockCommunicator:
 @pytest.mark.asyncio
 async def test_delete_task_by_id():
     mock_task_service = AsyncMock()
-    mock_vector_searcher = MagicMock()
-    mock_genai_client = MagicMock()
+    mock_vector_searcher = AsyncMock()
+    mock_genai_client = AsyncMock()
     communicator = MockCommunicator(inputs=[])
 
     mock_genai_client.extract_task_id_or_title.return_value = {
@@ -50,5 +50,5 @@ async def test_delete_task_by_id():
     )
 
     mock_task_service.delete_task.assert_awaited_once_with(42)
-    mock_vector_searcher.remove.assert_called_once_with(task_id=42, user_id=1)
+    mock_vector_searcher.remove.assert_awaited_once_with(task_id=42, user_id=1)
     assert any("deleted" in line.lower() for line in communicator.outputs)
\ No newline at end of file
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock
 from app.src.commands.edit_task_user_request import EditTaskUserRequest
 
 class MockCommunicator:
@@ -15,7 +15,7 @@ class MockCommunicator:
 @pytest.mark.asyncio
 async def test_edit_task_user_request_handle_updates_task_and_vector_store():
     mock_task_service = AsyncMock()
-    mock_vector_store = MagicMock()
+    mock_vector_store = AsyncMock()
     communicator = MockCommunicator()
 
     extracted_data = {
@@ -40,7 +40,7 @@ async def test_edit_task_user_request_handle_updates_task_and_vector_store():
         "due_date": "2025-07-30"
     })
 
-    mock_vector_store.add.assert_called_once_with(
+    mock_vector_store.add.assert_awaited_once_with(
         task_id=101,
         title="Updated Task Title",
         user_id=1,
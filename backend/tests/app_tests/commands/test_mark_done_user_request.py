@@ -22,7 +22,7 @@ async def test_mark_done_by_id():
     mock_task_service = AsyncMock()
     mock_vector_searcher = MagicMock()
     mock_vector_editor = MagicMock()
-    mock_genai_client = MagicMock()
+    mock_genai_client = AsyncMock()
     communicator = MockCommunicator(inputs=[])
 
     mock_genai_client.extract_task_id_or_title.return_value = {
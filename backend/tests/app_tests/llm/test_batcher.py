@@ -0,0 +1,84 @@
+import asyncio
+import pytest
+from app.src.llm.batcher import MicroBatcher
+from app.src.utils.metrics import MetricsRegistry
+
+
+class FakeLLM:
+    def __init__(self, batch_answers=None):
+        self.batches = []
+        self.singles = []
+        self.batch_answers = batch_answers
+
+    async def single(self, group, item):
+        self.singles.append(item)
+        return item.upper()
+
+    async def batch(self, group, items):
+        self.batches.append(items)
+        await asyncio.sleep(0)
+        return self.batch_answers if self.batch_answers is not None else [f"{group}:{item}" for item in items]
+
+
+def make_batcher(llm, **kwargs):
+    return MicroBatcher(llm.single, llm.batch, name="T", metrics=MetricsRegistry(), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_items_are_sent_as_one_batch():
+    llm = FakeLLM()
+    batcher = make_batcher(llm, max_wait=0.01)
+
+    results = await asyncio.gather(*(batcher.submit(item, group="g") for item in ("a", "b", "c")))
+
+    assert results == ["g:a", "g:b", "g:c"]
+    assert llm.batches == [["a", "b", "c"]]
+    assert batcher.metrics.get("llm_batched_items", batcher="T") == 3
+
+
+@pytest.mark.asyncio
+async def test_lone_items_and_other_groups_are_not_batched():
+    llm = FakeLLM()
+    batcher = make_batcher(llm, max_wait=0.01)
+
+    results = await asyncio.gather(batcher.submit("a", group="x"), batcher.submit("b", group="y"))
+
+    assert results == ["A", "B"]
+    assert llm.batches == []
+
+
+@pytest.mark.asyncio
+async def test_full_window_is_sent_without_waiting():
+    llm = FakeLLM()
+    batcher = make_batcher(llm, max_wait=10, max_batch=2)
+
+    results = await asyncio.wait_for(asyncio.gather(batcher.submit("a"), batcher.submit("b")), 1)
+
+    assert results == [":a", ":b"]
+
+
+@pytest.mark.asyncio
+async def test_unusable_batch_answer_falls_back_per_item():
+    llm = FakeLLM(batch_answers=["only one"])
+    batcher = make_batcher(llm, max_wait=0.01)
+
+    results = await asyncio.gather(batcher.submit("a"), batcher.submit("b"))
+
+    assert results == ["A", "B"]
+    assert llm.singles == ["a", "b"]
+    assert batcher.metrics.get("llm_batch_fallbacks", batcher="T") == 1
+
+
+@pytest.mark.asyncio
+async def test_items_of_a_cancelled_window_owner_are_answered_alone():
+    llm = FakeLLM()
+    batcher = make_batcher(llm, max_wait=0.05)
+    owner = asyncio.create_task(batcher.submit("a"))
+    await asyncio.sleep(0)
+    other = asyncio.create_task(batcher.submit("b"))
+    await asyncio.sleep(0)
+
+    owner.cancel()
+
+    assert await other == "B"
+    assert llm.batches == []
@@ -0,0 +1,63 @@
+import pytest
+from unittest.mock import AsyncMock
+from app.src.genai import AICommandInterpreter
+from app.src.llm.context_cache import ContextCache
+from app.src.llm.providers import ReplayProvider
+from app.src.llm.resilience import ResiliencePolicy
+from app.src.utils.metrics import MetricsRegistry
+from app.src.utils.prompt_templates import EXTRACT_ID_OR_TITLE_TEMPLATE
+
+ANSWER = '{"task_id": 3, "task_title": null}'
+
+
+def make_interpreter(provider, **cache_kwargs):
+    metrics = MetricsRegistry()
+    cache = ContextCache(provider, min_tokens=0, metrics=metrics, **cache_kwargs)
+    ai = AICommandInterpreter(
+        provider=provider,
+        resilience=ResiliencePolicy(base_delay=0, metrics=metrics),
+        metrics=metrics,
+        context_cache=cache
+    )
+    return ai, cache, metrics
+
+
+@pytest.mark.asyncio
+async def test_prefix_is_registered_once_and_only_tail_is_sent():
+    provider = ReplayProvider()
+    provider.add(EXTRACT_ID_OR_TITLE_TEMPLATE.format(user_input="finish task 3"), ANSWER)
+    ai, _, metrics = make_interpreter(provider)
+
+    assert (await ai.extract_task_id_or_title("finish task 3"))["task_id"] == 3
+    assert (await ai.extract_task_id_or_title("finish task 3"))["task_id"] == 3
+
+    assert metrics.get("llm_context_cache_created", template="EXTRACT_ID_OR_TITLE") == 1
+    assert metrics.get("llm_cached_prompt_tokens", template="EXTRACT_ID_OR_TITLE") > 0
+    full_prompt_tokens = len(EXTRACT_ID_OR_TITLE_TEMPLATE.format(user_input="finish task 3")) / 4
+    assert metrics.get("llm_prompt_tokens", template="EXTRACT_ID_OR_TITLE") < full_prompt_tokens
+
+
+@pytest.mark.asyncio
+async def test_expired_handle_falls_back_to_full_prompt_and_is_renewed():
+    provider = ReplayProvider()
+    provider.add(EXTRACT_ID_OR_TITLE_TEMPLATE.format(user_input="finish task 3"), ANSWER)
+    ai, _, metrics = make_interpreter(provider)
+
+    await ai.extract_task_id_or_title("finish task 3")
+    provider._caches.clear()
+
+    assert (await ai.extract_task_id_or_title("finish task 3"))["task_id"] == 3
+    await ai.extract_task_id_or_title("finish task 3")
+    assert metrics.get("llm_context_cache_created", template="EXTRACT_ID_OR_TITLE") == 2
+
+
+@pytest.mark.asyncio
+async def test_small_prefixes_and_unsupported_providers_use_full_prompts():
+    provider = ReplayProvider()
+    assert await ContextCache(provider, min_tokens=10_000).handle(EXTRACT_ID_OR_TITLE_TEMPLATE) is None
+
+    provider.create_cache = AsyncMock(return_value=None)
+    cache = ContextCache(provider, min_tokens=0)
+    assert await cache.handle(EXTRACT_ID_OR_TITLE_TEMPLATE) is None
+    assert await cache.handle(EXTRACT_ID_OR_TITLE_TEMPLATE) is None
+    provider.create_cache.assert_awaited_once()
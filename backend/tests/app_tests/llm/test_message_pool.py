@@ -0,0 +1,55 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.src.llm.message_pool import MessagePool, MessageKind, NAME_TOKEN
+
+
+def test_get_returns_none_when_pool_is_empty():
+    generate = MagicMock()
+    pool = MessagePool(generate=generate)
+
+    assert pool.get(MessageKind.MENU, "Dana") is None
+    generate.assert_not_called()
+
+
+def test_get_renders_username_locally():
+    pool = MessagePool(generate=MagicMock())
+    pool.add(MessageKind.MENU, f"Hi {NAME_TOKEN} what can I do for you?")
+
+    assert pool.get(MessageKind.MENU, "Dana") == "Hi Dana, what can I do for you?"
+    assert pool.get(MessageKind.MENU) == "Hi there what can I do for you?"
+
+
+@pytest.mark.asyncio
+async def test_generate_seeds_pool_and_discards_menu_without_placeholder():
+    generate = AsyncMock(side_effect=["Hi Dana! no placeholder", f"Hi {NAME_TOKEN} welcome"])
+    pool = MessagePool(generate=generate)
+
+    assert await pool.generate(MessageKind.MENU, "Dana") is None
+    assert await pool.generate(MessageKind.MENU, "Dana") == "Hi Dana, welcome"
+    assert len(pool) == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_fills_pool_up_to_size():
+    generate = AsyncMock(return_value=f"Hi {NAME_TOKEN} 😊")
+    pool = MessagePool(generate=generate, size=3)
+
+    await pool.refresh()
+    assert len(pool) == 6
+
+    await pool.refresh()
+    assert len(pool) == 6
+
+
+@pytest.mark.asyncio
+async def test_stream_renders_placeholder_split_across_chunks():
+    async def stream(prompt, template=None):
+        for chunk in ["Hi [", "[NA", "ME]] what ", "next?"]:
+            yield chunk
+
+    pool = MessagePool(generate=AsyncMock(), stream=stream)
+    chunks = [chunk async for chunk in pool.stream(MessageKind.MENU, "Dana")]
+
+    assert "".join(chunks) == "Hi Dana, what next?"
+    assert chunks[0] == "Hi "
+    assert pool.get(MessageKind.MENU, "Noa") == "Hi Noa, what next?"
@@ -0,0 +1,33 @@
+import pytest
+from app.src.llm.providers import RecordingProvider, ReplayProvider
+
+
+@pytest.mark.asyncio
+async def test_recording_can_be_replayed(tmp_path):
+    path = str(tmp_path / "recording.jsonl")
+    source = ReplayProvider(default="ignored")
+    source.add("Extract from: buy milk on 2025-07-09", '{"name": "Buy milk"}')
+    source.add("Say hi", "Hello there friend")
+    recorder = RecordingProvider(source, path)
+
+    assert await recorder.generate("Extract from: buy milk on 2025-07-09") == '{"name": "Buy milk"}'
+    assert [chunk async for chunk in recorder.stream("Say hi")] == ["Hello ", "there ", "friend"]
+
+    replay = ReplayProvider(path)
+    assert len(replay) == 2
+    assert await replay.generate("Extract from:  buy milk on 2026-01-01") == '{"name": "Buy milk"}'
+    assert "".join([chunk async for chunk in replay.stream("Say hi")]) == "Hello there friend"
+
+
+@pytest.mark.asyncio
+async def test_replay_cycles_responses_and_rejects_unknown_prompts():
+    replay = ReplayProvider()
+    replay.add("pick", "1")
+    replay.add("pick", "2")
+
+    assert [await replay.generate("pick") for _ in range(3)] == ["1", "2", "1"]
+    with pytest.raises(KeyError):
+        await replay.generate("unknown")
+
+    replay.default = "None"
+    assert await replay.generate("unknown") == "None"
@@ -0,0 +1,146 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from app.src.llm.resilience import CircuitBreaker, ResiliencePolicy
+from app.src.llm.scheduler import LLMScheduler
+from app.src.utils.metrics import MetricsRegistry
+
+
+def make_policy(**kwargs):
+    kwargs.setdefault("base_delay", 0)
+    return ResiliencePolicy(metrics=MetricsRegistry(), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_execute_retries_then_succeeds():
+    policy = make_policy()
+    call = AsyncMock(side_effect=[Exception("boom"), "ok"])
+
+    assert await policy.execute(call, template="T") == "ok"
+    assert call.await_count == 2
+    assert policy.metrics.get("llm_retries", template="T") == 1
+    assert policy.breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_execute_times_out_slow_attempts():
+    policy = make_policy(max_attempts=2, attempt_timeout=0.01)
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    assert await policy.execute(slow, template="T") is None
+    assert policy.metrics.get("llm_timeouts", template="T") == 2
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_and_short_circuits():
+    policy = make_policy(max_attempts=3, failure_threshold=2, reset_timeout=60)
+    call = AsyncMock(side_effect=Exception("down"))
+
+    assert await policy.execute(call, template="T") is None
+    assert call.await_count == 2
+    assert policy.breaker.state == "open"
+
+    assert await policy.execute(call, template="T") is None
+    assert call.await_count == 2
+    assert policy.metrics.get("llm_short_circuits", template="T") == 1
+
+
+def test_breaker_half_open_allows_single_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    assert breaker.record_failure()
+
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_turn_budget_stops_further_calls():
+    policy = make_policy(turn_budget=0.05, attempt_timeout=1)
+
+    async def slow():
+        await asyncio.sleep(0.1)
+
+    with policy.turn():
+        assert await policy.execute(slow, template="T") is None
+        assert await policy.execute(AsyncMock(return_value="ok"), template="T") is None
+    assert policy.metrics.get("llm_deadline_exceeded", template="T") >= 1
+
+    assert await policy.execute(AsyncMock(return_value="ok"), template="T") == "ok"
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_wins_over_slow_primary():
+    policy = make_policy(hedge=True, hedge_min_samples=1)
+    policy._latencies.append(0.01)
+    delays = iter([1.0, 0.0])
+
+    async def call():
+        delay = next(delays)
+        await asyncio.sleep(delay)
+        return delay
+
+    assert await policy.execute(call, template="T") == 0.0
+    assert policy.metrics.get("llm_hedges", template="T") == 1
+    assert policy.metrics.get("llm_hedge_wins", template="T") == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_half_open_trial_lets_the_next_call_through():
+    policy = make_policy(failure_threshold=1, reset_timeout=0)
+    policy.breaker.record_failure()
+    started = asyncio.Event()
+
+    async def hanging():
+        started.set()
+        await asyncio.sleep(10)
+
+    trial = asyncio.create_task(policy.execute(hanging, template="T"))
+    await started.wait()
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    assert policy.breaker.state == "half_open"
+    assert await policy.execute(AsyncMock(return_value="ok"), template="T") == "ok"
+    assert policy.breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_half_open_trial_out_of_budget_is_released():
+    policy = make_policy(failure_threshold=1, reset_timeout=0, turn_budget=0)
+    policy.breaker.record_failure()
+
+    with policy.turn():
+        assert await policy.execute(AsyncMock(return_value="ok"), template="T") is None
+
+    assert policy.breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_hedge_takes_a_scheduler_slot_or_is_skipped():
+    scheduler = LLMScheduler(max_in_flight=2, metrics=MetricsRegistry())
+    policy = make_policy(hedge=True, hedge_min_samples=1, scheduler=scheduler)
+    policy._latencies.append(0.01)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        peak = max(peak, scheduler.in_flight)
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    assert await policy.execute(call, template="T") == "ok"
+    assert peak == 2
+    assert policy.metrics.get("llm_hedges", template="T") == 1
+
+    await scheduler.acquire()
+    assert await policy.execute(call, template="T") == "ok"
+    assert policy.metrics.get("llm_hedges_skipped", template="T") == 1
+    assert policy.metrics.get("llm_hedges", template="T") == 1
+    scheduler.release()
+    await asyncio.sleep(0)
+    assert scheduler.in_flight == 0
@@ -0,0 +1,73 @@
+import time
+from app.src.llm.response_cache import ResponseCache
+from app.src.utils.metrics import MetricsRegistry
+
+
+def test_make_key_normalizes_input_and_includes_today():
+    key = ResponseCache.make_key("EXTRACT_TASK", "  Show my   overdue tasks! ", "2025-07-01")
+
+    assert key == ResponseCache.make_key("EXTRACT_TASK", "show my overdue tasks", "2025-07-01")
+    assert key != ResponseCache.make_key("EXTRACT_TASK", "show my overdue tasks", "2025-07-02")
+    assert key != ResponseCache.make_key("VIEW_TASK", "show my overdue tasks", "2025-07-01")
+
+
+def test_make_key_keeps_case_for_quoted_input_and_varies_with_version():
+    key = ResponseCache.make_key("EXTRACT_TASK", "Call Mom", "2025-07-01", version="a:gemini", keep_case=True)
+
+    assert key == ResponseCache.make_key("EXTRACT_TASK", "Call  Mom.", "2025-07-01", version="a:gemini", keep_case=True)
+    assert key != ResponseCache.make_key("EXTRACT_TASK", "call mom", "2025-07-01", version="a:gemini", keep_case=True)
+    assert key != ResponseCache.make_key("EXTRACT_TASK", "Call Mom", "2025-07-01", version="b:gemini", keep_case=True)
+
+
+def test_get_and_set_record_hits_and_misses():
+    registry = MetricsRegistry()
+    cache = ResponseCache(path=None, metrics=registry)
+    key = ResponseCache.make_key("VIEW_TASK", "show overdue")
+
+    assert cache.get("VIEW_TASK", key) is None
+    cache.set("VIEW_TASK", key, '{"status": "specific", "choice": "3"}')
+
+    assert cache.get("VIEW_TASK", key) == '{"status": "specific", "choice": "3"}'
+    assert registry.get("llm_cache_misses", template="VIEW_TASK") == 1
+    assert registry.get("llm_cache_hits", template="VIEW_TASK", tier="memory") == 1
+    assert cache.hit_rate("VIEW_TASK") == 0.5
+
+
+def test_entries_expire_after_ttl():
+    cache = ResponseCache(path=None, ttl=0.01, metrics=MetricsRegistry())
+    cache.set("VIEW_TASK", "k", "value")
+
+    time.sleep(0.02)
+
+    assert cache.get("VIEW_TASK", "k") is None
+
+
+def test_memory_tier_is_bounded_and_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    registry = MetricsRegistry()
+    cache = ResponseCache(path=path, max_memory_entries=2, metrics=registry)
+    for i in range(3):
+        cache.set("EXTRACT_TASK", f"k{i}", f"v{i}")
+
+    assert len(cache._memory) == 2
+    assert cache.get("EXTRACT_TASK", "k0") == "v0"
+    assert registry.get("llm_cache_hits", template="EXTRACT_TASK", tier="disk") == 1
+    cache.close()
+
+    reopened = ResponseCache(path=path, metrics=registry)
+    assert reopened.get("EXTRACT_TASK", "k2") == "v2"
+    reopened.close()
+
+
+def test_disk_hit_keeps_its_stored_expiry(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResponseCache(path=path, ttl=0.05, metrics=MetricsRegistry())
+    cache.set("VIEW_TASK", "k", "value")
+    cache.close()
+
+    reopened = ResponseCache(path=path, ttl=60, metrics=MetricsRegistry())
+    assert reopened.get("VIEW_TASK", "k") == "value"
+    time.sleep(0.06)
+
+    assert reopened.get("VIEW_TASK", "k") is None
+    reopened.close()
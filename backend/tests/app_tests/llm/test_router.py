@@ -0,0 +1,45 @@
+from app.src.llm.providers import GeminiProvider, ReplayProvider
+from app.src.llm.router import FAST_MODEL, ModelRouter
+from app.src.utils.metrics import MetricsRegistry
+
+
+def test_routes_default_to_the_fast_model(monkeypatch):
+    monkeypatch.delenv("LLM_ROUTES", raising=False)
+    monkeypatch.delenv("LLM_FAST_MODEL", raising=False)
+    router = ModelRouter.from_env(ReplayProvider(), metrics=MetricsRegistry())
+
+    assert router.routes["INTERPRET_COMMAND"] == FAST_MODEL
+    assert "EXTRACT_TASK" not in router.routes
+
+
+def test_routes_are_read_from_env(monkeypatch):
+    monkeypatch.setenv("LLM_ROUTES", "INTERPRET_COMMAND=small, EXTRACT_TASK = large ,BROKEN")
+    router = ModelRouter.from_env(ReplayProvider(), metrics=MetricsRegistry())
+
+    assert router.routes == {"INTERPRET_COMMAND": "small", "EXTRACT_TASK": "large"}
+
+
+def test_select_shares_the_client_between_models():
+    default = GeminiProvider(api_key="fake-key", model="big")
+    router = ModelRouter(default, {"INTERPRET_COMMAND": "small"}, metrics=MetricsRegistry())
+
+    small = router.select("INTERPRET_COMMAND")
+
+    assert small.model == "small"
+    assert small.client is default.client
+    assert router.select("INTERPRET_COMMAND") is small
+    assert router.select("EXTRACT_TASK") is default
+    assert router.can_escalate(small) and not router.can_escalate(default)
+
+
+def test_escalation_rate_per_route():
+    default = GeminiProvider(api_key="fake-key", model="big")
+    router = ModelRouter(default, {"INTERPRET_COMMAND": "small"}, metrics=MetricsRegistry())
+    small = router.select("INTERPRET_COMMAND")
+    for _ in range(4):
+        router.record("INTERPRET_COMMAND", small, 0.1)
+    router.record_escalation("INTERPRET_COMMAND", small)
+
+    assert router.escalation_rate("INTERPRET_COMMAND") == 0.25
+    assert router.escalation_rate("EXTRACT_TASK") == 0.0
+    assert router.metrics.histogram("llm_route_latency_seconds", template="INTERPRET_COMMAND", model="small").count == 4
@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import pytest
+from app.src.llm.resilience import ResiliencePolicy
+from app.src.llm.scheduler import LLMScheduler, Priority, scheduling
+from app.src.utils.metrics import MetricsRegistry
+
+
+def make_scheduler(**kwargs):
+    return LLMScheduler(metrics=MetricsRegistry(), **kwargs)
+
+
+async def queue_call(scheduler, order, session, priority=Priority.INTERACTIVE):
+    with scheduling(session=session, priority=priority):
+        task = asyncio.create_task(use_slot(scheduler, order, f"{session}:{priority.name}"))
+    await asyncio.sleep(0)
+    return task
+
+
+async def use_slot(scheduler, order, name):
+    async with scheduler.slot():
+        order.append(name)
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_limits_requests_in_flight():
+    scheduler = make_scheduler(max_in_flight=2)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        async with scheduler.slot():
+            peak = max(peak, scheduler.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(call() for _ in range(6)))
+
+    assert peak == 2
+    assert scheduler.in_flight == 0
+    assert scheduler.metrics.histogram("llm_queue_wait_seconds", priority="interactive").count == 6
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_served_round_robin():
+    scheduler = make_scheduler(max_in_flight=1)
+    order = []
+    await scheduler.acquire()
+    tasks = [await queue_call(scheduler, order, session) for session in ("a", "a", "a", "b")]
+    assert scheduler.metrics.gauge("llm_queue_depth", priority="interactive") == 4
+
+    scheduler.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["a:INTERACTIVE", "b:INTERACTIVE", "a:INTERACTIVE", "a:INTERACTIVE"]
+
+
+@pytest.mark.asyncio
+async def test_interactive_calls_go_before_background_ones():
+    scheduler = make_scheduler(max_in_flight=1)
+    order = []
+    await scheduler.acquire()
+    tasks = [
+        await queue_call(scheduler, order, "pool", Priority.BACKGROUND),
+        await queue_call(scheduler, order, "a", Priority.SPECULATIVE),
+        await queue_call(scheduler, order, "b", Priority.INTERACTIVE),
+    ]
+
+    scheduler.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["b:INTERACTIVE", "a:SPECULATIVE", "pool:BACKGROUND"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_queue():
+    scheduler = make_scheduler(max_in_flight=1)
+    await scheduler.acquire()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(scheduler.acquire(), 0.01)
+
+    assert scheduler.queue_depth() == 0
+    scheduler.release()
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_requests_per_minute_delay_further_calls():
+    scheduler = make_scheduler(max_in_flight=10, requests_per_minute=2)
+    for _ in range(2):
+        async with scheduler.slot():
+            pass
+
+    waiting = asyncio.create_task(scheduler.acquire())
+    await asyncio.sleep(0.01)
+
+    assert not waiting.done()
+    assert scheduler.queue_depth() == 1
+    assert scheduler.metrics.get("llm_rate_limited") == 1
+    waiting.cancel()
+    scheduler._timer.cancel()
+
+
+@pytest.mark.asyncio
+async def test_wakes_waiters_on_other_event_loops():
+    scheduler = make_scheduler(max_in_flight=1)
+    await scheduler.acquire()
+    done = threading.Event()
+
+    def other_session():
+        asyncio.run(use_slot(scheduler, [], "other"))
+        done.set()
+
+    thread = threading.Thread(target=other_session)
+    thread.start()
+    while not scheduler.queue_depth():
+        await asyncio.sleep(0.001)
+    scheduler.release()
+
+    assert await asyncio.to_thread(done.wait, 1)
+    thread.join()
+
+
+@pytest.mark.asyncio
+async def test_queue_wait_is_not_an_attempt_timeout():
+    scheduler = make_scheduler(max_in_flight=1)
+    policy = ResiliencePolicy(base_delay=0, attempt_timeout=0.05, metrics=MetricsRegistry(), scheduler=scheduler)
+
+    async def call():
+        return "ok"
+
+    await scheduler.acquire()
+    asyncio.get_running_loop().call_later(0.1, scheduler.release)
+
+    assert await policy.execute(call, template="T") == "ok"
+    assert policy.metrics.get("llm_timeouts", template="T") == 0
+    assert scheduler.in_flight == 0
@@ -0,0 +1,56 @@
+import pytest
+from unittest.mock import MagicMock
+from app.src.llm.semantic_cache import SemanticCache
+from app.src.utils.metrics import MetricsRegistry
+
+VECTORS = {
+    "what's late?": [1.0, 0.0, 0.0],
+    "show overdue stuff": [0.98, 0.2, 0.0],
+    "add a task": [0.0, 1.0, 0.0],
+    "delete a task": [0.0, 0.0, 1.0],
+}
+
+
+@pytest.fixture
+def cache():
+    embedder = MagicMock()
+    embedder.embed.side_effect = lambda text: VECTORS[text]
+    return SemanticCache(embedder=embedder, capacity=2, threshold=0.9, metrics=MetricsRegistry())
+
+
+def test_paraphrase_is_answered_from_nearest_neighbour(cache):
+    cache.store("VIEW_TASK:a", cache.embed("what's late?"), {"status": "specific", "choice": "3"})
+
+    result = cache.lookup("VIEW_TASK:a", cache.embed("show overdue stuff"))
+
+    assert result == {"status": "specific", "choice": "3"}
+    assert cache.metrics.get("semantic_cache_hits", namespace="VIEW_TASK") == 1
+
+
+def test_lookup_misses_below_threshold_and_in_other_namespaces(cache):
+    cache.store("VIEW_TASK:a", cache.embed("what's late?"), {"choice": "3"})
+
+    assert cache.lookup("VIEW_TASK:a", cache.embed("add a task")) is None
+    assert cache.lookup("INTERPRET_COMMAND:a", cache.embed("what's late?")) is None
+    assert cache.lookup("VIEW_TASK:a", cache.embed("show overdue stuff"), threshold=0.999) is None
+
+
+def test_least_recently_used_entry_is_evicted(cache):
+    cache.store("IC:a", cache.embed("what's late?"), "1")
+    cache.store("IC:a", cache.embed("add a task"), "2")
+    cache.lookup("IC:a", cache.embed("what's late?"))
+
+    cache.store("IC:a", cache.embed("delete a task"), "4")
+
+    assert len(cache) == 2
+    assert cache.lookup("IC:a", cache.embed("add a task")) is None
+    assert cache.lookup("IC:a", cache.embed("what's late?")) == "1"
+
+
+def test_namespace_without_entries_is_forgotten(cache):
+    cache.store("DATE:monday", cache.embed("what's late?"), "1")
+    cache.store("DATE:tuesday", cache.embed("add a task"), "2")
+    cache.store("DATE:tuesday", cache.embed("delete a task"), "4")
+
+    assert "DATE:monday" not in cache._namespace_ids
+    assert cache.lookup("DATE:tuesday", cache.embed("add a task")) == "2"
@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import pytest
+from unittest.mock import AsyncMock
+from app.src.llm.single_flight import SingleFlight
+from app.src.utils.metrics import MetricsRegistry
+
+
+def slow_call(result, delay=0.01):
+    async def call():
+        await asyncio.sleep(delay)
+        return result
+    return AsyncMock(side_effect=call)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_result():
+    flight = SingleFlight(metrics=MetricsRegistry())
+    call = slow_call("menu")
+
+    results = await asyncio.gather(*(flight.do("prompt", call, template="MENU") for _ in range(4)))
+
+    assert results == ["menu"] * 4
+    assert call.await_count == 1
+    assert flight.metrics.get("llm_deduplicated", template="MENU") == 3
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_different_or_sequential_prompts_are_not_shared():
+    flight = SingleFlight(metrics=MetricsRegistry())
+    call = slow_call("answer")
+
+    await asyncio.gather(flight.do("a", call), flight.do("b", call))
+    await flight.do("a", call)
+
+    assert call.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_leader_errors_reach_followers():
+    flight = SingleFlight(metrics=MetricsRegistry())
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(flight.do("p", failing), flight.do("p", failing), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_followers_of_a_cancelled_leader_call_themselves():
+    flight = SingleFlight(metrics=MetricsRegistry())
+    leader = asyncio.create_task(flight.do("p", slow_call("first", delay=1)))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("p", slow_call("second")))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+
+    assert await follower == "second"
+
+
+@pytest.mark.asyncio
+async def test_followers_on_other_event_loops_get_the_result():
+    flight = SingleFlight(metrics=MetricsRegistry())
+    call = slow_call("shared", delay=0.2)
+    results = []
+
+    def other_session():
+        results.append(asyncio.run(flight.do("p", call)))
+
+    leader = asyncio.create_task(flight.do("p", call))
+    await asyncio.sleep(0)
+    thread = threading.Thread(target=other_session)
+    thread.start()
+
+    assert await leader == "shared"
+    await asyncio.to_thread(thread.join)
+    assert results == ["shared"]
+    assert call.await_count == 1
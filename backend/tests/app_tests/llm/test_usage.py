@@ -0,0 +1,35 @@
+from app.src.llm.usage import estimate_tokens, format_summary, reprompts, summarize
+from app.src.utils.metrics import MetricsRegistry
+
+
+def test_summarize_orders_templates_by_total_latency():
+    registry = MetricsRegistry()
+    registry.increment("llm_calls", 2, template="INTERPRET_COMMAND")
+    registry.observe("llm_latency_seconds", 0.4, template="INTERPRET_COMMAND")
+    registry.observe("llm_latency_seconds", 0.6, template="INTERPRET_COMMAND")
+    registry.increment("llm_calls", template="EXTRACT_TASK")
+    registry.observe("llm_latency_seconds", 3.0, template="EXTRACT_TASK")
+    registry.increment("llm_parse_failures", template="EXTRACT_TASK")
+    registry.increment("llm_cache_hits", template="EXTRACT_TASK", tier="memory")
+
+    rows = summarize(registry)
+
+    assert [row["template"] for row in rows] == ["EXTRACT_TASK", "INTERPRET_COMMAND"]
+    assert rows[0]["parse_failures"] == 1
+    assert rows[0]["cache_hits"] == 1
+    assert rows[1]["calls"] == 2
+    assert rows[1]["latency_mean"] == 0.5
+    assert "EXTRACT_TASK" in format_summary(rows).splitlines()[1]
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcde") == 2
+
+
+def test_reprompts_are_counted_per_request_field():
+    registry = MetricsRegistry()
+    registry.increment("llm_reprompts", request="add_task", field="title")
+    registry.increment("llm_reprompts", request="add_task", field="title")
+
+    assert reprompts(registry) == {"add_task.title": 2}
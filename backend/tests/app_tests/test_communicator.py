@@ -0,0 +1,33 @@
+import pytest
+from unittest.mock import AsyncMock
+from app.src.communicator import SocketIoCommunicator
+
+
+async def chunks(*parts):
+    for part in parts:
+        yield part
+
+
+@pytest.mark.asyncio
+async def test_socketio_output_stream_emits_chunks_and_completion_marker():
+    sio = AsyncMock()
+    communicator = SocketIoCommunicator(sio, "sid-1")
+
+    text = await communicator.output_stream(chunks("Hello ", "there"))
+
+    assert text == "Hello there"
+    events = [call.args for call in sio.emit.await_args_list]
+    assert [event for event, _ in events] == ["chat_message_chunk"] * 3
+    assert [payload["text"] for _, payload in events] == ["Hello ", "there", ""]
+    assert [payload["done"] for _, payload in events] == [False, False, True]
+    assert len({payload["id"] for _, payload in events}) == 1
+
+
+@pytest.mark.asyncio
+async def test_socketio_input_without_prompt_does_not_emit():
+    sio = AsyncMock()
+    communicator = SocketIoCommunicator(sio, "sid-1")
+    communicator.queue.put_nowait("2")
+
+    assert await communicator.input("") == "2"
+    sio.emit.assert_not_awaited()
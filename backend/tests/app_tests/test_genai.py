@@ -1,34 +1,44 @@
+import asyncio
 import unittest
 from unittest.mock import MagicMock
 from datetime import date
 from app.src.utils.menus import MenuChoice
 from app.src.genai import AICommandInterpreter
+from app.src.llm.response_cache import ResponseCache
+from app.src.llm.resilience import ResiliencePolicy
+from app.src.llm.router import ModelRouter
+from app.src.utils.metrics import MetricsRegistry
 
-class TestAICommandInterpreter(unittest.TestCase):
+class TestAICommandInterpreter(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
         self.api_key = "fake-key"
-        self.ai = AICommandInterpreter(api_key=self.api_key)
+        self.metrics = MetricsRegistry()
+        self.ai = AICommandInterpreter(
+            api_key=self.api_key,
+            resilience=ResiliencePolicy(base_delay=0, metrics=self.metrics),
+            metrics=self.metrics
+        )
         self.mock_model = MagicMock()
-        self.ai.client.models.generate_content = self.mock_model
+        self.ai.provider.client.models.generate_content = self.mock_model
 
-    def test_interpret_command_valid(self):
+    async def test_interpret_command_valid(self):
         self.mock_model.return_value.text = "2"
-        choice = self.ai.interpret_command("add", "1. View Tasks\n2. Add Task")
+        choice = await self.ai.interpret_command("add", "1. View Tasks\n2. Add Task")
         self.assertEqual(choice, MenuChoice.ADD_TASK)
 
-    def test_interpret_command_invalid_option(self):
+    async def test_interpret_command_invalid_option(self):
         self.mock_model.return_value.text = "invalid"
-        choice = self.ai.interpret_command("blah", "1. Add\n2. View")
+        choice = await self.ai.interpret_command("blah", "1. Add\n2. View")
         self.assertEqual(choice, MenuChoice.NONE)
 
-    def test_interpret_command_exception_handling(self):
+    async def test_interpret_command_exception_handling(self):
         self.mock_model.side_effect = Exception("API error")
-        choice = self.ai.interpret_command("add", "1. Add\n2. View")
+        choice = await self.ai.interpret_command("add", "1. Add\n2. View")
         self.assertEqual(choice, MenuChoice.NONE)
         self.mock_model.side_effect = None
 
 
-    def test_extract_task_data_valid(self):
+    async def test_extract_task_data_valid(self):
         today = date.today().strftime("%Y-%m-%d")
         self.mock_model.return_value.text = f"""```json
         {{
@@ -36,48 +46,208 @@ class TestAICommandInterpreter(unittest.TestCase):
             "date": "{today}"
         }}
         ```"""
-        result = self.ai.extract_task_data("Buy milk today")
+        result = await self.ai.extract_task_data("Buy milk today")
         self.assertEqual(result["name"], "Buy milk")
         self.assertEqual(result["date"], today)
 
-    def test_extract_task_data_invalid_json(self):
+    async def test_extract_task_data_keeps_the_llm_date_over_the_local_one(self):
+        self.mock_model.return_value.text = '{"name": "Review the 2nd draft", "date": "2030-01-04"}'
+        result = await self.ai.extract_task_data("review the 2nd draft by friday")
+        self.assertEqual(result, {"name": "Review the 2nd draft", "date": "2030-01-04"})
+
+    async def test_extract_task_data_invalid_json(self):
         self.mock_model.return_value.text = "not json"
-        data = self.ai.extract_task_data("nonsense")
+        data = await self.ai.extract_task_data("nonsense")
         self.assertEqual(data, {"name": None, "date": None})
 
-    def test_extract_task_data_api_failure(self):
+    async def test_extractors_request_structured_output(self):
+        self.mock_model.return_value.text = '{"task_id": "7", "task_title": "None"}'
+        result = await self.ai.extract_task_id_or_title("finish task seven")
+        self.assertEqual(result, {"task_id": 7, "task_title": None})
+        config = self.mock_model.call_args.kwargs["config"]
+        self.assertEqual(config.response_mime_type, "application/json")
+        self.assertEqual(config.response_schema.__name__, "TaskReference")
+
+    async def test_answers_violating_the_schema_fall_back(self):
+        self.mock_model.return_value.text = '{"status": "maybe", "choice": "9"}'
+        result = await self.ai.interpret_view_task_command("show me stuff", "1. Completed")
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(self.metrics.get("llm_parse_failures", template="VIEW_TASK"), 1)
+
+    async def test_view_commands_are_not_answered_from_the_semantic_cache(self):
+        self.ai.semantic_cache = MagicMock(ready=True)
+        self.mock_model.return_value.text = '{"status": "specific", "choice": "2"}'
+        result = await self.ai.interpret_view_task_command("show my uncompleted tasks", "1. Completed\n2. Incomplete")
+        self.assertEqual(result["choice"], "2")
+        self.ai.semantic_cache.lookup.assert_not_called()
+        self.ai.semantic_cache.store.assert_not_called()
+
+    async def test_extract_task_data_records_usage_and_parse_failures(self):
+        self.mock_model.return_value.text = "not json"
+        await self.ai.extract_task_data("nonsense")
+        self.assertEqual(self.metrics.get("llm_calls", template="EXTRACT_TASK"), 1)
+        self.assertEqual(self.metrics.get("llm_parse_failures", template="EXTRACT_TASK"), 1)
+        self.assertGreater(self.metrics.get("llm_prompt_tokens", template="EXTRACT_TASK"), 0)
+        self.assertEqual(self.metrics.histogram("llm_latency_seconds", template="EXTRACT_TASK").count, 1)
+
+    async def test_extract_task_data_api_failure(self):
         self.mock_model.side_effect = Exception("Data API error")
-        data = self.ai.extract_task_data("Buy milk today")
+        data = await self.ai.extract_task_data("Buy milk today")
         self.assertEqual(data, {"name": None, "date": None})
         self.mock_model.side_effect = None
 
-    def test_extract_task_id_or_title_valid(self):
+    async def test_extract_task_id_or_title_valid(self):
         self.mock_model.return_value.text = '{"task_id": 123, "task_title": "Clean"}'
-        result = self.ai.extract_task_id_or_title("Mark task 123 done")
+        result = await self.ai.extract_task_id_or_title("Mark task 123 done")
         self.assertEqual(result["task_id"], 123)
         self.assertEqual(result["task_title"], "Clean")
 
-    def test_extract_task_id_or_title_invalid_json(self):
+    async def test_extract_task_id_or_title_invalid_json(self):
         self.mock_model.return_value.text = "invalid"
-        result = self.ai.extract_task_id_or_title("nonsense")
+        result = await self.ai.extract_task_id_or_title("nonsense")
         self.assertEqual(result, {"task_id": None, "task_title": None})
 
-    def test_extract_task_id_or_title_api_failure(self):
+    async def test_extract_task_id_or_title_api_failure(self):
         self.mock_model.side_effect = Exception("ID API fail")
-        result = self.ai.extract_task_id_or_title("Finish task")
+        result = await self.ai.extract_task_id_or_title("Finish task")
         self.assertEqual(result, {"task_id": None, "task_title": None})
         self.mock_model.side_effect = None
 
-    def test_interpret_command_add_task_exact(self):
+    async def test_interpret_command_add_task_exact(self):
         self.mock_model.return_value.text = "2"
-        result = self.ai.interpret_command("add a task", "1. View Tasks\n2. Add Task")
+        result = await self.ai.interpret_command("add a task", "1. View Tasks\n2. Add Task")
         self.assertEqual(result, MenuChoice.ADD_TASK)
 
-    def test_interpret_command_typo(self):
+    async def test_interpret_command_typo(self):
         self.mock_model.return_value.text = "None"
-        result = self.ai.interpret_command("create a tesl", "1. View Tasks\n2. Add Task")
+        result = await self.ai.interpret_command("create a tesl", "1. View Tasks\n2. Add Task")
         self.assertEqual(result, MenuChoice.NONE)
-        
+
+    async def test_extract_task_id_or_title_served_from_response_cache(self):
+        self.ai.response_cache = ResponseCache(path=None)
+        self.mock_model.return_value.text = '{"task_id": 7, "task_title": null}'
+        first = await self.ai.extract_task_id_or_title("Finish task 7")
+        second = await self.ai.extract_task_id_or_title("Finish  task 7 ")
+        self.assertEqual(first, second)
+        self.assertEqual(self.mock_model.call_count, 1)
+
+    async def test_extract_task_date_filter_parsed_locally(self):
+        result = await self.ai.extract_task_date_filter("2025-03-01")
+        self.assertEqual(result, {"date": "2025-03-01"})
+        self.mock_model.assert_not_called()
+
+    async def test_stream_conversational_response_yields_chunks(self):
+        self.ai.provider.client.models.generate_content_stream = MagicMock(
+            return_value=iter([MagicMock(text="Sure, "), MagicMock(text=None), MagicMock(text="adding it!")])
+        )
+        chunks = [chunk async for chunk in self.ai.stream_conversational_response("add milk", MenuChoice.ADD_TASK)]
+        self.assertEqual(chunks, ["Sure, ", "adding it!"])
+
+    async def test_stream_conversational_response_falls_back_on_failure(self):
+        self.ai.resilience = ResiliencePolicy(max_attempts=1)
+        self.ai.provider.client.models.generate_content_stream = MagicMock(side_effect=Exception("stream error"))
+        chunks = [chunk async for chunk in self.ai.stream_conversational_response("add milk", MenuChoice.ADD_TASK)]
+        self.assertEqual(len(chunks), 1)
+        self.assertIn("add_task", chunks[0])
+
+    async def test_concurrent_identical_prompts_share_one_call(self):
+        self.mock_model.return_value.text = '{"task_id": 3, "task_title": null}'
+        results = await asyncio.gather(*(self.ai.extract_task_id_or_title("finish task 3") for _ in range(5)))
+        self.assertEqual(results, [{"task_id": 3, "task_title": None}] * 5)
+        self.assertEqual(self.mock_model.call_count, 1)
+        self.assertEqual(self.metrics.get("llm_deduplicated", template="EXTRACT_ID_OR_TITLE"), 4)
+
+    def _routed_ai(self, answers):
+        router = ModelRouter(self.ai.provider, {"INTERPRET_COMMAND": "small"}, metrics=self.metrics)
+        ai = AICommandInterpreter(provider=self.ai.provider, router=router, metrics=self.metrics,
+                                  resilience=ResiliencePolicy(base_delay=0, metrics=self.metrics))
+        self.mock_model.side_effect = lambda model, contents, **kwargs: MagicMock(text=answers[model])
+        return ai
+
+    async def test_routed_template_uses_the_fast_model(self):
+        ai = self._routed_ai({"small": "2", "gemini-2.0-flash": "1"})
+        choice = await ai.interpret_command("add milk", "1. View\n2. Add")
+        self.assertEqual(choice, MenuChoice.ADD_TASK)
+        self.assertEqual(self.mock_model.call_count, 1)
+        self.assertEqual(self.metrics.get("llm_route_calls", template="INTERPRET_COMMAND", model="small"), 1)
+
+    async def test_invalid_fast_model_answer_escalates_to_the_default_model(self):
+        ai = self._routed_ai({"small": "Option two!", "gemini-2.0-flash": "2"})
+        choice = await ai.interpret_command("add milk", "1. View\n2. Add")
+        self.assertEqual(choice, MenuChoice.ADD_TASK)
+        self.assertEqual(self.mock_model.call_count, 2)
+        self.assertEqual(ai.router.escalation_rate("INTERPRET_COMMAND"), 1.0)
+
+    async def test_concurrent_classifications_are_batched(self):
+        ai = AICommandInterpreter(api_key=self.api_key, metrics=self.metrics, batch_window=0.01,
+                                  resilience=ResiliencePolicy(base_delay=0, metrics=self.metrics))
+        ai.provider.client.models.generate_content = self.mock_model
+        self.mock_model.return_value.text = '["2", "1", "None"]'
+
+        choices = await asyncio.gather(*(ai.interpret_command(text, "1. View\n2. Add")
+                                         for text in ("add milk", "show tasks", "hello")))
+
+        self.assertEqual(choices, [MenuChoice.ADD_TASK, MenuChoice.VIEW_TASKS, MenuChoice.NONE])
+        self.assertEqual(self.mock_model.call_count, 1)
+
+    async def test_unparseable_batch_falls_back_to_single_classifications(self):
+        ai = AICommandInterpreter(api_key=self.api_key, metrics=self.metrics, batch_window=0.01,
+                                  resilience=ResiliencePolicy(base_delay=0, metrics=self.metrics))
+        ai.provider.client.models.generate_content = self.mock_model
+        self.mock_model.side_effect = lambda model, contents, **kwargs: MagicMock(
+            text="sorry" if "numbered list" in contents[0] else "3"
+        )
+
+        choices = await asyncio.gather(ai.interpret_command("done 1", "3. Done"), ai.interpret_command("done 2", "3. Done"))
+
+        self.assertEqual(choices, [MenuChoice.MARK_DONE, MenuChoice.MARK_DONE])
+        self.assertEqual(self.mock_model.call_count, 3)
+        self.assertEqual(self.metrics.get("llm_batch_fallbacks", batcher="INTERPRET_COMMAND"), 1)
+
+
+    def _answer_by_template(self, intent):
+        def generate_content(model, contents, **kwargs):
+            prompt = contents[0]
+            if "option number" in prompt:
+                return MagicMock(text=intent)
+            if '"status": "specific"' in prompt:
+                return MagicMock(text='{"status": "specific", "choice": "5"}')
+            return MagicMock(text='{"name": "Buy milk", "date": "None"}')
+        return generate_content
+
+    async def test_speculative_extraction_is_reused_by_matching_intent(self):
+        self.mock_model.side_effect = self._answer_by_template("2")
+        choice = await self.ai.interpret_command_speculative("add buy milk", "1. View Tasks\n2. Add Task")
+        self.assertEqual(choice, MenuChoice.ADD_TASK)
+
+        result = await self.ai.extract_task_data("add buy milk")
+        self.assertEqual(result["name"], "Buy milk")
+        self.assertEqual(self.mock_model.call_count, 2)
+        self.assertEqual(self.metrics.get("llm_speculation_hits", method="extract_task_data"), 1)
+
+    async def test_speculative_extractions_of_other_intents_are_cancelled(self):
+        self.mock_model.side_effect = self._answer_by_template("4")
+        choice = await self.ai.interpret_command_speculative("I no longer need to see the milk one", "1. View\n4. Delete")
+        self.assertEqual(choice, MenuChoice.DELETE_TASK)
+        self.assertEqual(self.metrics.get("llm_speculations_wasted", method="extract_task_data"), 1)
+        self.assertEqual(self.metrics.get("llm_speculations_wasted", method="interpret_view_task_command"), 1)
+        self.assertIsNone(self.ai._take_speculation("extract_task_id_or_title", "I no longer need to see the milk one"))
+
+    async def test_input_without_an_intent_hint_is_not_speculated_on(self):
+        self.mock_model.side_effect = self._answer_by_template("None")
+        choice = await self.ai.interpret_command_speculative("thanks", "1. View Tasks\n2. Add Task")
+        self.assertEqual(choice, MenuChoice.NONE)
+        self.assertEqual(self.mock_model.call_count, 1)
+        self.assertEqual(self.metrics.get("llm_speculations", method="extract_task_data"), 0)
+
+    async def test_speculative_view_lookup_with_other_options_is_cancelled(self):
+        self.mock_model.side_effect = self._answer_by_template("1")
+        choice = await self.ai.interpret_command_speculative("show my tasks", "1. View Tasks\n2. Add Task")
+        self.assertEqual(choice, MenuChoice.VIEW_TASKS)
+
+        await self.ai.interpret_view_task_command("show my tasks", "5. Only overdue")
+        self.assertEqual(self.metrics.get("llm_speculations_wasted", method="interpret_view_task_command"), 1)
+        self.assertEqual(self.metrics.get("llm_speculation_hits", method="interpret_view_task_command"), 0)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,120 @@
+import json
+
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import Distance, PointStruct, VectorParams
+
+from app.src.reindex import Reindexer
+from app.src.utils.metrics import MetricsRegistry
+from app.src.vector_store.qdrant_client import CollectionConfig
+from app.src.vector_store.task_vector_store import TaskVectorStore, user_filter
+
+
+class FakeTaskService:
+    def __init__(self, count, fail_after=None):
+        self.tasks = [{"id": i, "title": f"Task {i}", "user_id": i % 3, "due_date": None} for i in range(1, count + 1)]
+        self.fail_after = fail_after
+        self.requests = []
+
+    async def get_tasks_page(self, after_id=0, limit=500):
+        self.requests.append(after_id)
+        if self.fail_after is not None and after_id >= self.fail_after:
+            raise ConnectionError("API down")
+        return [task for task in self.tasks if task["id"] > after_id][:limit]
+
+
+class FakeEmbedder:
+    def embed_many(self, texts):
+        return [[float(len(text)), 1.0, 0.5] for text in texts]
+
+
+def reindexer(client, task_service, tmp_path, **kwargs):
+    return Reindexer(
+        task_service=task_service,
+        client=client,
+        embedder=FakeEmbedder(),
+        vector_size=3,
+        page_size=4,
+        chunk_size=2,
+        workers=2,
+        checkpoint_path=str(tmp_path / "checkpoint.json"),
+        metrics=MetricsRegistry(),
+        **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_reindex_builds_collection_and_points_alias_to_it(tmp_path):
+    client = QdrantClient(":memory:")
+    client.create_collection("tasks", vectors_config=VectorParams(size=3, distance=Distance.COSINE))
+
+    indexed = await reindexer(client, FakeTaskService(10), tmp_path).run()
+
+    assert indexed == 10
+    assert client.count("tasks").count == 10
+    [alias] = client.get_aliases().aliases
+    assert alias.alias_name == "tasks"
+    assert [c.name for c in client.get_collections().collections] == [alias.collection_name]
+    assert not (tmp_path / "checkpoint.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_reindex_resumes_from_checkpoint_after_a_failure(tmp_path):
+    client = QdrantClient(":memory:")
+    failing = FakeTaskService(10, fail_after=8)
+
+    with pytest.raises(ConnectionError):
+        await reindexer(client, failing, tmp_path).run()
+    checkpoint = json.loads((tmp_path / "checkpoint.json").read_text())
+    assert checkpoint["after_id"] == 8
+    assert client.get_aliases().aliases == []
+
+    resumed = FakeTaskService(10)
+    indexed = await reindexer(client, resumed, tmp_path).run()
+
+    assert resumed.requests[0] == 8
+    assert indexed == 10
+    assert client.count(checkpoint["collection"]).count == 10
+    assert client.get_aliases().aliases[0].collection_name == checkpoint["collection"]
+
+
+@pytest.mark.asyncio
+async def test_reindex_drops_previous_collection_after_swap(tmp_path):
+    client = QdrantClient(":memory:")
+    await reindexer(client, FakeTaskService(3), tmp_path).run()
+    first = client.get_aliases().aliases[0].collection_name
+
+    # Resume into a named collection so the rebuild does not reuse the first build's name
+    (tmp_path / "checkpoint.json").write_text(json.dumps({"collection": "tasks_rebuild", "after_id": 0, "indexed": 0}))
+    client.create_collection("tasks_rebuild", vectors_config=VectorParams(size=3, distance=Distance.COSINE))
+    await reindexer(client, FakeTaskService(5), tmp_path).run()
+
+    assert client.get_aliases().aliases[0].collection_name == "tasks_rebuild"
+    assert not client.collection_exists(first)
+    assert client.count("tasks").count == 5
+
+
+@pytest.mark.asyncio
+async def test_reindex_copy_migrates_vectors_to_the_tenant_layout(tmp_path):
+    client = QdrantClient(":memory:")
+    client.create_collection("tasks", vectors_config=VectorParams(size=3, distance=Distance.COSINE))
+    client.upsert("tasks", points=[
+        PointStruct(id=i, vector=[float(i), 1.0, 0.5], payload={"task_id": i, "title": f"Task {i}", "user": i % 3})
+        for i in range(1, 8)
+    ])
+    migration = reindexer(client, FakeTaskService(0), tmp_path, config=CollectionConfig(tenants=True), copy=True)
+
+    copied = await migration.run()
+
+    assert copied == 7
+    [alias] = client.get_aliases().aliases
+    assert alias.alias_name == "tasks" and alias.collection_name != "tasks"
+    points, _ = client.scroll("tasks", limit=10, with_vectors=True)
+    assert {point.payload["tenant"] for point in points} == {"0", "1", "2"}
+    assert next(point for point in points if point.id == 4).vector == pytest.approx(
+        [v / (16 + 1 + 0.25) ** 0.5 for v in (4.0, 1.0, 0.5)]
+    )
+    store = TaskVectorStore(client=client, embedder=FakeEmbedder(), config=CollectionConfig(tenants=True))
+    assert client.count("tasks", count_filter=user_filter(1, tenants=True)).count == 3
+    store.remove(4, user_id=1)
+    assert client.count("tasks").count == 6
@@ -0,0 +1,89 @@
+import time
+import pytest
+from datetime import date
+from app.src.utils.date_parser import parse_date_expression, remainder, normalize_date
+
+# Wednesday
+TODAY = date(2025, 7, 9)
+
+CASES = [
+    ("today", {"date": "2025-07-09"}),
+    ("tonight", {"date": "2025-07-09"}),
+    ("tomorrow", {"date": "2025-07-10"}),
+    ("the day after tomorrow", {"date": "2025-07-11"}),
+    ("yesterday", {"date": "2025-07-08"}),
+    ("friday", {"date": "2025-07-11"}),
+    ("this Friday", {"date": "2025-07-11"}),
+    ("on wednesday", {"date": "2025-07-09"}),
+    ("next Friday", {"date": "2025-07-18"}),
+    ("next monday", {"date": "2025-07-14"}),
+    ("last monday", {"date": "2025-07-07"}),
+    ("in 3 days", {"date": "2025-07-12"}),
+    ("in two weeks", {"date": "2025-07-23"}),
+    ("in a month", {"date": "2025-08-09"}),
+    ("a couple of days from now", {"date": "2025-07-11"}),
+    ("2025-03-01", {"date": "2025-03-01"}),
+    ("2025/06/05", {"date": "2025-06-05"}),
+    ("06/05/2025", {"date": "2025-06-05"}),
+    ("on July 1st", {"date": "2025-07-01"}),
+    ("July 15", {"date": "2025-07-15"}),
+    ("15th of August", {"date": "2025-08-15"}),
+    ("Dec 31, 2026", {"date": "2026-12-31"}),
+    ("Jan 3", {"date": "2026-01-03"}),
+    ("the 5th", {"date": "2025-08-05"}),
+    ("move it to the 12th", {"date": "2025-07-12"}),
+    ("finish the report by the 20th", {"date": "2025-07-20"}),
+    ("between the 10th and the 14th", {"start": "2025-07-10", "end": "2025-07-14"}),
+    ("end of the month", {"date": "2025-07-31"}),
+    ("this week", {"start": "2025-07-07", "end": "2025-07-13"}),
+    ("next week", {"start": "2025-07-14", "end": "2025-07-20"}),
+    ("this weekend", {"start": "2025-07-12", "end": "2025-07-13"}),
+    ("next month", {"start": "2025-08-01", "end": "2025-08-31"}),
+    ("between July 10 and July 14", {"start": "2025-07-10", "end": "2025-07-14"}),
+    ("from 7/10/2025 to 7/12/2025", {"start": "2025-07-10", "end": "2025-07-12"}),
+    ("What do I have on July 15?", {"date": "2025-07-15"}),
+    ("Show me what's due next week", {"start": "2025-07-14", "end": "2025-07-20"}),
+]
+
+
+@pytest.mark.parametrize("text,expected", CASES)
+def test_parse_date_expression_table(text, expected):
+    match = parse_date_expression(text, TODAY)
+
+    assert match is not None
+    assert match.to_filter() == expected
+
+
+@pytest.mark.parametrize("text", ["show me my tasks", "add a task", "buy 2 apples", "march on",
+                                  "review the 2nd draft", "read the 3rd chapter", "plan the 1st quarter"])
+def test_parse_date_expression_returns_none_without_date(text):
+    assert parse_date_expression(text, TODAY) is None
+
+
+def test_remainder_drops_date_and_filler_words():
+    assert remainder("change the due date to next Friday", parse_date_expression("change the due date to next Friday", TODAY)) == ""
+    assert remainder("Buy milk tomorrow", parse_date_expression("Buy milk tomorrow", TODAY)) == "buy milk"
+
+
+def test_ordinals_in_titles_are_not_dates():
+    match = parse_date_expression("review the 2nd draft by friday", TODAY)
+
+    assert match.to_filter() == {"date": "2025-07-11"}
+    assert parse_date_expression("show tasks for the 3rd floor meeting", TODAY) is None
+
+
+def test_normalize_date_uses_range_end_as_deadline():
+    assert normalize_date("2025-12-31", TODAY) == "2025-12-31"
+    assert normalize_date("next week", TODAY) == "2025-07-20"
+    assert normalize_date("None", TODAY) is None
+    assert normalize_date("2025-02-30", TODAY) is None
+
+
+def test_parse_date_expression_is_fast():
+    start = time.perf_counter()
+    for _ in range(200):
+        for text, _ in CASES:
+            parse_date_expression(text, TODAY)
+    per_call = (time.perf_counter() - start) / (200 * len(CASES))
+
+    assert per_call < 0.001
@@ -0,0 +1,46 @@
+import math
+from app.src.utils.metrics import Histogram, MetricsRegistry
+
+
+def test_counters_are_labelled():
+    registry = MetricsRegistry()
+    registry.increment("calls", template="A")
+    registry.increment("calls", 2, template="A")
+    registry.increment("calls", template="B")
+
+    assert registry.get("calls", template="A") == 3
+    assert registry.get("calls", template="B") == 1
+    assert registry.get("calls", template="C") == 0
+
+
+def test_histogram_quantiles_use_bucket_bounds():
+    histogram = Histogram(buckets=(0.1, 1.0, math.inf))
+    for value in [0.05] * 90 + [0.5] * 9 + [30.0]:
+        histogram.observe(value)
+
+    assert histogram.count == 100
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.95) == 1.0
+    assert histogram.quantile(1.0) == math.inf
+
+
+def test_registry_histograms_are_copies_and_reset():
+    registry = MetricsRegistry()
+    registry.observe("latency", 0.2, template="A")
+    histogram = registry.histogram("latency", template="A")
+    histogram.observe(5.0)
+
+    assert registry.histogram("latency", template="A").count == 1
+    registry.reset()
+    assert registry.histogram("latency", template="A") is None
+
+
+def test_gauges_keep_the_last_value():
+    registry = MetricsRegistry()
+    registry.set_gauge("depth", 3, priority="interactive")
+    registry.set_gauge("depth", 1, priority="interactive")
+
+    assert registry.gauge("depth", priority="interactive") == 1
+    assert registry.gauge("depth", priority="background") == 0
+    registry.reset()
+    assert registry.gauge("depth", priority="interactive") == 0
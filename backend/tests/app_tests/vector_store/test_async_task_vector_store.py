@@ -0,0 +1,100 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+import pytest
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import Distance, VectorParams
+
+from app.src.utils.metrics import MetricsRegistry
+from app.src.vector_store.async_task_vector_store import AsyncTaskVectorStore
+from app.src.vector_store.interfaces import TaskVector
+
+
+class ThreadRecordingEmbedder:
+    def __init__(self):
+        self.threads = set()
+        self.loaded = Future()
+        self.loaded.set_result(None)
+
+    @property
+    def ready(self):
+        return self.loaded.done()
+
+    def warm_up(self):
+        return self.loaded
+
+    def embed(self, text):
+        self.threads.add(threading.current_thread().name)
+        return [1.0, float(len(text)), 0.0]
+
+    def embed_many(self, texts):
+        return [self.embed(text) for text in texts]
+
+
+async def memory_store(embedder, **kwargs):
+    client = AsyncQdrantClient(":memory:")
+    await client.create_collection("test_tasks", vectors_config=VectorParams(size=3, distance=Distance.COSINE))
+    return AsyncTaskVectorStore(client_factory=lambda: client, embedder=embedder, collection_name="test_tasks", batch_size=2, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_async_store_adds_searches_and_removes_off_the_loop():
+    embedder = ThreadRecordingEmbedder()
+    store = await memory_store(embedder)
+
+    await store.add(task_id=1, title="Buy milk", user_id=7, due_date="2025-01-01")
+    await store.add_many([TaskVector(2, "Call mom", 7), TaskVector(3, "Pay rent", 8), TaskVector(4, "Fix car", 7)])
+    results = await store.search("Buy milk", user_id=7, top_k=5)
+
+    assert {point.payload["task_id"] for point in results} == {1, 2, 4}
+    assert threading.current_thread().name not in embedder.threads
+
+    await store.remove(task_id=1, user_id=7)
+    await store.remove_many([2, 4], user_id=7)
+    assert await store.search("Buy milk", user_id=7) == []
+    assert len(await store.search("Pay rent", user_id=8)) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_store_matches_titles_lexically_while_the_model_loads():
+    embedder = ThreadRecordingEmbedder()
+    registry = MetricsRegistry()
+    store = await memory_store(embedder, warm_up_wait=0.01, metrics=registry)
+    await store.add_many([TaskVector(1, "Buy milk", 7), TaskVector(2, "Buy a new car", 7), TaskVector(3, "Buy milk", 8)])
+    embedder.loaded = Future()
+
+    results = await store.search("buy milk today", user_id=7)
+
+    assert [point.payload["task_id"] for point in results] == [1, 2]
+    assert results[0].score > results[1].score
+    assert registry.get("vector_search_lexical_fallbacks") == 1
+
+    embedder.loaded.set_result(None)
+    await store.search("buy milk today", user_id=7)
+    assert registry.get("vector_search_lexical_fallbacks") == 1
+
+
+def test_async_store_creates_one_client_per_event_loop():
+    created = []
+
+    def factory():
+        created.append(threading.get_ident())
+        return object()
+
+    store = AsyncTaskVectorStore(client_factory=factory, embedder=ThreadRecordingEmbedder())
+
+    async def clients():
+        return store.client, store.client
+
+    def session():
+        first, second = asyncio.run(clients())
+        assert first is second
+
+    threads = [threading.Thread(target=session) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 2
@@ -0,0 +1,96 @@
+import numpy as np
+
+from app.src.utils.metrics import MetricsRegistry
+from app.src.vector_store import text_embedder
+from app.src.vector_store.embedding_cache import EmbeddingCache
+
+
+class FakeModel:
+    def __init__(self, model_name, *args):
+        self.calls = []
+
+    def encode(self, text, batch_size=32):
+        self.calls.append(text)
+        if isinstance(text, list):
+            return np.array([[len(item), 1.0, 2.0] for item in text], dtype=np.float32)
+        return np.array([len(text), 1.0, 2.0], dtype=np.float32)
+
+
+def test_memory_cache_hits_and_evicts_least_recently_used():
+    registry = MetricsRegistry()
+    cache = EmbeddingCache("model", max_memory_entries=2, metrics=registry)
+    cache.put("a", np.ones(3))
+    cache.put("b", np.zeros(3))
+    assert cache.get("a") is not None
+    cache.put("c", np.ones(3))
+
+    assert cache.get("b") is None
+    assert np.array_equal(cache.get("a"), np.ones(3, dtype=np.float32))
+    assert registry.get("embedding_cache_hits", tier="memory") == 2
+    assert registry.get("embedding_cache_misses") == 1
+    assert cache.hit_rate() == 2 / 3
+
+
+def test_disk_cache_survives_restart(tmp_path):
+    cache = EmbeddingCache("model", path=str(tmp_path))
+    cache.put("buy milk", np.array([0.5, 0.25, 0.125]))
+    cache.close()
+
+    registry = MetricsRegistry()
+    reopened = EmbeddingCache("model", path=str(tmp_path), metrics=registry)
+    vector = reopened.get("buy milk")
+
+    assert np.allclose(vector, [0.5, 0.25, 0.125])
+    assert vector.dtype == np.float32
+    assert registry.get("embedding_cache_hits", tier="disk") == 1
+    reopened.close()
+
+
+def test_model_change_invalidates_disk_cache(tmp_path):
+    cache = EmbeddingCache("old-model", path=str(tmp_path))
+    cache.put("buy milk", np.ones(3))
+    cache.close()
+
+    reopened = EmbeddingCache("new-model", path=str(tmp_path))
+
+    assert len(reopened) == 0
+    assert reopened.get("buy milk") is None
+    reopened.close()
+
+
+def test_disk_cache_overwrites_oldest_entries_when_full(tmp_path):
+    cache = EmbeddingCache("model", path=str(tmp_path), max_memory_entries=1, max_disk_entries=3)
+    for i in range(5):
+        cache.put(f"task {i}", np.full(3, i))
+    cache.close()
+
+    reopened = EmbeddingCache("model", path=str(tmp_path), max_disk_entries=3)
+    reopened.put("task 5", np.full(3, 5))
+
+    assert len(reopened) == 3
+    assert reopened.get("task 2") is None
+    assert np.array_equal(reopened.get("task 4"), np.full(3, 4, dtype=np.float32))
+    assert np.array_equal(reopened.get("task 5"), np.full(3, 5, dtype=np.float32))
+    reopened.close()
+
+
+def test_text_embedder_encodes_each_text_once(monkeypatch):
+    monkeypatch.setattr(text_embedder, "load_model", FakeModel)
+    embedder = text_embedder.TextEmbedder(metrics=MetricsRegistry())
+
+    first = embedder.embed("buy milk")
+    second = embedder.embed("buy milk")
+
+    assert first == second == [8.0, 1.0, 2.0]
+    assert embedder.model.calls == ["buy milk"]
+
+
+def test_text_embedder_embeds_many_in_one_batch(monkeypatch):
+    monkeypatch.setattr(text_embedder, "load_model", FakeModel)
+    embedder = text_embedder.TextEmbedder(metrics=MetricsRegistry())
+    embedder.embed("buy milk")
+
+    vectors = embedder.embed_many(["buy milk", "call mom", "call mom", "pay rent!"])
+
+    assert vectors == [[8.0, 1.0, 2.0], [8.0, 1.0, 2.0], [8.0, 1.0, 2.0], [9.0, 1.0, 2.0]]
+    assert embedder.model.calls == ["buy milk", ["call mom", "pay rent!"]]
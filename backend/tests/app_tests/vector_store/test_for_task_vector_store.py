@@ -1,5 +1,7 @@
 import pytest
 from unittest.mock import MagicMock
+from app.src.vector_store.interfaces import TaskVector
+from app.src.vector_store.qdrant_client import CollectionConfig
 from app.src.vector_store.task_vector_store import TaskVectorStore
 
 
@@ -44,3 +46,39 @@ def test_remove_vector(vector_store, mock_qdrant_client):
     args, kwargs = mock_qdrant_client.delete.call_args
     assert kwargs["collection_name"] == "test_tasks"
     assert kwargs["points_selector"] is not None
+
+
+def test_add_many_embeds_once_and_upserts_in_chunks(mock_qdrant_client, mock_embedder):
+    mock_embedder.embed_many.side_effect = lambda titles: [[0.1, 0.2, 0.3]] * len(titles)
+    store = TaskVectorStore(client=mock_qdrant_client, embedder=mock_embedder, collection_name="test_tasks", batch_size=2)
+    tasks = [TaskVector(i, f"Task {i}", 123, "2025-01-01" if i == 0 else None) for i in range(5)]
+
+    store.add_many(tasks)
+
+    mock_embedder.embed_many.assert_called_once_with([f"Task {i}" for i in range(5)])
+    chunks = [kwargs["points"] for _, kwargs in mock_qdrant_client.upsert.call_args_list]
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert chunks[0][0].payload == {"task_id": 0, "title": "Task 0", "user": 123, "due_date": "2025-01-01", "tenant": "123"}
+    assert [point.id for chunk in chunks for point in chunk] == list(range(5))
+
+
+def test_remove_many_deletes_in_chunks(mock_qdrant_client, mock_embedder):
+    store = TaskVectorStore(client=mock_qdrant_client, embedder=mock_embedder, collection_name="test_tasks", batch_size=2)
+
+    store.remove_many([1, 2, 3], user_id=123)
+
+    selectors = [kwargs["points_selector"] for _, kwargs in mock_qdrant_client.delete.call_args_list]
+    assert [selector.points for selector in selectors] == [[1, 2], [3]]
+
+
+def test_tenant_layout_filters_on_the_tenant_key(mock_qdrant_client, mock_embedder):
+    store = TaskVectorStore(client=mock_qdrant_client, embedder=mock_embedder, config=CollectionConfig(tenants=True))
+
+    store.add(task_id=1, title="Buy milk", user_id=123)
+    store.search(query="Buy milk", user_id=123)
+    store.remove(task_id=1, user_id=123)
+
+    assert mock_qdrant_client.upsert.call_args.kwargs["points"][0].payload["tenant"] == "123"
+    [condition] = mock_qdrant_client.search.call_args.kwargs["query_filter"].must
+    assert (condition.key, condition.match.value) == ("tenant", "123")
+    assert mock_qdrant_client.delete.call_args.kwargs["points_selector"].points == [1]
@@ -0,0 +1,133 @@
+import threading
+
+import pytest
+
+from app.src.vector_store.interfaces import TaskVector
+from app.src.vector_store.numpy_vector_store import INITIAL_CAPACITY, NumpyVectorStore
+from app.src.vector_store.threaded_vector_store import ThreadedVectorStore
+
+
+class KeywordEmbedder:
+    """Embeds a title as counts of a few keywords, so similarity is predictable."""
+
+    KEYWORDS = ("milk", "mom", "rent", "car")
+
+    def __init__(self):
+        self.threads = set()
+
+    def embed(self, text):
+        self.threads.add(threading.current_thread().name)
+        words = text.lower().split()
+        return [float(words.count(keyword)) for keyword in self.KEYWORDS] + [0.1]
+
+    def embed_many(self, texts):
+        return [self.embed(text) for text in texts]
+
+
+def test_numpy_store_returns_the_users_best_matches_first():
+    store = NumpyVectorStore(KeywordEmbedder())
+    store.add(1, "buy milk", 7, due_date="2025-01-01")
+    store.add_many([TaskVector(2, "call mom", 7), TaskVector(3, "milk for mom", 7), TaskVector(4, "buy milk", 8)])
+
+    results = store.search("milk", user_id=7, top_k=2)
+
+    assert [point.id for point in results] == [1, 3]
+    assert all(point.payload["user"] == 7 for point in results)
+    assert results[0].score > results[1].score
+    assert store.search("milk", user_id=9) == []
+
+
+def test_numpy_store_replaces_a_task_on_add():
+    store = NumpyVectorStore(KeywordEmbedder())
+    store.add(1, "buy milk", 7)
+    store.add(1, "fix car", 7, due_date="2025-02-02")
+
+    results = store.search("car", user_id=7, top_k=5)
+
+    assert len(store) == 1
+    assert results[0].payload == {"task_id": 1, "user": 7, "title": "fix car", "due_date": "2025-02-02"}
+
+
+def test_numpy_store_removes_by_moving_the_last_row():
+    store = NumpyVectorStore(KeywordEmbedder())
+    store.add_many([TaskVector(1, "buy milk", 7), TaskVector(2, "call mom", 7), TaskVector(3, "pay rent", 7)])
+
+    store.remove(1, user_id=7)
+    store.remove_many([99], user_id=7)
+    store.remove(2, user_id=8)
+
+    assert len(store) == 2
+    assert [point.id for point in store.search("rent", user_id=7, top_k=1)] == [3]
+    assert [point.id for point in store.search("mom", user_id=7, top_k=1)] == [2]
+
+
+def test_numpy_store_grows_past_its_initial_capacity(tmp_path):
+    store = NumpyVectorStore(KeywordEmbedder(), path=str(tmp_path))
+    store.add_many([TaskVector(task_id, "call mom", 7) for task_id in range(INITIAL_CAPACITY * 2 + 1)])
+    store.add(1000, "pay rent", 7)
+
+    assert len(store) == INITIAL_CAPACITY * 2 + 2
+    assert store.search("rent", user_id=7, top_k=1)[0].id == 1000
+
+
+def test_numpy_store_reloads_persisted_vectors(tmp_path):
+    store = NumpyVectorStore(KeywordEmbedder(), path=str(tmp_path))
+    store.add_many([TaskVector(1, "buy milk", 7), TaskVector(2, "call mom", 7), TaskVector(3, "pay rent", 8)])
+    store.remove(1, user_id=7)
+
+    reopened = NumpyVectorStore(KeywordEmbedder(), path=str(tmp_path))
+
+    assert len(reopened) == 2
+    assert [point.id for point in reopened.search("mom", user_id=7, top_k=1)] == [2]
+    assert reopened.search("rent", user_id=8)[0].payload["title"] == "pay rent"
+
+
+@pytest.mark.asyncio
+async def test_threaded_store_runs_the_blocking_store_off_the_loop():
+    embedder = KeywordEmbedder()
+    store = ThreadedVectorStore(NumpyVectorStore(embedder))
+
+    await store.add(1, "buy milk", 7)
+    await store.add_many([TaskVector(2, "call mom", 7)])
+    results = await store.search("milk", user_id=7, top_k=1)
+    await store.remove(1, user_id=7)
+    await store.remove_many([2], user_id=7)
+
+    assert [point.id for point in results] == [1]
+    assert threading.current_thread().name not in embedder.threads
+    assert await store.search("milk", user_id=7) == []
+
+
+def test_numpy_store_searches_while_a_sidecar_is_written(tmp_path, monkeypatch):
+    from app.src.vector_store import numpy_vector_store
+
+    store = NumpyVectorStore(KeywordEmbedder(), path=str(tmp_path))
+    store.add(1, "buy milk", 8)
+    writing, release = threading.Event(), threading.Event()
+    dump = numpy_vector_store.json.dump
+
+    def slow_dump(meta, f):
+        writing.set()
+        release.wait(5)
+        dump(meta, f)
+
+    monkeypatch.setattr(numpy_vector_store.json, "dump", slow_dump)
+    writer = threading.Thread(target=store.add, args=(2, "call mom", 7))
+    writer.start()
+    assert writing.wait(5)
+
+    found = []
+    searcher = threading.Thread(target=lambda: found.extend(store.search("milk", user_id=8)))
+    searcher.start()
+    searcher.join(1)
+
+    assert [point.id for point in found] == [1]
+    release.set()
+    writer.join(5)
+    monkeypatch.undo()
+    assert [point.id for point in NumpyVectorStore(KeywordEmbedder(), path=str(tmp_path)).search("mom", user_id=7)] == [2]
+
+
+def test_threaded_store_rejects_a_store_it_cannot_wrap():
+    with pytest.raises(TypeError):
+        ThreadedVectorStore(object())
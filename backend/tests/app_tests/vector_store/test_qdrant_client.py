@@ -1,6 +1,16 @@
 from unittest.mock import ANY
 from unittest.mock import MagicMock, patch
-from app.src.vector_store.qdrant_client import get_qdrant_client, _ensure_collection
+from qdrant_client.http.models import (
+    Disabled,
+    HnswConfig,
+    PayloadIndexInfo,
+    PayloadSchemaType,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    VectorParams,
+)
+from app.src.vector_store.qdrant_client import CollectionConfig, get_qdrant_client, _ensure_collection
 
 @patch("app.src.vector_store.qdrant_client.QdrantClient")
 def test_get_qdrant_client_creates_collection_if_missing(mock_qdrant_client_class):
@@ -20,6 +30,114 @@ def test_get_qdrant_client_creates_collection_if_missing(mock_qdrant_client_clas
     mock_client_instance.get_collections.assert_called_once()
     mock_client_instance.create_collection.assert_called_once_with(
     collection_name="test_tasks",
-    vectors_config=ANY
+    vectors_config=ANY,
+    hnsw_config=ANY,
+    quantization_config=None
     )
+    indexed = {call.kwargs["field_name"] for call in mock_client_instance.create_payload_index.call_args_list}
+    assert indexed == {"user", "task_id"}
     assert client == mock_client_instance
+
+
+def existing_collection(name="tasks", alias=None, hnsw_m=16, quantization=None, on_disk=None, payload_schema=None):
+    client = MagicMock()
+    client.get_collections.return_value.collections = [MagicMock()]
+    client.get_collections.return_value.collections[0].name = name
+    aliases = []
+    if alias:
+        aliases.append(MagicMock(alias_name=alias, collection_name=name))
+    client.get_aliases.return_value.aliases = aliases
+    info = client.get_collection.return_value
+    info.config.hnsw_config = HnswConfig(m=hnsw_m, ef_construct=100, full_scan_threshold=10000)
+    info.config.quantization_config = quantization
+    info.config.params.vectors = VectorParams(size=384, distance="Cosine", on_disk=on_disk)
+    info.payload_schema = payload_schema if payload_schema is not None else {}
+    return client
+
+
+def test_ensure_collection_leaves_a_matching_collection_alone():
+    schema = {field: PayloadIndexInfo(data_type=PayloadSchemaType.INTEGER, points=0) for field in ("user", "task_id")}
+    client = existing_collection(payload_schema=schema)
+
+    _ensure_collection(client, "tasks", 384, reset=False)
+
+    client.create_collection.assert_not_called()
+    client.update_collection.assert_not_called()
+    client.create_payload_index.assert_not_called()
+
+
+def test_ensure_collection_reconciles_hnsw_quantization_and_indexes():
+    schema = {"user": PayloadIndexInfo(data_type=PayloadSchemaType.KEYWORD, points=0)}
+    client = existing_collection(name="tasks_1", alias="tasks", payload_schema=schema)
+
+    _ensure_collection(client, "tasks", 384, reset=False, config=CollectionConfig(hnsw_m=32, quantization=True))
+
+    client.create_collection.assert_not_called()
+    changes = client.update_collection.call_args.kwargs
+    assert changes["collection_name"] == "tasks_1"
+    assert changes["hnsw_config"].m == 32
+    assert changes["quantization_config"].scalar.type == ScalarType.INT8
+    assert changes["vectors_config"][""].on_disk is True
+    client.delete_payload_index.assert_called_once_with(collection_name="tasks_1", field_name="user")
+    indexed = {call.kwargs["field_name"] for call in client.create_payload_index.call_args_list}
+    assert indexed == {"user", "task_id"}
+
+
+def test_ensure_collection_disables_quantization_that_is_no_longer_configured():
+    quantization = ScalarQuantization(scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True))
+    client = existing_collection(quantization=quantization, on_disk=True)
+
+    _ensure_collection(client, "tasks", 384, reset=False, config=CollectionConfig())
+
+    changes = client.update_collection.call_args.kwargs
+    assert changes["quantization_config"] == Disabled.DISABLED
+    assert changes["vectors_config"][""].on_disk is False
+
+
+def test_ensure_collection_recreates_the_collection_on_reset():
+    client = existing_collection(name="tasks_1", alias="tasks")
+
+    _ensure_collection(client, "tasks", 384, reset=True)
+
+    client.delete_collection.assert_called_once_with(collection_name="tasks_1")
+    assert client.create_collection.call_args.kwargs["collection_name"] == "tasks"
+    client.update_collection.assert_not_called()
+
+
+def test_collection_config_search_params(monkeypatch):
+    assert CollectionConfig().search_params() is None
+
+    monkeypatch.setenv("QDRANT_SEARCH_EF", "128")
+    monkeypatch.setenv("QDRANT_QUANTIZATION", "int8")
+    params = CollectionConfig.from_env().search_params()
+
+    assert params.hnsw_ef == 128
+    assert params.quantization.rescore is True
+    assert params.quantization.oversampling == 2.0
+
+
+def test_tenant_layout_builds_per_user_graphs_over_a_tenant_index():
+    client = MagicMock()
+    client.get_collections.return_value.collections = []
+    client.get_aliases.return_value.aliases = []
+
+    _ensure_collection(client, "tasks", 384, reset=False, config=CollectionConfig(hnsw_m=24, tenants=True))
+
+    hnsw = client.create_collection.call_args.kwargs["hnsw_config"]
+    assert (hnsw.m, hnsw.payload_m) == (0, 24)
+    indexes = {call.kwargs["field_name"]: call.kwargs["field_schema"] for call in client.create_payload_index.call_args_list}
+    assert indexes["tenant"].is_tenant is True
+    assert set(indexes) == {"user", "task_id", "tenant"}
+
+
+def test_tenant_layout_on_a_shared_collection_warns_about_untagged_points(caplog):
+    schema = {field: PayloadIndexInfo(data_type=PayloadSchemaType.INTEGER, points=0) for field in ("user", "task_id")}
+    client = existing_collection(payload_schema=schema)
+    client.count.return_value.count = 42
+
+    _ensure_collection(client, "tasks", 384, reset=False, config=CollectionConfig(tenants=True))
+
+    changes = client.update_collection.call_args.kwargs
+    assert (changes["hnsw_config"].m, changes["hnsw_config"].payload_m) == (0, 16)
+    client.create_payload_index.assert_called_once_with(collection_name="tasks", field_name="tenant", field_schema=ANY)
+    assert "42 points" in caplog.text
@@ -1,3 +1,8 @@
+import threading
+
+import pytest
+
+from app.src.vector_store import text_embedder
 from app.src.vector_store.text_embedder import TextEmbedder
 
 def test_text_embedder_returns_embedding_vector():
@@ -7,4 +12,63 @@ def test_text_embedder_returns_embedding_vector():
 
     assert isinstance(embedding, list)
     assert all(isinstance(value, float) for value in embedding)
-    assert len(embedding) > 0  
\ No newline at end of file
+    assert len(embedding) > 0
+
+
+def test_text_embedder_warms_up_in_the_background(monkeypatch):
+    release = threading.Event()
+
+    class SlowModel:
+        def __init__(self, model_name, *args):
+            release.wait(5)
+
+        def encode(self, text):
+            return [0.5, 0.25]
+
+    monkeypatch.setattr(text_embedder, "load_model", SlowModel)
+    embedder = TextEmbedder()
+    loaded = embedder.warm_up()
+
+    assert not embedder.ready
+    assert embedder.warm_up() is loaded
+    release.set()
+    assert embedder.embed("Buy milk") == [0.5, 0.25]
+    assert embedder.ready
+
+
+def test_load_model_runs_quantized_onnx_export_on_cpu(monkeypatch):
+    import sentence_transformers
+
+    calls = []
+    monkeypatch.setattr(sentence_transformers, "SentenceTransformer", lambda *args, **kwargs: calls.append((args, kwargs)))
+
+    text_embedder.load_model("all-MiniLM-L6-v2", "onnx-int8", "onnx/model_qint8_avx512_vnni.onnx")
+
+    assert calls == [(("all-MiniLM-L6-v2",), {
+        "backend": "onnx",
+        "model_kwargs": {"file_name": "onnx/model_qint8_avx512_vnni.onnx", "provider": "CPUExecutionProvider"}
+    })]
+
+
+def test_text_embedder_keeps_backends_apart_in_cache(monkeypatch):
+    monkeypatch.setenv("EMBEDDING_BACKEND", "onnx-int8")
+    monkeypatch.setenv("EMBEDDING_CACHE_DIR", "")
+
+    quantized = TextEmbedder.from_env()
+    full = TextEmbedder()
+
+    assert quantized.backend == "onnx-int8"
+    assert quantized.onnx_file == text_embedder.default_onnx_file()
+    assert quantized.cache.key("Buy milk") != full.cache.key("Buy milk")
+
+
+def test_text_embedder_from_env_caches_on_disk_only_when_asked(monkeypatch, tmp_path):
+    monkeypatch.delenv("EMBEDDING_CACHE_DIR", raising=False)
+
+    assert TextEmbedder.from_env().cache.path is None
+    assert TextEmbedder.from_env(cache_dir=str(tmp_path)).cache.path == str(tmp_path)
+
+
+def test_text_embedder_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        TextEmbedder(backend="tensorrt")
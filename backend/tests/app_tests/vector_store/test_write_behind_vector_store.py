@@ -0,0 +1,167 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+from qdrant_client.http.models import ScoredPoint
+
+from app.src.utils.metrics import MetricsRegistry
+from app.src.vector_store.interfaces import TaskVector
+from app.src.vector_store.write_behind_vector_store import WriteBehindVectorStore
+
+
+class RecordingStore:
+    def __init__(self, failures=0, poison=()):
+        self.calls = []
+        self.failures = failures
+        self.poison = set(poison)
+        self.closed = False
+
+    async def search(self, query, user_id, top_k=5):
+        return [ScoredPoint(id=task_id, version=0, score=1.0, payload={}) for task_id in (1, 2, 3)]
+
+    async def add(self, task_id, title, user_id, due_date=None):
+        await self.add_many([TaskVector(task_id, title, user_id, due_date)])
+
+    async def add_many(self, tasks):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Qdrant down")
+        if any(task.task_id in self.poison for task in tasks):
+            raise ValueError("Bad vector")
+        self.calls.append(("add_many", list(tasks)))
+
+    async def remove(self, task_id, user_id):
+        await self.remove_many([task_id], user_id)
+
+    async def remove_many(self, task_ids, user_id):
+        self.calls.append(("remove_many", list(task_ids), user_id))
+
+    async def close(self):
+        self.closed = True
+
+
+def wait_until_flushed(queue, timeout=5.0):
+    deadline = time.time() + timeout
+    while queue.pending() and time.time() < deadline:
+        time.sleep(0.01)
+    assert queue.pending() == 0
+
+
+@pytest.mark.asyncio
+async def test_write_behind_coalesces_an_add_and_its_edit_into_one_upsert():
+    store = RecordingStore()
+    metrics = MetricsRegistry()
+    queue = WriteBehindVectorStore(store, path=None, max_delay=0.05, metrics=metrics)
+
+    await queue.add(1, "Buy milk", 7)
+    await queue.add(1, "Buy oat milk", 7, due_date="2025-01-01")
+    await queue.add(2, "Call mom", 7)
+    wait_until_flushed(queue)
+    queue.close()
+
+    assert store.calls == [("add_many", [TaskVector(1, "Buy oat milk", 7, "2025-01-01"), TaskVector(2, "Call mom", 7)])]
+    assert metrics.get("vector_writes_coalesced", kind="upsert_upsert") == 1
+    assert metrics.histogram("vector_write_flush_lag_seconds").count == 2
+    assert metrics.gauge("vector_write_queue_depth") == 0
+    assert store.closed
+
+
+@pytest.mark.asyncio
+async def test_write_behind_drops_the_upsert_of_a_deleted_task_and_hides_it_from_search():
+    store = RecordingStore()
+    queue = WriteBehindVectorStore(store, path=None, max_delay=60)
+
+    await queue.add(2, "Call mom", 7)
+    await queue.remove(2, user_id=7)
+    results = await queue.search("mom", user_id=7)
+    queue.close()
+
+    assert [point.id for point in results] == [1, 3]
+    assert store.calls == [("remove_many", [2], 7)]
+
+
+@pytest.mark.asyncio
+async def test_write_behind_flushes_when_the_batch_is_full():
+    store = RecordingStore()
+    queue = WriteBehindVectorStore(store, path=None, batch_size=3, max_delay=60)
+
+    await queue.add_many([TaskVector(i, f"Task {i}", 7) for i in range(3)])
+    await queue.remove_many([10, 11], user_id=8)
+    deadline = time.time() + 5
+    while not store.calls and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert store.calls[0] == ("add_many", [TaskVector(i, f"Task {i}", 7) for i in range(3)])
+    queue.close()
+    assert store.calls[1] == ("remove_many", [10, 11], 8)
+
+
+@pytest.mark.asyncio
+async def test_write_behind_replays_the_journal_after_a_restart(tmp_path):
+    path = str(tmp_path / "journal.sqlite3")
+    failing = RecordingStore(failures=100)
+    queue = WriteBehindVectorStore(failing, path=path, max_delay=0, retry_delay=0.01)
+
+    await queue.add(1, "Buy milk", 7)
+    await queue.remove(5, user_id=7)
+    queue.close()
+    assert failing.calls == []
+
+    store = RecordingStore()
+    restarted = WriteBehindVectorStore(store, path=path, max_delay=0)
+    wait_until_flushed(restarted)
+    restarted.close()
+
+    assert ("add_many", [TaskVector(1, "Buy milk", 7)]) in store.calls
+    assert ("remove_many", [5], 7) in store.calls
+    assert sqlite3.connect(path).execute("SELECT COUNT(*) FROM pending").fetchone() == (0,)
+
+
+@pytest.mark.asyncio
+async def test_write_behind_dead_letters_a_write_that_keeps_failing(tmp_path):
+    path = str(tmp_path / "journal.sqlite3")
+    store = RecordingStore(poison={2})
+    metrics = MetricsRegistry()
+    queue = WriteBehindVectorStore(store, path=path, max_delay=0, retry_delay=0, max_attempts=3, metrics=metrics)
+
+    await queue.add_many([TaskVector(i, f"Task {i}", 7) for i in range(1, 4)])
+    wait_until_flushed(queue)
+    queue.close()
+
+    assert store.calls == [("add_many", [TaskVector(1, "Task 1", 7)]), ("add_many", [TaskVector(3, "Task 3", 7)])]
+    assert metrics.get("vector_writes_dead_lettered", kind="upsert") == 1
+    journal = sqlite3.connect(path)
+    assert journal.execute("SELECT task_id, attempts, error FROM dead_letter").fetchall() == [(2, 3, "Bad vector")]
+    assert journal.execute("SELECT COUNT(*) FROM pending").fetchone() == (0,)
+
+
+@pytest.mark.asyncio
+async def test_write_behind_close_session_closes_the_store_but_keeps_flushing():
+    store = RecordingStore()
+    queue = WriteBehindVectorStore(store, path=None, max_delay=0)
+
+    await queue.close_session()
+    assert store.closed
+    await queue.add(1, "Buy milk", 7)
+    wait_until_flushed(queue)
+    queue.close()
+
+    assert store.calls == [("add_many", [TaskVector(1, "Buy milk", 7)])]
+
+
+@pytest.mark.asyncio
+async def test_write_behind_commits_the_journal_off_the_event_loop(tmp_path, monkeypatch):
+    queue = WriteBehindVectorStore(RecordingStore(), path=str(tmp_path / "journal.sqlite3"), max_delay=60)
+    journal = queue._journal
+    threads = []
+
+    def recording_journal(writes):
+        threads.append(threading.current_thread())
+        journal(writes)
+
+    monkeypatch.setattr(queue, "_journal", recording_journal)
+    await queue.add(1, "Buy milk", 7)
+    queue.close()
+
+    assert threads and threads[0] is not threading.current_thread()
@@ -7,7 +7,7 @@ TaskGPT Socket.IO server and interacting with the application.
 
 import socketio
 import time
-from typing import Optional
+from typing import Any, Dict, Optional
 
 class SocketIOClient:
     """
@@ -28,6 +28,7 @@ class SocketIOClient:
         self.sio.on('connect', self.on_connect)
         self.sio.on('disconnect', self.on_disconnect)
         self.sio.on('chat_message', self.on_chat_message)
+        self.sio.on('chat_message_chunk', self.on_chat_message_chunk)
 
     def on_connect(self) -> None:
         print("Connected to server.")
@@ -38,6 +39,12 @@ class SocketIOClient:
     def on_chat_message(self, data: str) -> None:
         print(data)
 
+    def on_chat_message_chunk(self, data: Dict[str, Any]) -> None:
+        if data.get("done"):
+            print()
+        else:
+            print(data.get("text", ""), end="", flush=True)
+
     def start(self) -> None:
         """
         Start the client and begin the interactive session.